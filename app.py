@@ -8,6 +8,7 @@ from flask_mail import Mail
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from src.config.database_config import DatabaseConfig
+from src.shared.cache import Cache
 
 
 load_dotenv()
@@ -15,6 +16,7 @@ load_dotenv()
 migrate = Migrate()
 mallow = Marshmallow()
 mail = Mail()
+cache = Cache()
 scheduler = BackgroundScheduler(
     jobstores={
         "default": SQLAlchemyJobStore(url=DatabaseConfig.SQLALCHEMY_DATABASE_URI)
@@ -33,10 +35,16 @@ def init_app():
     from src.api.api import init_api
     from src.modules import bind_modules
     from src.shared.error_handlers import register_error_handlers
+    from src.commands import register_commands
     from src.config.config import Config
+    from src.shared.json_provider import FastJSONProvider
+    from src.shared.compression import init_compression
+    from src.shared.query_profiler import init_query_profiler
+    from src.shared.scheduler_leader import init_scheduler
 
     app = Flask(__name__, template_folder="src/templates")
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
 
     CORS(app, origins=["*"])
 
@@ -45,15 +53,24 @@ def init_app():
 
     mail.init_app(app)
 
+    cache.init_app(app)
+
     mallow.init_app(app)
 
     init_api(app)
 
     register_error_handlers(app)
 
+    init_query_profiler(app)
+
+    init_compression(app)
+
+    register_commands(app)
+
     if not scheduler.running:
-        scheduler.start()
+        init_scheduler(app, scheduler)
 
-    FlaskInjector(app=app, modules=[bind_modules])
+    # Kept for code running outside requests, like scheduler jobs
+    app.extensions["injector"] = FlaskInjector(app=app, modules=[bind_modules]).injector
 
     return app
@@ -0,0 +1,386 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+import click
+
+PAGE_SIZE = 50
+# Prefixes, several words, descriptions and typos of the seeded surveys
+SEARCH_TERMS = [
+    "bench",
+    "benchmark survey 42",
+    "customer satisfaction",
+    "feedback",
+    "benchmrk survy",
+]
+
+
+class RequestFailed(Exception):
+    pass
+
+
+class Client:
+    """HTTP client of a worker, keeping its connection alive between requests"""
+
+    def __init__(self, base_url: str, timeout: float):
+        url = urlsplit(base_url)
+        connection_class = HTTPSConnection if url.scheme == "https" else HTTPConnection
+        self.connect = lambda: connection_class(url.netloc, timeout=timeout)
+        self.prefix = url.path.rstrip("/")
+        self.connection = self.connect()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def call(
+        self,
+        step: str,
+        method: str,
+        path: str,
+        query: Optional[dict] = None,
+        body: Any = None,
+    ) -> Any:
+        """Send a request recording its latency under `step`, returns its JSON body"""
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        headers = {"Accept-Encoding": "gzip"}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, self.prefix + path, data, headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+        except (OSError, HTTPException) as e:
+            self.connection.close()
+            self.connection = self.connect()
+            self.errors[step] += 1
+            raise RequestFailed(f"{method} {path}: {e}") from e
+        self.latencies[step].append(time.perf_counter() - started)
+
+        if response.status >= 400:
+            self.errors[step] += 1
+            raise RequestFailed(f"{method} {path} answered {response.status}")
+        if not payload:
+            return None
+        if response.getheader("Content-Encoding") == "gzip":
+            payload = gzip.decompress(payload)
+        return json.loads(payload)
+
+    def get_json(self, path: str, query: Optional[dict] = None) -> Any:
+        """Fetch JSON for the scenario setup, uncompressed and not recorded"""
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        self.connection.request("GET", self.prefix + path)
+        response = self.connection.getresponse()
+        payload = response.read()
+        if response.status >= 400:
+            raise RequestFailed(f"GET {path} answered {response.status}")
+        return json.loads(payload)
+
+
+class Context:
+    """Surveys and their questions the scenarios pick from"""
+
+    def __init__(self, client: Client, survey_count: int):
+        surveys = client.get_json(
+            "/api/v1/surveys/", {"per_page": min(survey_count, 200)}
+        )["items"]
+        self.surveys: List[Tuple[str, List[str]]] = []
+        for survey in surveys:
+            questions = client.get_json(f"/api/v1/questions/by-survey/{survey['id']}")
+            if questions:
+                self.surveys.append(
+                    (survey["id"], [question["id"] for question in questions])
+                )
+        if not self.surveys:
+            raise click.ClickException(
+                "No survey with questions found, seed the database first with "
+                "`python -m benchmarks.seed`."
+            )
+        survey_id = self.surveys[0][0]
+        self.response_pages = client.get_json(
+            f"/api/v1/responses/survey/{survey_id}/responses",
+            {"per_page": PAGE_SIZE},
+        )["pages"]
+
+
+def survey_take(client: Client, context: Context, rng: random.Random, state: dict):
+    """A respondent opening a survey, then submitting their answers"""
+    survey_id, question_ids = rng.choice(context.surveys)
+    response = client.call(
+        "create_response",
+        "POST",
+        "/api/v1/responses/",
+        body={
+            "survey_id": survey_id,
+            "respondent_data": {
+                "name": "Load test",
+                "email": f"load{rng.getrandbits(32)}@example.com",
+            },
+        },
+    )
+    answers = [
+        (
+            {"question_id": id, "rating": rng.randint(1, 10)}
+            if index % 2 == 0
+            else {"question_id": id, "value": "Load test answer"}
+        )
+        for index, id in enumerate(question_ids)
+    ]
+    client.call(
+        "submit_answers",
+        "POST",
+        f"/api/v1/responses/{response['id']}/answers",
+        body={"answers": answers},
+    )
+
+
+def dashboard(client: Client, context: Context, rng: random.Random, state: dict):
+    """An analytics dashboard refreshing its widgets"""
+    survey_id, _ = rng.choice(context.surveys)
+    prefix = f"/api/v1/responses/survey/{survey_id}/analytics"
+    client.call("analytics", "GET", prefix)
+    client.call("daily_responses", "GET", f"{prefix}/daily-responses")
+    client.call("question_analytics", "GET", f"{prefix}/question-analytics")
+
+
+def campaign(client: Client, context: Context, rng: random.Random, state: dict):
+    """An email campaign created for later, so no email is sent during the run"""
+    survey_id, _ = rng.choice(context.surveys)
+    batch = rng.getrandbits(32)
+    client.call(
+        "bulk_distribution",
+        "POST",
+        "/api/v1/distribution/bulk-distribution",
+        body={
+            "survey_id": survey_id,
+            "method": "EMAIL",
+            "recipient_emails": [
+                f"load{batch}-{index}@example.com"
+                for index in range(state["campaign_size"])
+            ],
+            "subject": "Load test",
+            "message": "Load test",
+            "scheduled_at": (datetime.utcnow() + timedelta(days=365)).isoformat(),
+        },
+    )
+
+
+def pagination(client: Client, context: Context, rng: random.Random, state: dict):
+    """Deep pages of a survey's responses, by offset and by cursor"""
+    survey_id = context.surveys[0][0]
+    path = f"/api/v1/responses/survey/{survey_id}/responses"
+    pages = context.response_pages
+    client.call(
+        "offset_page",
+        "GET",
+        path,
+        {"per_page": PAGE_SIZE, "page": rng.randint(max(1, pages // 2), max(1, pages))},
+    )
+
+    query = {"per_page": PAGE_SIZE, "mode": "cursor"}
+    if state.get("cursor"):
+        query["cursor"] = state["cursor"]
+    page = client.call("cursor_page", "GET", path, query)
+    state["cursor"] = page and page.get("next_cursor")
+
+
+def search(client: Client, context: Context, rng: random.Random, state: dict):
+    """Survey search, by prefix, several words and with typos"""
+    client.call(
+        "search",
+        "GET",
+        "/api/v1/surveys/",
+        {"q": rng.choice(SEARCH_TERMS), "per_page": 20},
+    )
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "survey-take": survey_take,
+    "dashboard": dashboard,
+    "campaign": campaign,
+    "pagination": pagination,
+    "search": search,
+}
+
+
+def summarize(latencies: List[float]) -> Dict[str, Optional[float]]:
+    """Latency percentiles in milliseconds"""
+    if not latencies:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    milliseconds = [latency * 1000 for latency in latencies]
+    if len(milliseconds) > 1:
+        cuts = statistics.quantiles(milliseconds, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = milliseconds[0]
+    return {
+        "p50": round(p50, 2),
+        "p95": round(p95, 2),
+        "p99": round(p99, 2),
+        "mean": round(statistics.fmean(milliseconds), 2),
+        "max": round(max(milliseconds), 2),
+    }
+
+
+def run_scenario(
+    name: str,
+    base_url: str,
+    context: Context,
+    concurrency: int,
+    duration: float,
+    timeout: float,
+    campaign_size: int,
+) -> dict:
+    """Run a scenario on `concurrency` workers for `duration` seconds"""
+    scenario = SCENARIOS[name]
+    deadline = time.perf_counter() + duration
+
+    def work(worker: int):
+        client = Client(base_url, timeout)
+        rng = random.Random(worker)
+        state = {"campaign_size": campaign_size}
+        iterations, failures, durations = 0, 0, []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                scenario(client, context, rng, state)
+            except RequestFailed:
+                failures += 1
+                continue
+            durations.append(time.perf_counter() - started)
+            iterations += 1
+        client.connection.close()
+        return client, iterations, failures, durations
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        workers = list(executor.map(work, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies, errors = defaultdict(list), defaultdict(int)
+    iterations, failures, durations = 0, 0, []
+    for client, worker_iterations, worker_failures, worker_durations in workers:
+        for step, values in client.latencies.items():
+            latencies[step] += values
+        for step, count in client.errors.items():
+            errors[step] += count
+        iterations += worker_iterations
+        failures += worker_failures
+        durations += worker_durations
+
+    requests = sum(len(values) for values in latencies.values())
+    return {
+        "duration_s": round(elapsed, 3),
+        "iterations": iterations,
+        "failed_iterations": failures,
+        "requests": requests,
+        "errors": sum(errors.values()),
+        "throughput": {
+            "iterations_per_s": round(iterations / elapsed, 2),
+            "requests_per_s": round(requests / elapsed, 2),
+        },
+        "latency_ms": summarize(durations),
+        "steps": {
+            step: {
+                "requests": len(latencies[step]),
+                "errors": errors[step],
+                "latency_ms": summarize(latencies[step]),
+            }
+            for step in sorted(set(latencies) | set(errors))
+        },
+    }
+
+
+@click.command()
+@click.option(
+    "--base-url", default="http://localhost:5000", show_default=True, help="API root."
+)
+@click.option(
+    "--scenario",
+    "scenarios",
+    type=click.Choice(list(SCENARIOS)),
+    multiple=True,
+    help="Scenario to run, repeatable. Runs all of them by default.",
+)
+@click.option("--concurrency", type=click.IntRange(min=1), default=8, show_default=True)
+@click.option(
+    "--duration",
+    type=click.FloatRange(min=0, min_open=True),
+    default=30,
+    show_default=True,
+    help="Seconds each scenario runs.",
+)
+@click.option(
+    "--surveys",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Surveys the scenarios pick from.",
+)
+@click.option(
+    "--campaign-size",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Recipients of each campaign.",
+)
+@click.option("--timeout", type=float, default=30, show_default=True)
+@click.option(
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write the JSON report to, stdout by default.",
+)
+def load(
+    base_url,
+    scenarios,
+    concurrency,
+    duration,
+    surveys,
+    campaign_size,
+    timeout,
+    output,
+):
+    """
+    Runs load scenarios against a running API and reports the p50, p95 and p99
+    latency and the throughput of each scenario and request as JSON.
+    Campaigns and survey responses are written to the database, use a
+    benchmark database.
+    """
+    setup_client = Client(base_url, timeout)
+    context = Context(setup_client, surveys)
+    setup_client.connection.close()
+
+    report = {
+        "base_url": base_url,
+        "started_at": datetime.utcnow().isoformat(),
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "scenarios": {},
+    }
+    for name in scenarios or SCENARIOS:
+        click.echo(f"Running {name} for {duration:g}s...", err=True)
+        report["scenarios"][name] = run_scenario(
+            name, base_url, context, concurrency, duration, timeout, campaign_size
+        )
+
+    json.dump(report, output, indent=2)
+    output.write("\n")
+    if any(scenario["errors"] for scenario in report["scenarios"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    load()
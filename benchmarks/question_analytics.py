@@ -0,0 +1,211 @@
+from collections import Counter
+from typing import Any, Dict, List
+import json
+import sys
+import time
+import click
+from benchmarks.seed import SURVEY, TABLES, Dataset, copy_rows
+
+
+def python_question_analytics(survey_id: str) -> List[Dict[str, Any]]:
+    """
+    Question analytics computed the way they were before the database side
+    aggregation: one `Answer JOIN Response` query per question, loading every
+    answer and counting in Python. The reference of the aggregated queries.
+    """
+    from src.database.db import db
+    from src.database.models.answer_model import Answer
+    from src.database.models.response_model import Response
+    from src.domain.question.question_repository import QuestionRepository
+
+    question_analytics = []
+    for question in QuestionRepository().get_questions_by_survey(survey_id):
+        answers = (
+            db.session.query(Answer)
+            .join(Response)
+            .filter(
+                Response.survey_id == question.survey_id,
+                Answer.question_id == question.id,
+            )
+            .all()
+        )
+
+        total_answers = len(answers)
+        answered_questions = len(
+            [a for a in answers if a.value or a.values or a.rating or a.date_value]
+        )
+        text_answers = [a.value for a in answers if a.value]
+        ratings = [a.rating for a in answers if a.rating is not None]
+        options = Counter(
+            str(option)
+            for a in answers
+            if isinstance(a.values, list)
+            for option in a.values
+        )
+
+        rating_stats = {}
+        if ratings:
+            rating_stats = {
+                "average": sum(ratings) / len(ratings),
+                "min": min(ratings),
+                "max": max(ratings),
+                "count": len(ratings),
+                "distribution": dict(Counter(ratings)),
+            }
+
+        question_analytics.append(
+            {
+                "question_id": str(question.id),
+                "question_text": question.text,
+                "question_type": None,
+                "total_responses": total_answers,
+                "answered": answered_questions,
+                "skipped": total_answers - answered_questions,
+                "completion_rate": (
+                    (answered_questions / total_answers * 100)
+                    if total_answers > 0
+                    else 0
+                ),
+                "avg_response_length": round(
+                    (
+                        sum(len(value) for value in text_answers) / len(text_answers)
+                        if text_answers
+                        else 0
+                    ),
+                    1,
+                ),
+                "avg_rating": (
+                    round(rating_stats["average"], 1) if rating_stats else None
+                ),
+                "rating_stats": rating_stats,
+                "option_counts": dict(options),
+            }
+        )
+
+    return question_analytics
+
+
+def same_analytics(left: List[dict], right: List[dict]) -> bool:
+    """Equal payloads, up to the float rounding of the rating averages"""
+
+    def normalized(analytics):
+        return [
+            {
+                **question,
+                "rating_stats": (
+                    {
+                        **question["rating_stats"],
+                        "average": round(question["rating_stats"]["average"], 9),
+                    }
+                    if question["rating_stats"]
+                    else {}
+                ),
+            }
+            for question in analytics
+        ]
+
+    return normalized(left) == normalized(right)
+
+
+def best_of(func, repeat: int, reset):
+    """
+    Best time of `repeat` runs of func in milliseconds, and its last result.
+    `reset` runs before each, so no run reuses the objects loaded by another.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        reset()
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1e3, 1), result
+
+
+@click.command()
+@click.option(
+    "--answers",
+    "answer_counts",
+    type=click.IntRange(min=10),
+    multiple=True,
+    default=(10_000, 100_000, 1_000_000),
+    show_default=True,
+    help="Number of answers of a survey, repeat the option for several surveys.",
+)
+@click.option("--questions", type=click.IntRange(min=1), default=10, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True)
+@click.option(
+    "--baseline-max-answers",
+    type=click.IntRange(min=0),
+    default=100_000,
+    show_default=True,
+    help="Largest survey also timed with the per-question Python computation, "
+    "which loads every answer in memory.",
+)
+@click.option(
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write the JSON report to, stdout by default.",
+)
+def question_analytics(answer_counts, questions, repeat, baseline_max_answers, output):
+    """
+    Seeds one survey per `--answers` count in the database of
+    SQLALCHEMY_DATABASE_URI, then times its question analytics against the
+    per-question Python computation, after checking they return the same.
+    """
+    from server import app
+    from src.database.db import db
+    from src.domain.response.response_service import ResponseService
+
+    report = {"questions": questions, "repeat": repeat, "surveys": []}
+    mismatches = []
+
+    with app.app_context():
+        response_service = app.extensions["injector"].get(ResponseService)
+
+        for answers in answer_counts:
+            dataset = Dataset(
+                surveys=1,
+                questions_per_survey=questions,
+                distributions=0,
+                responses=answers // questions,
+                answers_per_response=questions,
+            )
+            connection = db.engine.raw_connection()
+            try:
+                for name, table, rows in TABLES:
+                    copy_rows(connection, table, lambda: rows(dataset))
+            finally:
+                connection.close()
+            with db.engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as analyze:
+                analyze.exec_driver_sql("ANALYZE response, answer")
+
+            survey_id = dataset.id(SURVEY, 0)
+            result = {"answers": dataset.counts["answers"], "survey_id": survey_id}
+            result["aggregated_ms"], aggregated = best_of(
+                lambda: response_service.get_question_analytics(survey_id),
+                repeat,
+                db.session.remove,
+            )
+            if dataset.counts["answers"] <= baseline_max_answers:
+                result["python_ms"], baseline = best_of(
+                    lambda: python_question_analytics(survey_id),
+                    repeat,
+                    db.session.remove,
+                )
+                if not same_analytics(aggregated, baseline):
+                    mismatches.append(survey_id)
+            report["surveys"].append(result)
+
+    report["parity"] = not mismatches
+    json.dump(report, output, indent=2)
+    output.write("\n")
+    if mismatches:
+        click.echo(f"Analytics differ from Python for {mismatches}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    question_analytics()
@@ -0,0 +1,267 @@
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Iterator
+import json
+import random
+import time
+import uuid
+import click
+
+SURVEY, QUESTION, DISTRIBUTION, RESPONSE, ANSWER = range(1, 6)
+NULL = r"\N"
+COPY_CHUNK_SIZE = 1 << 20
+
+
+class RowStream:
+    """File-like object COPY reads its rows from, generated as they are read"""
+
+    def __init__(self, rows: Iterator[str]):
+        self.rows = rows
+        self.buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        parts, length = [self.buffer], len(self.buffer)
+        while size < 0 or length < size:
+            chunk = "".join(islice(self.rows, 1000))
+            if not chunk:
+                break
+            parts.append(chunk)
+            length += len(chunk)
+        data = "".join(parts)
+        if size < 0:
+            self.buffer = ""
+            return data
+        self.buffer = data[size:]
+        return data[:size]
+
+
+class Dataset:
+    """
+    Rows of a synthetic dataset. Ids are derived from a run prefix, the table
+    and the row index, so rows reference each other without keeping ids around
+    and several runs can seed the same database.
+    """
+
+    def __init__(
+        self,
+        surveys: int,
+        questions_per_survey: int,
+        distributions: int,
+        responses: int,
+        answers_per_response: int,
+        days: int = 90,
+    ):
+        self.surveys = surveys
+        self.questions_per_survey = questions_per_survey
+        self.distributions = distributions
+        self.responses = responses
+        self.answers_per_response = answers_per_response
+        prefix = uuid.UUID(int=random.getrandbits(64) << 64).hex
+        self.prefix = f"{prefix[:8]}-{prefix[8:12]}-{prefix[12:16]}"
+        self.now = datetime.utcnow()
+        self.days = days
+
+    @property
+    def counts(self) -> dict:
+        return {
+            "surveys": self.surveys,
+            "questions": self.surveys * self.questions_per_survey,
+            "distributions": self.distributions,
+            "responses": self.responses,
+            "answers": self.responses * self.answers_per_response,
+        }
+
+    def id(self, table: int, index: int) -> str:
+        # Formatted by hand, building UUID objects dominates the seeding time
+        low = table << 56 | index
+        return f"{self.prefix}-{low >> 48:04x}-{low & 0xFFFFFFFFFFFF:012x}"
+
+    def moment(self, index: int, count: int) -> str:
+        """Spread `count` rows evenly over the last `days` days"""
+        seconds = self.days * 86400 * (count - index) / max(count, 1)
+        return (self.now - timedelta(seconds=seconds)).isoformat()
+
+    def survey_rows(self) -> Iterator[str]:
+        now = self.now.isoformat()
+        for index in range(self.surveys):
+            yield (
+                f"{self.id(SURVEY, index)}\tBenchmark survey {index}\t"
+                f"Customer satisfaction and product feedback {index}\tf\tINTERNAL\t"
+                f"{now}\t{now}\n"
+            )
+
+    def question_rows(self) -> Iterator[str]:
+        now = self.now.isoformat()
+        for survey in range(self.surveys):
+            for order in range(self.questions_per_survey):
+                index = survey * self.questions_per_survey + order
+                yield (
+                    f"{self.id(QUESTION, index)}\t{self.id(SURVEY, survey)}\t"
+                    f"Question {order}\t{'t' if order == 0 else 'f'}\t{order}\t"
+                    f"{now}\t{now}\n"
+                )
+
+    def distribution_rows(self) -> Iterator[str]:
+        for index in range(self.distributions):
+            sent_at = self.moment(index, self.distributions)
+            status, clicked_count = ("CLICKED", 1) if index % 4 == 0 else ("SENT", 0)
+            yield (
+                f"{self.id(DISTRIBUTION, index)}\t{self.id(SURVEY, index % self.surveys)}\t"
+                f"EMAIL\trecipient{index}@example.com\tWe would love your feedback\t"
+                f"It only takes a minute.\t{status}\t{sent_at}\t{clicked_count}\t"
+                f"{sent_at}\t{sent_at}\n"
+            )
+
+    def response_rows(self) -> Iterator[str]:
+        for index in range(self.responses):
+            created_at = self.moment(index, self.responses)
+            # Responses share the survey of the distribution with the same index
+            distribution = (
+                self.id(DISTRIBUTION, index) if index < self.distributions else NULL
+            )
+            yield (
+                f"{self.id(RESPONSE, index)}\t{self.id(SURVEY, index % self.surveys)}\t"
+                f"{distribution}\tINTERNAL\tRespondent {index}\t"
+                f"respondent{index}@example.com\t{created_at}\t{created_at}\n"
+            )
+
+    def answer_rows(self) -> Iterator[str]:
+        choices = json.dumps(["Email", "Chat"])
+        questions = [
+            self.id(QUESTION, index)
+            for index in range(self.surveys * self.questions_per_survey)
+        ]
+        for response in range(self.responses):
+            response_id = self.id(RESPONSE, response)
+            created_at = self.moment(response, self.responses)
+            first_question = response % self.surveys * self.questions_per_survey
+            for position in range(self.answers_per_response):
+                order = position % self.questions_per_survey
+                value, values, rating = NULL, NULL, NULL
+                if order % 3 == 0:
+                    rating = (response + position) % 10 + 1
+                elif order % 3 == 1:
+                    value = f"Answer {response}"
+                else:
+                    values = choices
+                yield (
+                    f"{self.id(ANSWER, response * self.answers_per_response + position)}\t"
+                    f"{response_id}\t{questions[first_question + order]}\t{value}\t"
+                    f"{values}\t{rating}\t{created_at}\t{created_at}\n"
+                )
+
+
+TABLES = [
+    (
+        "surveys",
+        "survey (id, title, description, is_draft, type, created_at, updated_at)",
+        Dataset.survey_rows,
+    ),
+    (
+        "questions",
+        'question (id, survey_id, text, required, "order", created_at, updated_at)',
+        Dataset.question_rows,
+    ),
+    (
+        "distributions",
+        "distribution (id, survey_id, method, recipient_email, subject, message, "
+        "status, sent_at, clicked_count, created_at, updated_at)",
+        Dataset.distribution_rows,
+    ),
+    (
+        "responses",
+        "response (id, survey_id, distribution_id, source, respondent_name, "
+        "respondent_email, created_at, updated_at)",
+        Dataset.response_rows,
+    ),
+    (
+        "answers",
+        'answer (id, response_id, question_id, value, "values", rating, created_at, '
+        "updated_at)",
+        Dataset.answer_rows,
+    ),
+]
+
+
+def copy_rows(connection, table: str, rows: Callable[[], Iterator[str]]) -> float:
+    """COPY rows into a table and commit, returns the seconds it took"""
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} FROM STDIN", RowStream(rows()), size=COPY_CHUNK_SIZE
+        )
+    connection.commit()
+    return time.perf_counter() - started
+
+
+@click.command()
+@click.option("--surveys", type=click.IntRange(min=1), default=1000, show_default=True)
+@click.option(
+    "--questions-per-survey", type=click.IntRange(min=1), default=10, show_default=True
+)
+@click.option(
+    "--distributions", type=click.IntRange(min=0), default=100_000, show_default=True
+)
+@click.option(
+    "--responses", type=click.IntRange(min=0), default=1_000_000, show_default=True
+)
+@click.option(
+    "--answers-per-response", type=click.IntRange(min=0), default=10, show_default=True
+)
+@click.option(
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="Multiplies every row count, e.g. 0.01 for a quick run.",
+)
+def seed(
+    surveys, questions_per_survey, distributions, responses, answers_per_response, scale
+):
+    """
+    Seeds the database of SQLALCHEMY_DATABASE_URI with a benchmark dataset
+    through COPY, then rebuilds the analytics rollup and analyzes the tables.
+    By default 1k surveys, 100k distributions, 1M responses and 10M answers.
+    """
+    from server import app
+    from src.database.db import db
+    from src.domain.survey_stats.survey_stats_repository import (
+        SurveyStatsRepository,
+    )
+
+    dataset = Dataset(
+        surveys=max(1, int(surveys * scale)),
+        questions_per_survey=questions_per_survey,
+        distributions=int(distributions * scale),
+        responses=int(responses * scale),
+        answers_per_response=answers_per_response,
+    )
+
+    with app.app_context():
+        connection = db.engine.raw_connection()
+        try:
+            for name, table, rows in TABLES:
+                count = dataset.counts[name]
+                seconds = copy_rows(connection, table, lambda: rows(dataset))
+                click.echo(
+                    f"Copied {count} {name} in {seconds:.1f}s "
+                    f"({count / max(seconds, 1e-9):.0f} rows/s)."
+                )
+        finally:
+            connection.close()
+
+        started = time.perf_counter()
+        rebuilt = SurveyStatsRepository().rebuild()
+        click.echo(
+            f"Rebuilt analytics rollup of {rebuilt} survey(s) "
+            f"in {time.perf_counter() - started:.1f}s."
+        )
+
+        with db.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as analyze:
+            analyze.exec_driver_sql("ANALYZE")
+
+
+if __name__ == "__main__":
+    seed()
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Type
+import gzip
+import json
+import sys
+import time
+import uuid
+import brotli
+import click
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from marshmallow import Schema, fields
+from src.database.models.distribution_model import (
+    Distribution,
+    DistributionMethod,
+    DistributionStatus,
+)
+from src.database.models.response_model import Response, ResponseSource
+from src.database.models.survey_model import Survey, SurveyType
+from src.schema.distribution_schema import DistributionPaginatedSchema
+from src.schema.response_schema import SurveyResponsePaginatedSchema
+from src.schema.survey_schema import SurveyPaginatedSchema
+from src.shared.fast_schema import FastDumpSchema
+from src.shared.json_provider import FastJSONProvider
+
+
+def build_survey(index: int) -> Survey:
+    now = datetime.utcnow()
+    survey = Survey(
+        id=uuid.uuid4(),
+        title=f"Benchmark survey {index}",
+        description="Customer satisfaction and product feedback",
+        is_draft=False,
+        type=SurveyType.INTERNAL,
+        created_at=now,
+        updated_at=now,
+    )
+    survey._question_count = 10
+    survey._response_count = index
+    return survey
+
+
+def build_response(index: int) -> Response:
+    created_at = datetime.utcnow() - timedelta(minutes=index)
+    response = Response(
+        id=uuid.uuid4(),
+        survey_id=uuid.uuid4(),
+        distribution_id=uuid.uuid4() if index % 2 else None,
+        source=ResponseSource.INTERNAL,
+        respondent_name=f"Respondent {index}",
+        respondent_email=f"respondent{index}@example.com",
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    response._answer_count = 10
+    return response
+
+
+def build_distribution(index: int) -> Distribution:
+    sent_at = datetime.utcnow() - timedelta(minutes=index)
+    return Distribution(
+        id=uuid.uuid4(),
+        survey_id=uuid.uuid4(),
+        method=DistributionMethod.EMAIL,
+        recipient_email=f"recipient{index}@example.com",
+        subject="We would love your feedback",
+        message="It only takes a minute.",
+        status=DistributionStatus.SENT,
+        sent_at=sent_at,
+        created_at=sent_at,
+        updated_at=sent_at,
+    )
+
+
+PAGES: Dict[str, tuple] = {
+    "surveys": (SurveyPaginatedSchema, build_survey),
+    "responses": (SurveyResponsePaginatedSchema, build_response),
+    "distributions": (DistributionPaginatedSchema, build_distribution),
+}
+
+
+def plain(schema_class: Type[Schema]) -> Type[Schema]:
+    """The same schema on plain marshmallow, the reference of FastDumpSchema"""
+    declared = {}
+    for name, field in schema_class._declared_fields.items():
+        if (
+            isinstance(field, fields.List)
+            and isinstance(field.inner, fields.Nested)
+            and isinstance(field.inner.nested, type)
+            and issubclass(field.inner.nested, FastDumpSchema)
+        ):
+            field = fields.List(fields.Nested(plain(field.inner.nested)))
+        declared[name] = field
+    return type(f"Plain{schema_class.__name__}", (Schema,), declared)
+
+
+def per_item(func: Callable, items: int, repeat: int) -> float:
+    """Best time of `repeat` runs of func, in microseconds per item"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best / items * 1e6, 3)
+
+
+@click.command()
+@click.option("--items", type=click.IntRange(min=1), default=200, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=20, show_default=True)
+@click.option(
+    "--compress-level", type=click.IntRange(1, 9), default=6, show_default=True
+)
+@click.option(
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write the JSON report to, stdout by default.",
+)
+def serialization(items, repeat, compress_level, output):
+    """
+    Benchmarks dumping list pages through the compiled output schemas against
+    plain marshmallow, after checking they produce the same output, and
+    encoding and compressing the result. Needs no database.
+    """
+    app = Flask(__name__)
+    fast_json, stdlib_json = FastJSONProvider(app), DefaultJSONProvider(app)
+    report = {"items": items, "pages": {}}
+    mismatches = []
+
+    for name, (schema_class, build) in PAGES.items():
+        page = {
+            "items": [build(index) for index in range(items)],
+            "total": items,
+            "pages": 1,
+            "current_page": 1,
+            "per_page": items,
+            "has_next": False,
+            "has_prev": False,
+        }
+        fast, reference = schema_class(), plain(schema_class)()
+        dumped = fast.dump(page)
+        if dumped != reference.dump(page):
+            mismatches.append(name)
+
+        encoded = fast_json.dumps(dumped).encode()
+        report["pages"][name] = {
+            "dump_us_per_item": {
+                "marshmallow": per_item(lambda: reference.dump(page), items, repeat),
+                "fast": per_item(lambda: fast.dump(page), items, repeat),
+            },
+            "encode_us_per_item": {
+                "json": per_item(lambda: stdlib_json.dumps(dumped), items, repeat),
+                "fast": per_item(lambda: fast_json.dumps(dumped), items, repeat),
+            },
+            "compress_us_per_item": {
+                "gzip": per_item(
+                    lambda: gzip.compress(encoded, compresslevel=compress_level),
+                    items,
+                    repeat,
+                ),
+                "br": per_item(
+                    lambda: brotli.compress(encoded, quality=compress_level),
+                    items,
+                    repeat,
+                ),
+            },
+            "bytes": {
+                "json": len(encoded),
+                "gzip": len(gzip.compress(encoded, compresslevel=compress_level)),
+                "br": len(brotli.compress(encoded, quality=compress_level)),
+            },
+        }
+
+    report["parity"] = not mismatches
+    json.dump(report, output, indent=2)
+    output.write("\n")
+    if mismatches:
+        click.echo(f"Output differs from marshmallow for {mismatches}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    serialization()
@@ -4,6 +4,7 @@ from .v1.distribution_api import distribution_api as distribution_api_v1
 from .v1.questions_api import questions_api as questions_api_v1
 from .v1.responses_api import responses_api as responses_api_v1
 from .v1.surveys_api import surveys_api as surveys_api_v1
+from .v1.metrics_api import metrics_api as metrics_api_v1
 
 
 def init_api(app):
@@ -26,3 +27,4 @@ def init_api(app):
     api_v1.register_blueprint(questions_api_v1)
     api_v1.register_blueprint(surveys_api_v1)
     api_v1.register_blueprint(responses_api_v1)
+    api_v1.register_blueprint(metrics_api_v1)
@@ -2,10 +2,12 @@ from .surveys_api import surveys_api
 from .distribution_api import distribution_api
 from .questions_api import questions_api
 from .responses_api import responses_api
+from .metrics_api import metrics_api
 
 __all__ = [
     "surveys_api",
     "distribution_api",
     "questions_api",
     "responses_api",
+    "metrics_api",
 ]
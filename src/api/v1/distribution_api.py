@@ -45,4 +45,10 @@ def get_distributions_by_survey_id(
 def increment_distribution_click(
     distribution_id, distribution_service: DistributionService
 ):
-    return distribution_service.increment_distribution_click(str(distribution_id))
+    clicked_count = distribution_service.increment_distribution_click(
+        str(distribution_id)
+    )
+    if clicked_count is None:
+        # Buffered, the click is applied on the next flush
+        return "", 202
+    return clicked_count
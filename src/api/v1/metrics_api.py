@@ -0,0 +1,29 @@
+from flask_smorest import Blueprint
+from injector import inject
+from app import cache
+from src.services.email_render_service import EmailRenderService
+
+metrics_api = Blueprint(
+    "metrics_api_v1",
+    "metrics_api_v1",
+    url_prefix="/api/v1/metrics",
+)
+
+
+@metrics_api.get("/cache")
+@metrics_api.response(200)
+def get_cache_metrics():
+    """
+    Get the cache hit and miss counts of this worker process
+    """
+    return cache.stats()
+
+
+@metrics_api.get("/email-templates")
+@metrics_api.response(200)
+@inject
+def get_email_template_metrics(email_render_service: EmailRenderService):
+    """
+    Get the survey email template hit and miss counts of this worker process
+    """
+    return email_render_service.stats()
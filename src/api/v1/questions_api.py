@@ -6,6 +6,7 @@ from src.schema.question_schema import (
     CreateBulkQuestionSchema,
 )
 from src.domain.question.question_service import QuestionService
+from src.decorators import conditional_get, survey_version
 
 questions_api = Blueprint(
     "questions_api_v1",
@@ -16,6 +17,7 @@ questions_api = Blueprint(
 
 @questions_api.get("/by-survey/<uuid:survey_id>")
 @questions_api.response(200, QuestionSchema(many=True))
+@conditional_get(survey_version)
 @inject
 def get_questions_by_survey_id(survey_id, question_service: QuestionService):
     return question_service.get_questions_by_survey_id(str(survey_id))
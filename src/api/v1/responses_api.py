@@ -1,10 +1,16 @@
+from flask import Response, request, stream_with_context
 from flask_smorest import Blueprint
 from injector import inject
 from src.domain.response.response_service import ResponseService
+from src.decorators import conditional_get, survey_version
 from src.schema.response_schema import (
     CreateResponseSchema,
     SubmitAnswersSchema,
     ResponseSchema,
+    ResponseCountsQuerySchema,
+    ExportResponsesQuerySchema,
+    BulkImportQuerySchema,
+    BatchGetResponseAnswersSchema,
 )
 from src.shared.schema import PaginationRequestSchema
 from src.schema.response_schema import SurveyResponsePaginatedSchema
@@ -16,6 +22,9 @@ responses_api = Blueprint(
     url_prefix="/api/v1/responses",
 )
 
+# Analytics cover windows relative to now, so their ETags rotate every minute
+ANALYTICS_ETAG_WINDOW = 60
+
 
 @responses_api.post("/")
 @responses_api.arguments(CreateResponseSchema)
@@ -36,6 +45,17 @@ def submit_answers(data, response_id, response_service: ResponseService):
     return response_service.submit_answers(str(response_id), data["answers"])
 
 
+@responses_api.post("/answers:batchGet")
+@responses_api.arguments(BatchGetResponseAnswersSchema)
+@responses_api.response(200)
+@inject
+def batch_get_response_answers(data, response_service: ResponseService):
+    """
+    Get all answers of up to 500 responses
+    """
+    return response_service.batch_get_response_answers(data["response_ids"])
+
+
 @responses_api.get("/<uuid:response_id>/answers")
 @responses_api.response(200)
 @inject
@@ -56,8 +76,45 @@ def get_survey_responses(query, survey_id, response_service: ResponseService):
     return result
 
 
+@responses_api.get("/survey/<uuid:survey_id>/export")
+@responses_api.arguments(ExportResponsesQuerySchema, location="query")
+@inject
+def export_survey_responses(query, survey_id, response_service: ResponseService):
+    """
+    Stream all responses of a survey with their answers as CSV or NDJSON
+    """
+    export_format = query["format"]
+    rows = response_service.export_responses(str(survey_id), export_format)
+    return Response(
+        stream_with_context(rows),
+        mimetype="text/csv" if export_format == "csv" else "application/x-ndjson",
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=survey-{survey_id}-responses.{export_format}"
+            )
+        },
+    )
+
+
+@responses_api.post("/survey/<uuid:survey_id>/bulk-import")
+@responses_api.arguments(BulkImportQuerySchema, location="query")
+@responses_api.response(200)
+@inject
+def bulk_import_survey_responses(query, survey_id, response_service: ResponseService):
+    """
+    Import responses with their answers from an NDJSON or CSV body
+    """
+    import_format = query.get("format") or (
+        "csv" if request.mimetype == "text/csv" else "ndjson"
+    )
+    return response_service.bulk_import_responses(
+        str(survey_id), request.stream, import_format
+    )
+
+
 @responses_api.get("/survey/<uuid:survey_id>/analytics")
 @responses_api.response(200)
+@conditional_get(survey_version, window=ANALYTICS_ETAG_WINDOW)
 @inject
 def get_survey_analytics(survey_id, response_service: ResponseService):
     """
@@ -68,18 +125,25 @@ def get_survey_analytics(survey_id, response_service: ResponseService):
 
 
 @responses_api.get("/survey/<uuid:survey_id>/analytics/daily-responses")
+@responses_api.arguments(ResponseCountsQuerySchema, location="query")
 @responses_api.response(200)
+@conditional_get(survey_version, window=ANALYTICS_ETAG_WINDOW)
 @inject
-def get_daily_responses(survey_id, response_service: ResponseService):
+def get_daily_responses(
+    query,
+    survey_id,
+    response_service: ResponseService,
+):
     """
-    Get daily response counts for the last 30 days
+    Get response counts per hour, day or week. Defaults to daily counts for the last 30 days
     """
-    result = response_service.get_daily_response_counts(str(survey_id))
+    result = response_service.get_daily_response_counts(str(survey_id), query)
     return result
 
 
 @responses_api.get("/survey/<uuid:survey_id>/analytics/question-analytics")
 @responses_api.response(200)
+@conditional_get(survey_version, window=ANALYTICS_ETAG_WINDOW)
 @inject
 def get_question_analytics(survey_id, response_service: ResponseService):
     """
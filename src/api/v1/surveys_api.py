@@ -5,8 +5,9 @@ from src.schema.survey_schema import (
     SurveySchema,
     CreateSurveySchema,
     SurveyPaginatedSchema,
+    SurveyQuerySchema,
 )
-from src.shared.schema import PaginationRequestSchema
+from src.decorators import conditional_get, survey_version
 
 
 surveys_api = Blueprint(
@@ -17,7 +18,7 @@ surveys_api = Blueprint(
 
 
 @surveys_api.get("/")
-@surveys_api.arguments(PaginationRequestSchema, location="query")
+@surveys_api.arguments(SurveyQuerySchema, location="query")
 @surveys_api.response(200, SurveyPaginatedSchema)
 @inject
 def query_surveys(query, survey_service: SurveyService):
@@ -26,6 +27,7 @@ def query_surveys(query, survey_service: SurveyService):
 
 @surveys_api.get("/<uuid:survey_id>")
 @surveys_api.response(200, SurveySchema)
+@conditional_get(survey_version)
 @inject
 def get_survey_by_id(survey_id, survey_service: SurveyService):
     return survey_service.get_survey_by_id(str(survey_id))
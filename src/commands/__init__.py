@@ -0,0 +1,9 @@
+from .stats_commands import stats_cli
+from .scheduler_commands import scheduler_cli
+
+__all__ = ["stats_cli", "scheduler_cli", "register_commands"]
+
+
+def register_commands(app):
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(scheduler_cli)
@@ -0,0 +1,28 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app import scheduler
+from src.shared.scheduler_leader import SchedulerLeader
+
+scheduler_cli = AppGroup("scheduler", help="Run the background job scheduler.")
+
+
+@scheduler_cli.command("run")
+def run_scheduler():
+    """
+    Executes the scheduled jobs in the foreground, for web workers started with
+    SCHEDULER_MODE=enqueue. Several replicas elect a single leader.
+    """
+    leader = SchedulerLeader(
+        scheduler,
+        current_app.config["SQLALCHEMY_DATABASE_URI"],
+        current_app.config["SCHEDULER_LEADER_INTERVAL"],
+    )
+    click.echo("Scheduler started, waiting for the leader lock.")
+    try:
+        leader.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.shutdown()
+    click.echo("Scheduler stopped.")
@@ -0,0 +1,20 @@
+import click
+from flask.cli import AppGroup
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+stats_cli = AppGroup("stats", help="Manage the survey analytics rollup.")
+
+
+@stats_cli.command("rebuild")
+@click.option(
+    "--survey-id",
+    default=None,
+    help="Only rebuild the rollup of this survey. Rebuilds every survey by default.",
+)
+def rebuild_stats(survey_id):
+    """
+    Recomputes the survey analytics rollup from the raw tables.
+    Use it to backfill after migrating or to repair drifted counters.
+    """
+    rebuilt = SurveyStatsRepository().rebuild(survey_id)
+    click.echo(f"Rebuilt analytics rollup of {rebuilt} survey(s).")
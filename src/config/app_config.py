@@ -8,3 +8,14 @@ class AppConfig:
         os.getenv("DEBUG").lower() if os.getenv("DEBUG") is not None else None
     ) == "true"
     CLIENT_URL = os.environ.get("CLIENT_URL")
+    # Buffer distribution link clicks in process and flush them every N ms, 0 disables
+    CLICK_BUFFER_FLUSH_MS = int(os.environ.get("CLICK_BUFFER_FLUSH_MS", 0))
+    # Responses smaller than this many bytes are sent uncompressed, -1 disables compression
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+    # Report the queries of each request in X-Query-Count and Server-Timing headers
+    QUERY_PROFILER = os.environ.get("QUERY_PROFILER", "false").lower() == "true"
+    # Warn about requests running more queries than this, 0 disables
+    QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", 30))
+    # Warn about statements a request runs at least this many times
+    QUERY_REPEAT_THRESHOLD = int(os.environ.get("QUERY_REPEAT_THRESHOLD", 5))
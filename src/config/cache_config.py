@@ -0,0 +1,10 @@
+import os
+
+
+class CacheConfig:
+    # memory, redis or none
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_URL = os.environ.get("CACHE_URL")
+    CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "levo:")
+    CACHE_DEFAULT_TTL = int(os.environ.get("CACHE_DEFAULT_TTL", 300))
+    CACHE_MAX_SIZE = int(os.environ.get("CACHE_MAX_SIZE", 1024))
@@ -1,7 +1,9 @@
 from .app_config import AppConfig
 from .database_config import DatabaseConfig
 from .mail_config import MailConfig
+from .cache_config import CacheConfig
+from .scheduler_config import SchedulerConfig
 
 
-class Config(AppConfig, DatabaseConfig, MailConfig):
+class Config(AppConfig, DatabaseConfig, MailConfig, CacheConfig, SchedulerConfig):
     pass
@@ -8,3 +8,15 @@ class DatabaseConfig:
         "pool_pre_ping": True,
         "pool_recycle": 300,
     }
+    # Comma separated read replicas, used by read-only repository methods
+    SQLALCHEMY_REPLICA_URIS = [
+        uri.strip()
+        for uri in os.environ.get("SQLALCHEMY_REPLICA_URIS", "").split(",")
+        if uri.strip()
+    ]
+    # Seconds of replication lag after which a replica is skipped
+    SQLALCHEMY_REPLICA_MAX_LAG = float(os.environ.get("SQLALCHEMY_REPLICA_MAX_LAG", 5))
+    # Seconds between lag checks of a replica
+    SQLALCHEMY_REPLICA_CHECK_INTERVAL = float(
+        os.environ.get("SQLALCHEMY_REPLICA_CHECK_INTERVAL", 5)
+    )
@@ -9,3 +9,12 @@ class MailConfig:
     MAIL_USERNAME = os.environ.get("MAIL_USERNAME")
     MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.environ.get("MAIL_DEFAULT_SENDER")
+    # Number of recipients sent over a single SMTP connection per job
+    MAIL_BATCH_SIZE = int(os.environ.get("MAIL_BATCH_SIZE", 100))
+    # Number of rendered campaign emails kept in memory
+    MAIL_TEMPLATE_CACHE_SIZE = int(os.environ.get("MAIL_TEMPLATE_CACHE_SIZE", 128))
+    # "flask-mail" sends with blocking Flask-Mail, "async" with the asyncio transport
+    MAIL_TRANSPORT = os.environ.get("MAIL_TRANSPORT", "flask-mail")
+    # SMTP connections kept open by the asyncio transport, and messages in flight
+    MAIL_POOL_SIZE = int(os.environ.get("MAIL_POOL_SIZE", 10))
+    MAIL_TIMEOUT = float(os.environ.get("MAIL_TIMEOUT", 30))
@@ -0,0 +1,9 @@
+import os
+
+
+class SchedulerConfig:
+    # leader: every process runs a scheduler, but only the one holding the leader
+    # lock executes jobs. enqueue: only add jobs, `flask scheduler run` executes them
+    SCHEDULER_MODE = os.environ.get("SCHEDULER_MODE", "leader")
+    # Seconds between leader lock attempts and health checks
+    SCHEDULER_LEADER_INTERVAL = float(os.environ.get("SCHEDULER_LEADER_INTERVAL", 10))
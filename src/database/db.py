@@ -1,7 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
+from src.database.routing import ReplicaPool, RoutingSession
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def init_db(app):
@@ -9,4 +10,11 @@ def init_db(app):
 
     app.config.from_object(DatabaseConfig)
     db.init_app(app)
+    if app.config["SQLALCHEMY_REPLICA_URIS"]:
+        app.extensions["replicas"] = ReplicaPool(
+            app.config["SQLALCHEMY_REPLICA_URIS"],
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"],
+            app.config["SQLALCHEMY_REPLICA_MAX_LAG"],
+            app.config["SQLALCHEMY_REPLICA_CHECK_INTERVAL"],
+        )
     return db
@@ -0,0 +1,40 @@
+"""response external id unique
+
+Revision ID: 09755e6c62d3
+Revises: ab2fc188e3bd
+Create Date: 2026-10-18 11:27:52.604318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '09755e6c62d3'
+down_revision = 'ab2fc188e3bd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bulk imports deduplicate on the external id of a response within its survey
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_response_survey_id_external_response_id',
+            'response',
+            ['survey_id', 'external_response_id'],
+            unique=True,
+            postgresql_where=sa.text('external_response_id IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_response_survey_id_external_response_id',
+            table_name='response',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
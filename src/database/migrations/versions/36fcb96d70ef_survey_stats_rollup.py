@@ -0,0 +1,112 @@
+"""survey stats rollup
+
+Revision ID: 36fcb96d70ef
+Revises: b1a5006c6078
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '36fcb96d70ef'
+down_revision = 'b1a5006c6078'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('survey_stats',
+    sa.Column('survey_id', sa.UUID(), nullable=False),
+    sa.Column('total_responses', sa.Integer(), nullable=False),
+    sa.Column('internal_responses', sa.Integer(), nullable=False),
+    sa.Column('external_responses', sa.Integer(), nullable=False),
+    sa.Column('total_answers', sa.Integer(), nullable=False),
+    sa.Column('total_distributions', sa.Integer(), nullable=False),
+    sa.Column('pending_distributions', sa.Integer(), nullable=False),
+    sa.Column('sent_distributions', sa.Integer(), nullable=False),
+    sa.Column('opened_distributions', sa.Integer(), nullable=False),
+    sa.Column('clicked_distributions', sa.Integer(), nullable=False),
+    sa.Column('failed_distributions', sa.Integer(), nullable=False),
+    sa.Column('total_clicks', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['survey_id'], ['survey.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('survey_id')
+    )
+    op.create_table('survey_stats_bucket',
+    sa.Column('survey_id', sa.UUID(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('responses', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['survey_id'], ['survey.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('survey_id', 'bucket_start')
+    )
+
+    # Backfill the rollup of the existing surveys, like SurveyStatsRepository.rebuild
+    op.execute(
+        """
+        INSERT INTO survey_stats_bucket (survey_id, bucket_start, responses)
+        SELECT survey_id, date_trunc('hour', created_at), count(*)
+        FROM response
+        WHERE created_at IS NOT NULL
+        GROUP BY survey_id, date_trunc('hour', created_at)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO survey_stats (
+            survey_id, total_responses, internal_responses, external_responses,
+            total_answers, total_distributions, pending_distributions,
+            sent_distributions, opened_distributions, clicked_distributions,
+            failed_distributions, total_clicks, updated_at
+        )
+        SELECT
+            survey.id,
+            coalesce(responses.total, 0),
+            coalesce(responses.internal, 0),
+            coalesce(responses.external, 0),
+            coalesce(answers.total, 0),
+            coalesce(distributions.total, 0),
+            coalesce(distributions.pending, 0),
+            coalesce(distributions.sent, 0),
+            coalesce(distributions.opened, 0),
+            coalesce(distributions.clicked, 0),
+            coalesce(distributions.failed, 0),
+            coalesce(distributions.clicks, 0),
+            now() AT TIME ZONE 'UTC'
+        FROM survey
+        LEFT JOIN (
+            SELECT
+                survey_id,
+                count(*) AS total,
+                count(*) FILTER (WHERE source = 'INTERNAL') AS internal,
+                count(*) FILTER (WHERE source = 'EXTERNAL') AS external
+            FROM response
+            GROUP BY survey_id
+        ) AS responses ON responses.survey_id = survey.id
+        LEFT JOIN (
+            SELECT response.survey_id, count(answer.id) AS total
+            FROM response
+            JOIN answer ON answer.response_id = response.id
+            GROUP BY response.survey_id
+        ) AS answers ON answers.survey_id = survey.id
+        LEFT JOIN (
+            SELECT
+                survey_id,
+                count(*) AS total,
+                count(*) FILTER (WHERE status = 'PENDING') AS pending,
+                count(*) FILTER (WHERE status = 'SENT') AS sent,
+                count(*) FILTER (WHERE status = 'OPENED') AS opened,
+                count(*) FILTER (WHERE status = 'CLICKED') AS clicked,
+                count(*) FILTER (WHERE status = 'FAILED') AS failed,
+                sum(clicked_count) AS clicks
+            FROM distribution
+            GROUP BY survey_id
+        ) AS distributions ON distributions.survey_id = survey.id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('survey_stats_bucket')
+    op.drop_table('survey_stats')
@@ -0,0 +1,49 @@
+"""access pattern indexes
+
+Revision ID: 51b40d56353f
+Revises: 36fcb96d70ef
+Create Date: 2026-10-18 10:03:27.541886
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '51b40d56353f'
+down_revision = '36fcb96d70ef'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_response_survey_id_created_at', 'response', ['survey_id', 'created_at']),
+    ('ix_distribution_survey_id_status', 'distribution', ['survey_id', 'status']),
+    ('ix_answer_question_id_response_id', 'answer', ['question_id', 'response_id']),
+    ('ix_answer_response_id', 'answer', ['response_id']),
+    ('ix_question_survey_id_order', 'question', ['survey_id', 'order']),
+]
+
+
+def upgrade():
+    # Build the indexes without locking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,46 @@
+"""keyset pagination indexes
+
+Revision ID: ab2fc188e3bd
+Revises: 51b40d56353f
+Create Date: 2026-10-18 10:41:09.217730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ab2fc188e3bd'
+down_revision = '51b40d56353f'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_survey_created_at_id', 'survey', ['created_at', 'id']),
+    ('ix_distribution_created_at_id', 'distribution', ['created_at', 'id']),
+]
+
+
+def upgrade():
+    # Build the indexes without locking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
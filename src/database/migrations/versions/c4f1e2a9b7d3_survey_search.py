@@ -0,0 +1,75 @@
+"""survey search
+
+Revision ID: c4f1e2a9b7d3
+Revises: 09755e6c62d3
+Create Date: 2026-10-18 12:05:14.218630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1e2a9b7d3'
+down_revision = '09755e6c62d3'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Stored generated column, Postgres keeps it up to date on every write
+    op.add_column(
+        'survey',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_survey_search_vector',
+            'survey',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_survey_title_trgm',
+            'survey',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_survey_title_trgm',
+            table_name='survey',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_survey_search_vector',
+            table_name='survey',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('survey', 'search_vector')
+    # pg_trgm is left installed, other database objects may rely on it
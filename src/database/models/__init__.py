@@ -3,5 +3,14 @@ from .question_model import Question
 from .response_model import Response
 from .answer_model import Answer
 from .distribution_model import Distribution
+from .survey_stats_model import SurveyStats, SurveyStatsBucket
 
-__all__ = ["Survey", "Question", "Response", "Answer", "Distribution"]
+__all__ = [
+    "Survey",
+    "Question",
+    "Response",
+    "Answer",
+    "Distribution",
+    "SurveyStats",
+    "SurveyStatsBucket",
+]
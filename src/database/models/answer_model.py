@@ -8,6 +8,10 @@ class Answer(db.Model):
     """Answer model"""
 
     __tablename__ = "answer"
+    __table_args__ = (
+        db.Index("ix_answer_question_id_response_id", "question_id", "response_id"),
+        db.Index("ix_answer_response_id", "response_id"),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     value = db.Column(db.Text)  # For text, single choice answers
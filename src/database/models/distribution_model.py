@@ -23,6 +23,10 @@ class Distribution(db.Model):
     """Distribution model"""
 
     __tablename__ = "distribution"
+    __table_args__ = (
+        db.Index("ix_distribution_survey_id_status", "survey_id", "status"),
+        db.Index("ix_distribution_created_at_id", "created_at", "id"),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     method = db.Column(
@@ -8,6 +8,7 @@ class Question(db.Model):
     """Question model"""
 
     __tablename__ = "question"
+    __table_args__ = (db.Index("ix_question_survey_id_order", "survey_id", "order"),)
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     text = db.Column(db.Text, nullable=False)
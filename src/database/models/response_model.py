@@ -14,6 +14,16 @@ class Response(db.Model):
     """Response model"""
 
     __tablename__ = "response"
+    __table_args__ = (
+        db.Index("ix_response_survey_id_created_at", "survey_id", "created_at"),
+        db.Index(
+            "uq_response_survey_id_external_response_id",
+            "survey_id",
+            "external_response_id",
+            unique=True,
+            postgresql_where=db.text("external_response_id IS NOT NULL"),
+        ),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     respondent_email = db.Column(db.String(255))
@@ -49,6 +59,12 @@ class Response(db.Model):
     def __repr__(self):
         return f"<Response {self.id}>"
 
+    @property
+    def answer_count(self) -> int:
+        """Number of answers, preloaded on lists by ResponseRepository.attach_answer_counts"""
+        count = getattr(self, "_answer_count", None)
+        return self.answers.count() if count is None else count
+
     def to_dict(self):
         """Convert response to dictionary"""
         return {
@@ -59,7 +75,7 @@ class Response(db.Model):
             "external_response_id": self.external_response_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "answer_count": self.answers.count(),
+            "answer_count": self.answer_count,
             "survey_id": str(self.survey_id),
             "distribution_id": (
                 str(self.distribution_id) if self.distribution_id else None
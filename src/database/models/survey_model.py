@@ -1,10 +1,18 @@
 from datetime import datetime
 from src.database.db import db
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 import uuid
 from enum import Enum
 
 
+# Titles weigh more than descriptions in search ranking. The simple configuration
+# doesn't stem, so it works the same for surveys in any language.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
 class SurveyType(Enum):
     INTERNAL = "internal"
     EXTERNAL = "external"  # Google Form
@@ -14,6 +22,16 @@ class Survey(db.Model):
     """Survey model"""
 
     __tablename__ = "survey"
+    __table_args__ = (
+        db.Index("ix_survey_created_at_id", "created_at", "id"),
+        db.Index("ix_survey_search_vector", "search_vector", postgresql_using="gin"),
+        db.Index(
+            "ix_survey_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = db.Column(db.String(255), nullable=False)
@@ -25,6 +43,10 @@ class Survey(db.Model):
         default=SurveyType.INTERNAL,
     )
     external_url = db.Column(db.String(500))
+    # Maintained by Postgres, only loaded when accessed
+    search_vector = db.deferred(
+        db.Column(TSVECTOR, db.Computed(SEARCH_VECTOR, persisted=True))
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -43,6 +65,18 @@ class Survey(db.Model):
     def __repr__(self):
         return f"<Survey {self.title}>"
 
+    @property
+    def question_count(self) -> int:
+        """Number of questions, preloaded on lists by SurveyRepository.attach_counts"""
+        count = getattr(self, "_question_count", None)
+        return self.questions.count() if count is None else count
+
+    @property
+    def response_count(self) -> int:
+        """Number of responses, preloaded on lists by SurveyRepository.attach_counts"""
+        count = getattr(self, "_response_count", None)
+        return self.responses.count() if count is None else count
+
     def to_dict(self):
         """Convert survey to dictionary"""
         return {
@@ -55,6 +89,6 @@ class Survey(db.Model):
             "external_url": self.external_url,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "question_count": self.questions.count(),
-            "response_count": self.responses.count(),
+            "question_count": self.question_count,
+            "response_count": self.response_count,
         }
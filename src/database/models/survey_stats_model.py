@@ -0,0 +1,75 @@
+from datetime import datetime
+from src.database.db import db
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class SurveyStats(db.Model):
+    """Per-survey analytics rollup, updated incrementally on every write"""
+
+    __tablename__ = "survey_stats"
+
+    survey_id = db.Column(
+        UUID(as_uuid=True),
+        db.ForeignKey("survey.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_responses = db.Column(db.Integer, nullable=False, default=0)
+    internal_responses = db.Column(db.Integer, nullable=False, default=0)
+    external_responses = db.Column(db.Integer, nullable=False, default=0)
+    total_answers = db.Column(db.Integer, nullable=False, default=0)
+    total_distributions = db.Column(db.Integer, nullable=False, default=0)
+    pending_distributions = db.Column(db.Integer, nullable=False, default=0)
+    sent_distributions = db.Column(db.Integer, nullable=False, default=0)
+    opened_distributions = db.Column(db.Integer, nullable=False, default=0)
+    clicked_distributions = db.Column(db.Integer, nullable=False, default=0)
+    failed_distributions = db.Column(db.Integer, nullable=False, default=0)
+    total_clicks = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<SurveyStats {self.survey_id}>"
+
+    def to_dict(self):
+        """Convert survey stats to dictionary"""
+        return {
+            "survey_id": str(self.survey_id),
+            "total_responses": self.total_responses,
+            "internal_responses": self.internal_responses,
+            "external_responses": self.external_responses,
+            "total_answers": self.total_answers,
+            "total_distributions": self.total_distributions,
+            "pending_distributions": self.pending_distributions,
+            "sent_distributions": self.sent_distributions,
+            "opened_distributions": self.opened_distributions,
+            "clicked_distributions": self.clicked_distributions,
+            "failed_distributions": self.failed_distributions,
+            "total_clicks": self.total_clicks,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class SurveyStatsBucket(db.Model):
+    """Hourly response counts of a survey, rolled up into days on read"""
+
+    __tablename__ = "survey_stats_bucket"
+
+    survey_id = db.Column(
+        UUID(as_uuid=True),
+        db.ForeignKey("survey.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    responses = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SurveyStatsBucket {self.survey_id} {self.bucket_start}>"
+
+    def to_dict(self):
+        """Convert survey stats bucket to dictionary"""
+        return {
+            "survey_id": str(self.survey_id),
+            "bucket_start": self.bucket_start.isoformat(),
+            "responses": self.responses,
+        }
@@ -0,0 +1,191 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from typing import List, Optional
+import logging
+import time
+from flask import current_app, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# "replica" inside read_only calls, "primary" inside use_primary blocks
+_route: ContextVar[Optional[str]] = ContextVar("db_route", default=None)
+
+REPLICA_LAG_QUERY = text(
+    "SELECT COALESCE(CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END, 0)"
+)
+
+
+class Replica:
+    """A read replica engine with its last measured lag"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.lag: Optional[float] = None
+        self.healthy = True
+        self.checked_at = 0.0
+
+
+class ReplicaPool:
+    """
+    Picks the replica engine of read-only work in round robin, skipping replicas
+    that lag more than `max_lag` seconds or fail their check.
+    Replicas are checked at most every `check_interval` seconds, when picked.
+    """
+
+    def __init__(
+        self,
+        uris: List[str],
+        engine_options: Optional[dict] = None,
+        max_lag: float = 5,
+        check_interval: float = 5,
+    ):
+        self.replicas = [
+            Replica(create_engine(uri, **(engine_options or {}))) for uri in uris
+        ]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._next = 0
+        self._lock = Lock()
+        for replica in self.replicas:
+            event.listen(
+                replica.engine,
+                "handle_error",
+                lambda context, replica=replica: self._on_error(replica, context),
+            )
+
+    def choose(self) -> Optional[Engine]:
+        """The engine of the next usable replica, or None to use the primary"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if self._is_usable(replica):
+                return replica.engine
+        return None
+
+    def status(self) -> List[dict]:
+        return [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag,
+            }
+            for replica in self.replicas
+        ]
+
+    def _is_usable(self, replica: Replica) -> bool:
+        if time.monotonic() - replica.checked_at >= self.check_interval:
+            self._check(replica)
+        return replica.healthy
+
+    def _check(self, replica: Replica):
+        replica.checked_at = time.monotonic()
+        try:
+            if replica.engine.dialect.name == "postgresql":
+                with replica.engine.connect() as connection:
+                    replica.lag = float(connection.execute(REPLICA_LAG_QUERY).scalar())
+            else:
+                replica.lag = 0.0
+        except Exception as e:
+            logger.warning(f"Read replica {replica.engine.url} is unavailable: {e}")
+            replica.healthy = False
+            return
+
+        healthy = replica.lag <= self.max_lag
+        if healthy != replica.healthy:
+            logger.warning(
+                f"Read replica {replica.engine.url} is {'back' if healthy else 'lagging'}, "
+                f"{replica.lag:.1f}s behind"
+            )
+        replica.healthy = healthy
+
+    def _on_error(self, replica: Replica, context):
+        # Stop routing to a replica that lost its connection until its next check
+        if context.is_disconnect:
+            replica.healthy = False
+            replica.checked_at = time.monotonic()
+
+
+class RoutingSession(Session):
+    """
+    Session that runs the queries of `read_only` calls on a read replica.
+    Everything else, flushes, statements other than SELECT and any read after
+    this session wrote go to the primary, so a request always reads its own
+    writes. A transaction keeps
+    the replica it started with.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica():
+            replicas = current_app.extensions.get("replicas")
+            if replicas is not None:
+                if "replica" not in self.info:
+                    self.info["replica"] = replicas.choose()
+                if self.info["replica"] is not None:
+                    return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def close(self):
+        super().close()
+        self.info.pop("wrote", None)
+
+    def _reads_from_replica(self) -> bool:
+        return (
+            _route.get() == "replica"
+            and not self._flushing
+            and not self.info.get("wrote")
+            and has_app_context()
+        )
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_written(orm_execute_state):
+    # Core writes like session.execute(insert(...)) don't flush. Marked before
+    # they run, so a write in a read_only call still goes to the primary
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_replica(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("replica", None)
+
+
+def read_only(func):
+    """
+    Decorator running a repository method on a read replica when replicas are
+    configured. Use it only on methods that never write.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _route.set(_route.get() or "replica")
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _route.reset(token)
+
+    return wrapper
+
+
+@contextmanager
+def use_primary():
+    """Make read_only calls in the block read from the primary, to see recent writes"""
+    token = _route.set("primary")
+    try:
+        yield
+    finally:
+        _route.reset(token)
@@ -1,3 +1,4 @@
 from .validate_input import validate_input
+from .conditional_get import conditional_get, survey_version
 
-__all__ = ["validate_input"]
+__all__ = ["validate_input", "conditional_get", "survey_version"]
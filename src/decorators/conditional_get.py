@@ -0,0 +1,60 @@
+from functools import wraps
+from hashlib import sha1
+import time
+from flask import Response, after_this_request, current_app, request
+from src.domain.survey.survey_repository import SurveyRepository
+
+
+def survey_version(survey_id, **_):
+    """
+    Version of the endpoints derived from a single survey, from one lookup of
+    the survey, its questions and its analytics rollup. Read fresh, the view's
+    cached reads then use this same version.
+    """
+    survey_repository = current_app.extensions["injector"].get(SurveyRepository)
+    return survey_repository.get_version(str(survey_id), fresh=True)
+
+
+def conditional_get(version, max_age: int = 0, window: int = None):
+    """
+    Decorator answering GET requests with weak ETags, and with 304 Not Modified
+    before running the view when the client already has the current version.
+
+    Place it below `response` so the 304 skips serialization, and above `inject`.
+
+    :param version: Called with the view keyword arguments, returns a cheap
+        version of the resource (e.g. updated_at values) or None to skip the ETag,
+        like `survey_version`.
+    :param max_age: Seconds clients may reuse the response without revalidating.
+    :param window: For payloads relative to the current time, rotate the ETag
+        at least every `window` seconds.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            resource_version = version(**kwargs)
+            if resource_version is None:
+                return func(*args, **kwargs)
+
+            parts = [request.full_path, *resource_version]
+            if window:
+                parts.append(int(time.time() // window))
+            etag = sha1(repr(parts).encode()).hexdigest()
+
+            def set_caching_headers(response):
+                response.set_etag(etag, weak=True)
+                response.cache_control.private = True
+                response.cache_control.max_age = max_age
+                response.cache_control.must_revalidate = True
+                return response
+
+            if request.if_none_match.contains_weak(etag):
+                return set_caching_headers(Response(status=304))
+
+            after_this_request(set_caching_headers)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,8 +1,16 @@
-from typing import List, Optional
+from typing import List, Dict, Any
+from sqlalchemy import func, case, literal, select, union_all, true, Text
 from src.shared.base_repository import BaseRepository
 from src.database.models.answer_model import Answer
+from src.database.models.response_model import Response
+from src.database.models.question_model import Question
+from src.database.db import db
+from src.database.routing import read_only
 import uuid
 
+# Columns an answer is stored in, one per kind of question
+ANSWER_COLUMNS = ["value", "values", "rating", "date_value"]
+
 
 class AnswerRepository(BaseRepository[Answer]):
     """Repository for Answer operations"""
@@ -17,3 +25,146 @@ class AnswerRepository(BaseRepository[Answer]):
     def get_answers_by_question(self, question_id: str) -> List[Answer]:
         """Get all answers for a question"""
         return self.model.query.filter_by(question_id=uuid.UUID(question_id)).all()
+
+    def get_answer_columns(
+        self, survey_id: str, sample_size: int = 100
+    ) -> Dict[uuid.UUID, str]:
+        """
+        Get the column the questions of a survey are answered in, the most common
+        one among up to `sample_size` of their answers. Questions are untyped, so
+        this is how the kind of a question is known. Unanswered ones are left out.
+        """
+        sample = (
+            select(*[getattr(self.model, column) for column in ANSWER_COLUMNS])
+            .where(self.model.question_id == Question.id)
+            .limit(sample_size)
+            .lateral("sample")
+        )
+        rows = db.session.execute(
+            select(
+                Question.id,
+                *[
+                    func.count(sample.c[column]).label(column)
+                    for column in ANSWER_COLUMNS
+                ],
+            )
+            .join(sample, true())
+            .where(Question.survey_id == uuid.UUID(str(survey_id)))
+            .group_by(Question.id)
+        ).all()
+
+        columns = {}
+        for row in rows:
+            counts = {column: row._mapping[column] for column in ANSWER_COLUMNS}
+            if any(counts.values()):
+                columns[row.id] = max(ANSWER_COLUMNS, key=counts.get)
+        return columns
+
+    @read_only
+    def get_question_aggregates(
+        self, survey_id: str
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """
+        Get answer aggregates for every question of a survey in one grouped query.
+        Returns a mapping of question id to its totals and rating/text aggregates.
+        """
+        has_value = db.and_(self.model.value.isnot(None), self.model.value != "")
+        # `values` is plain JSON, so a python None is stored as a JSON null
+        values_length = case(
+            (
+                func.json_typeof(self.model.values) == "array",
+                func.json_array_length(self.model.values),
+            ),
+            else_=0,
+        )
+        answered = db.or_(
+            has_value,
+            values_length > 0,
+            func.coalesce(self.model.rating, 0) != 0,
+            self.model.date_value.isnot(None),
+        )
+
+        rows = (
+            db.session.query(
+                self.model.question_id,
+                func.count(self.model.id).label("total"),
+                func.count(case((answered, 1))).label("answered"),
+                func.avg(case((has_value, func.char_length(self.model.value)))).label(
+                    "avg_length"
+                ),
+                func.count(self.model.rating).label("rating_count"),
+                func.avg(self.model.rating).label("rating_avg"),
+                func.min(self.model.rating).label("rating_min"),
+                func.max(self.model.rating).label("rating_max"),
+            )
+            .join(Response, self.model.response_id == Response.id)
+            .filter(Response.survey_id == uuid.UUID(survey_id))
+            .group_by(self.model.question_id)
+            .all()
+        )
+
+        return {
+            row.question_id: {
+                "total": row.total,
+                "answered": row.answered,
+                "avg_length": float(row.avg_length or 0),
+                "rating_count": row.rating_count,
+                "rating_avg": (
+                    float(row.rating_avg) if row.rating_avg is not None else None
+                ),
+                "rating_min": row.rating_min,
+                "rating_max": row.rating_max,
+            }
+            for row in rows
+        }
+
+    @read_only
+    def get_question_breakdowns(
+        self, survey_id: str
+    ) -> Dict[uuid.UUID, Dict[str, Dict[Any, int]]]:
+        """
+        Get rating histograms and checkbox option counts for every question of a
+        survey in one grouped query.
+        """
+        survey_uuid = uuid.UUID(survey_id)
+
+        ratings = (
+            select(
+                self.model.question_id,
+                literal("rating").label("kind"),
+                self.model.rating.cast(Text).label("key"),
+                func.count().label("count"),
+            )
+            .join(Response, self.model.response_id == Response.id)
+            .where(Response.survey_id == survey_uuid, self.model.rating.isnot(None))
+            .group_by(self.model.question_id, self.model.rating)
+        )
+
+        # Filtering on json_typeof runs before the set-returning projection
+        options = (
+            select(
+                self.model.question_id,
+                func.json_array_elements_text(self.model.values).label("option"),
+            )
+            .join(Response, self.model.response_id == Response.id)
+            .where(
+                Response.survey_id == survey_uuid,
+                func.json_typeof(self.model.values) == "array",
+            )
+            .subquery()
+        )
+        checkbox = select(
+            options.c.question_id,
+            literal("option").label("kind"),
+            options.c.option.label("key"),
+            func.count().label("count"),
+        ).group_by(options.c.question_id, options.c.option)
+
+        breakdowns: Dict[uuid.UUID, Dict[str, Dict[Any, int]]] = {}
+        for row in db.session.execute(union_all(ratings, checkbox)).all():
+            question = breakdowns.setdefault(
+                row.question_id, {"rating": {}, "option": {}}
+            )
+            key = int(row.key) if row.kind == "rating" else row.key
+            question[row.kind][key] = row.count
+        return breakdowns
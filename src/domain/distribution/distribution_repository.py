@@ -1,8 +1,32 @@
-from typing import List
+from typing import List, Iterable, Dict, Any, Optional, Tuple, Union
+from datetime import datetime
+from sqlalchemy import (
+    select,
+    update,
+    values,
+    column,
+    func,
+    case,
+    literal,
+    Integer,
+    Row,
+)
 from src.shared.base_repository import BaseRepository
-from src.database.models.distribution_model import Distribution
+from src.database.models.distribution_model import (
+    Distribution,
+    DistributionMethod,
+    DistributionStatus,
+)
+from src.database.db import db
 import uuid
 
+# Statuses a click moves forward to CLICKED, opened distributions stay opened
+CLICKABLE_STATUSES = [
+    DistributionStatus.PENDING,
+    DistributionStatus.SENT,
+    DistributionStatus.FAILED,
+]
+
 
 class DistributionRepository(BaseRepository[Distribution]):
     """Repository for Distribution operations"""
@@ -17,3 +41,190 @@ class DistributionRepository(BaseRepository[Distribution]):
     def get_by_recipient_email(self, email: str) -> List[Distribution]:
         """Get all distributions sent to a specific email"""
         return self.model.query.filter_by(recipient_email=email).all()
+
+    def get_pending_email_schedules(self, survey_id: str) -> List[Optional[datetime]]:
+        """Get the distinct scheduled times of the pending email distributions of a survey"""
+        return (
+            db.session.execute(
+                select(self.model.scheduled_at)
+                .where(
+                    self.model.survey_id == uuid.UUID(str(survey_id)),
+                    self.model.status == DistributionStatus.PENDING,
+                    self.model.method == DistributionMethod.EMAIL,
+                )
+                .distinct()
+            )
+            .scalars()
+            .all()
+        )
+
+    def claim_pending_email_distributions(
+        self, survey_id: str, scheduled_at: Optional[datetime], limit: int
+    ) -> List[Row]:
+        """
+        Get the columns needed to send a batch of pending email distributions
+        scheduled at the same time, locking their rows until the transaction ends.
+        Rows locked by another sender are skipped, so concurrent jobs of a
+        campaign never send the same distribution twice.
+        """
+        return db.session.execute(
+            select(
+                self.model.id,
+                self.model.recipient_email,
+                self.model.subject,
+                self.model.message,
+            )
+            .where(
+                self.model.survey_id == uuid.UUID(str(survey_id)),
+                self.model.status == DistributionStatus.PENDING,
+                self.model.method == DistributionMethod.EMAIL,
+                (
+                    self.model.scheduled_at.is_(None)
+                    if scheduled_at is None
+                    else self.model.scheduled_at == scheduled_at
+                ),
+            )
+            .order_by(self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+
+    def get_statuses(self, ids: Iterable) -> Dict[uuid.UUID, DistributionStatus]:
+        """Get the current status of many distributions in one query"""
+        ids = [uuid.UUID(str(id)) for id in ids]
+        if not ids:
+            return {}
+        rows = db.session.execute(
+            select(self.model.id, self.model.status).where(self.model.id.in_(ids))
+        )
+        return {id: status for id, status in rows}
+
+    def bulk_transition(
+        self,
+        ids: Iterable,
+        from_status: Union[DistributionStatus, Iterable[DistributionStatus]],
+        to_status: DistributionStatus,
+        timestamps: Optional[Dict[str, datetime]] = None,
+        commit: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Move many distributions to `to_status` in a single UPDATE, guarded on their
+        current status being one of `from_status`.
+
+        Args:
+            ids: Ids of the distributions
+            from_status: Status or statuses a distribution may be moved from
+            to_status: Status to move the distributions to
+            timestamps: Extra columns to set on the moved rows, e.g. {"sent_at": now}
+            commit: Commit right away, or leave it to the caller's transaction
+
+        Returns:
+            dict: Per-id outcomes, with
+                transitioned: id -> (survey_id, previous status) of the moved rows
+                skipped: id -> current status of the rows in another status
+                missing: ids that don't exist
+        """
+        ids = list({uuid.UUID(str(id)) for id in ids})
+        if isinstance(from_status, DistributionStatus):
+            from_status = [from_status]
+        from_status = list(from_status)
+        outcomes = {"transitioned": {}, "skipped": {}, "missing": []}
+        if not ids:
+            return outcomes
+
+        # Lock the matching rows so the previous status returned is the one replaced
+        current = (
+            select(self.model.id, self.model.status)
+            .where(self.model.id.in_(ids), self.model.status.in_(from_status))
+            .with_for_update()
+            .subquery()
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id == current.c.id)
+            .where(self.model.status.in_(from_status))
+            .values(
+                status=to_status, updated_at=datetime.utcnow(), **(timestamps or {})
+            )
+            .returning(self.model.id, self.model.survey_id, current.c.status)
+        )
+        for id, survey_id, previous_status in db.session.execute(stmt):
+            outcomes["transitioned"][id] = (survey_id, previous_status)
+
+        remaining = [id for id in ids if id not in outcomes["transitioned"]]
+        if remaining:
+            outcomes["skipped"] = self.get_statuses(remaining)
+            outcomes["missing"] = [
+                id for id in remaining if id not in outcomes["skipped"]
+            ]
+        if commit:
+            db.session.commit()
+        return outcomes
+
+    def add_clicks(
+        self,
+        deltas: Dict[Any, int],
+        clicked_at: Optional[datetime] = None,
+        commit: bool = True,
+    ) -> Dict[uuid.UUID, Tuple[uuid.UUID, DistributionStatus, int]]:
+        """
+        Atomically add click counts to many distributions in a single UPDATE,
+        stamping clicked_at and moving those in CLICKABLE_STATUSES to CLICKED.
+
+        Args:
+            deltas: Distribution id -> number of clicks to add
+            clicked_at: Time of the last click, defaults to now
+            commit: Commit right away, or leave it to the caller's transaction
+
+        Returns:
+            dict: id -> (survey_id, previous status, new clicked_count) of the
+                distributions that exist
+        """
+        deltas = {uuid.UUID(str(id)): count for id, count in deltas.items() if count}
+        if not deltas:
+            return {}
+
+        clicks = values(
+            column("id", self.model.id.type),
+            column("delta", Integer),
+            name="clicks",
+        ).data(list(deltas.items()))
+        # Lock the rows so the previous status returned is the one replaced
+        current = (
+            select(self.model.id, self.model.status, clicks.c.delta)
+            .join(clicks, clicks.c.id == self.model.id)
+            .with_for_update(of=self.model)
+            .subquery()
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id == current.c.id)
+            .values(
+                clicked_count=func.coalesce(self.model.clicked_count, 0)
+                + current.c.delta,
+                clicked_at=clicked_at or datetime.utcnow(),
+                status=case(
+                    (
+                        self.model.status.in_(CLICKABLE_STATUSES),
+                        literal(DistributionStatus.CLICKED, self.model.status.type),
+                    ),
+                    else_=self.model.status,
+                ),
+                updated_at=datetime.utcnow(),
+            )
+            .returning(
+                self.model.id,
+                self.model.survey_id,
+                current.c.status,
+                self.model.clicked_count,
+            )
+        )
+        result = {
+            id: (survey_id, previous_status, clicked_count)
+            for id, survey_id, previous_status, clicked_count in db.session.execute(
+                stmt
+            )
+        }
+        if commit:
+            db.session.commit()
+        return result
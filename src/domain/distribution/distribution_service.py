@@ -3,11 +3,11 @@ from werkzeug.exceptions import NotFound
 from uuid import uuid4
 from datetime import datetime
 import time
-from flask import render_template
 
 
-from .distribution_repository import DistributionRepository
+from .distribution_repository import DistributionRepository, CLICKABLE_STATUSES
 from ..survey.survey_repository import SurveyRepository
+from ..survey_stats.survey_stats_repository import SurveyStatsRepository
 from src.database.models.survey_model import SurveyType
 from src.database.models.distribution_model import (
     DistributionStatus,
@@ -15,10 +15,14 @@ from src.database.models.distribution_model import (
 )
 from src.services.scheduler_service import SchedulerService
 from src.services.mail_service import MailService
+from src.services.email_render_service import EmailRenderService
 import logging
-from src.database.db import db
 from src.config.app_config import AppConfig
-from typing import Optional
+from src.shared.counter_buffer import CounterBuffer
+from src.database.db import db
+from src.config.mail_config import MailConfig
+from typing import List, Optional
+from collections import Counter
 
 
 logger = logging.getLogger(__name__)
@@ -32,11 +36,24 @@ class DistributionService:
         survey_repository: SurveyRepository,
         scheduler_service: SchedulerService,
         mail_service: MailService,
+        survey_stats_repository: SurveyStatsRepository,
+        email_render_service: EmailRenderService,
     ):
         self.distribution_repository = distribution_repository
         self.survey_repository = survey_repository
         self.scheduler_service = scheduler_service
         self.mail_service = mail_service
+        self.survey_stats_repository = survey_stats_repository
+        self.email_render_service = email_render_service
+        self.click_buffer = (
+            CounterBuffer(
+                flush=self.flush_distribution_clicks,
+                interval_ms=AppConfig.CLICK_BUFFER_FLUSH_MS,
+                name="distribution-clicks",
+            )
+            if AppConfig.CLICK_BUFFER_FLUSH_MS > 0
+            else None
+        )
 
     def query_distributions(self, query: dict):
         """
@@ -80,34 +97,47 @@ class DistributionService:
                     **distribution_data,
                 }
                 for recipient_email in recipient_emails
-            ]
+            ],
+            commit=False,
         )
+        self.survey_stats_repository.record_distributions(survey_id, len(distributions))
+        db.session.commit()
 
         # If survey is not draft, schedule the distributions
         if not survey.is_draft:
-            self._schedule_distributions(
-                distributions, data["subject"], data["message"], survey_id
-            )
+            self._schedule_distributions(distributions, survey_id)
 
         return distributions
 
-    def _schedule_distributions(
-        self, distributions, subject: str, message: str, survey_id: str
-    ):
+    def _schedule_distributions(self, distributions, survey_id: str):
+        """
+        Schedules one campaign job per scheduled time of the email distributions.
+        Jobs only hold the survey id and the scheduled time, the emails are
+        rendered when the job runs.
         """
-        Schedules distributions for sending emails
-        """
-        for distribution in distributions:
-            if distribution.method.value == DistributionMethod.EMAIL.value:
-                # Send emails in background for each recipient
-                self.distribute_survey(
-                    recipient_email=distribution.recipient_email,
-                    subject=subject,
-                    message=message,
-                    survey_id=survey_id,
-                    scheduled_at=distribution.scheduled_at,
-                    distribution_id=distribution.id,
+        schedules = {
+            distribution.scheduled_at
+            for distribution in distributions
+            if distribution.method.value == DistributionMethod.EMAIL.value
+        }
+        return self._schedule_campaigns(survey_id, schedules)
+
+    def _schedule_campaigns(self, survey_id: str, schedules) -> List[str]:
+        job_ids = []
+        for scheduled_at in schedules:
+            scheduled_at_iso = scheduled_at.isoformat() if scheduled_at else None
+            # Scheduling the same campaign again replaces its job, which picks up
+            # every pending distribution of that time anyway
+            job_ids.append(
+                self.scheduler_service.add_job(
+                    func=send_campaign_job,
+                    trigger="date",
+                    run_date=scheduled_at,
+                    args=[str(survey_id), scheduled_at_iso],
+                    job_id=f"campaign:{survey_id}:{scheduled_at_iso or 'now'}",
                 )
+            )
+        return job_ids
 
     def schedule_existing_distributions_for_survey(self, survey_id: str):
         """
@@ -120,108 +150,216 @@ class DistributionService:
         if survey.is_draft:
             raise ValueError("Cannot schedule distributions for a draft survey")
 
-        distributions = self.distribution_repository.get_distributions_by_survey(
-            survey_id
-        )
-        unsent_distributions = [
-            d for d in distributions if d.status == DistributionStatus.PENDING
-        ]
-
-        for distribution in unsent_distributions:
-
-            if distribution.method.value == DistributionMethod.EMAIL.value:
-                subject = distribution.subject
-                message = distribution.message
-
-                self.distribute_survey(
-                    recipient_email=distribution.recipient_email,
-                    subject=subject,
-                    message=message,
-                    survey_id=survey_id,
-                    scheduled_at=distribution.scheduled_at,
-                    distribution_id=distribution.id,
-                )
-
-    def distribute_survey(
-        self,
-        recipient_email: str,
-        subject: str,
-        message: str,
-        survey_id: str,
-        distribution_id: str,
-        scheduled_at: Optional[datetime] = None,
-    ) -> str:
-        """
-        Distribute a survey email in background.
+        schedules = self.distribution_repository.get_pending_email_schedules(survey_id)
 
-        Args:
-            recipient_email: Recipient email address
-            subject: Email subject
-            message: Email message content
-            survey_id: Id of the survey
+        return self._schedule_campaigns(survey_id, schedules)
 
-        Returns:
-            str: Job ID for the scheduled email
+    def _build_survey_email(self, survey, distribution) -> dict:
+        """
+        Renders the survey email of a distribution for _send_pending_survey_emails
         """
-        survey = self.survey_repository.get_by_id(str(survey_id))
-
         if survey.type == SurveyType.EXTERNAL and survey.external_url:
             survey_url = survey.external_url
         else:
 
             base_url = AppConfig.CLIENT_URL
-            survey_url = f"{base_url}/surveys/{survey_id}/take?distribution_id={distribution_id}&clicked_at={int(time.time() * 1000)}"
+            survey_url = f"{base_url}/surveys/{survey.id}/take?distribution_id={distribution.id}&clicked_at={int(time.time() * 1000)}"
 
-        html_body = render_template(
-            "survey_email.html", message=message, survey_url=survey_url
+        plain_body, html_body = self.email_render_service.render_survey_email(
+            survey.id, distribution.message, survey_url
         )
-        plain_body = f"{message}\n\nSurvey Link: {survey_url}"
 
-        return self.scheduler_service.add_job(
-            func=self.send_survey_email,
-            trigger="date",
-            run_date=scheduled_at,
-            args=[recipient_email, subject, plain_body, html_body, distribution_id],
-        )
+        return {
+            "distribution_id": str(distribution.id),
+            "recipient_email": distribution.recipient_email,
+            "subject": distribution.subject,
+            "plain_body": plain_body,
+            "html_body": html_body,
+        }
 
-    def send_survey_email(
-        self,
-        recipient_email: str,
-        subject: str,
-        plain_body: str,
-        html_body: str,
-        distribution_id: str,
-    ):
+    def send_campaign(self, survey_id: str, scheduled_at: Optional[str] = None) -> dict:
+        """
+        Sends the pending email distributions of a survey scheduled at the same
+        time, in batches of MAIL_BATCH_SIZE rendered at send time.
+
+        Args:
+            survey_id: ID of the survey
+            scheduled_at: ISO scheduled time of the campaign, None for unscheduled
+
+        Returns:
+            dict: Sent and failed counts with the campaign throughput
+        """
         from server import app
 
+        started = time.perf_counter()
+        totals = Counter()
         with app.app_context():
-            # In case of scheduled, distribution might be deleted at this point. So make sure to check first.
-            distribution = self.distribution_repository.get_by_id(
-                (str(distribution_id))
-            )
-            if not distribution:
+            survey = self.survey_repository.get_by_id(survey_id)
+            if not survey:
                 logger.fatal(
-                    f"Distribution of id='{distribution_id}' is missing. Halting sending scheduled email."
+                    f"Survey of id='{survey_id}' is missing. Halting sending campaign."
                 )
-                return
+                return {"sent": 0, "failed": 0}
 
-            self.mail_service.send_email(
-                to_emails=[recipient_email],
-                subject=subject,
-                body=plain_body,
-                html_body=html_body,
+            scheduled_at = (
+                datetime.fromisoformat(scheduled_at) if scheduled_at else None
             )
-            distribution.sent = True
-            distribution.status = DistributionStatus.SENT.name
-            distribution.sent_at = datetime.utcnow()
+            batch_size = max(MailConfig.MAIL_BATCH_SIZE, 1)
+            seen = set()
+            while True:
+                distributions = (
+                    self.distribution_repository.claim_pending_email_distributions(
+                        survey_id, scheduled_at, batch_size
+                    )
+                )
+                # Rows that couldn't be transitioned would be claimed forever
+                distributions = [d for d in distributions if d.id not in seen]
+                if not distributions:
+                    break
+                seen.update(d.id for d in distributions)
+
+                outcomes = self._send_pending_survey_emails(
+                    [
+                        self._build_survey_email(survey, distribution)
+                        for distribution in distributions
+                    ]
+                )
+                for status, distribution_ids in outcomes.items():
+                    totals[status] += len(distribution_ids)
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "sent": totals[DistributionStatus.SENT],
+            "failed": totals[DistributionStatus.FAILED],
+            "elapsed_seconds": round(elapsed, 3),
+            "emails_per_second": round(len(seen) / elapsed, 1) if elapsed else 0.0,
+        }
+        logger.info(
+            f"Sent campaign of survey '{survey_id}' scheduled at {scheduled_at}: "
+            f"{summary['sent']} sent, {summary['failed']} failed in {summary['elapsed_seconds']}s "
+            f"({summary['emails_per_second']} emails/s)"
+        )
+        return summary
+
+    def _send_pending_survey_emails(self, emails: List[dict]) -> dict:
+        """
+        Sends survey emails of pending distributions over one SMTP connection and
+        bulk-transitions the distributions to SENT or FAILED
+
+        Returns:
+            dict: The distribution ids per new status
+        """
+        errors = self.mail_service.send_bulk(
+            [
+                {
+                    "to_emails": [email["recipient_email"]],
+                    "subject": email["subject"],
+                    "body": email["plain_body"],
+                    "html_body": email["html_body"],
+                }
+                for email in emails
+            ]
+        )
+
+        outcomes = {DistributionStatus.SENT: [], DistributionStatus.FAILED: []}
+        for email, error in zip(emails, errors):
+            status = DistributionStatus.FAILED if error else DistributionStatus.SENT
+            outcomes[status].append(email["distribution_id"])
+
+        # A single commit, the rows claimed by a campaign stay locked until every
+        # outcome is recorded, so no concurrent sender can claim them again
+        now = datetime.utcnow()
+        try:
+            for status, distribution_ids in outcomes.items():
+                result = self.distribution_repository.bulk_transition(
+                    distribution_ids,
+                    DistributionStatus.PENDING,
+                    status,
+                    {"sent_at": now} if status == DistributionStatus.SENT else None,
+                    commit=False,
+                )
+                self._record_transitions(result, status)
             db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return outcomes
+
+    def _record_transitions(self, result: dict, to_status: DistributionStatus):
+        """
+        Records the transitioned distributions of a bulk_transition in the rollup
+        """
+        transitions = Counter(result["transitioned"].values())
+        for (survey_id, previous_status), count in transitions.items():
+            self.survey_stats_repository.record_distribution_status_change(
+                survey_id, previous_status, to_status, count
+            )
 
-    def increment_distribution_click(self, distribution_id: str):
-        distribution = self.distribution_repository.get_by_id(distribution_id)
-        if not distribution:
+    def increment_distribution_click(self, distribution_id: str) -> Optional[str]:
+        """
+        Counts a click on a distribution link.
+        With CLICK_BUFFER_FLUSH_MS set the click is buffered in process and None is
+        returned, otherwise it is applied right away and the new count is returned.
+        """
+        if self.click_buffer:
+            self.click_buffer.add(distribution_id)
+            return None
+
+        clicks = self._apply_clicks({distribution_id: 1})
+        if not clicks:
             raise NotFound("Distribution not found")
+        _, _, clicked_count = next(iter(clicks.values()))
+        return str(clicked_count)
 
-        new_count = (distribution.clicked_count or 0) + 1
-        distribution.clicked_count = new_count
-        db.session.commit()
-        return str(new_count)
+    def flush_distribution_clicks(self, deltas: dict):
+        """
+        Applies the aggregated click deltas of the click buffer
+        """
+        from server import app
+
+        with app.app_context():
+            # Raising here makes the buffer retry, nothing of the flush is committed
+            clicks = self._apply_clicks(deltas)
+            missing = len(deltas) - len(clicks)
+            if missing:
+                logger.warning(f"Dropped clicks of {missing} missing distributions")
+
+    def _apply_clicks(self, deltas: dict) -> dict:
+        """
+        Atomically adds click deltas to distributions and records them in the
+        rollup, in a single transaction
+        """
+        try:
+            clicks = self.distribution_repository.add_clicks(deltas, commit=False)
+            self._record_clicks(clicks, deltas)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return clicks
+
+    def _record_clicks(self, clicks: dict, deltas: dict):
+        surveys = Counter()
+        transitions = Counter()
+        for id, (survey_id, previous_status, _) in clicks.items():
+            surveys[survey_id] += deltas.get(id, deltas.get(str(id), 0))
+            if previous_status in CLICKABLE_STATUSES:
+                transitions[(survey_id, previous_status)] += 1
+        for survey_id, count in surveys.items():
+            self.survey_stats_repository.record_clicks(survey_id, count)
+        for (survey_id, previous_status), count in transitions.items():
+            self.survey_stats_repository.record_distribution_status_change(
+                survey_id, previous_status, DistributionStatus.CLICKED, count
+            )
+
+
+def send_campaign_job(survey_id: str, scheduled_at: Optional[str] = None):
+    """
+    Scheduler entry point of campaign jobs.
+    The jobstore keeps a reference to this function instead of a pickled service,
+    the service is resolved from the app injector when the job runs.
+    """
+    from server import app
+
+    distribution_service = app.extensions["injector"].get(DistributionService)
+    return distribution_service.send_campaign(survey_id, scheduled_at)
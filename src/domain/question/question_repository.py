@@ -1,7 +1,10 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.shared.base_repository import BaseRepository
 from src.database.models.question_model import Question
+from src.domain.survey.survey_repository import SurveyVersion, forget_versions
 from src.database.db import db
+from src.shared.cache import snapshot, rehydrate_all
+from app import cache
 import uuid
 
 
@@ -15,11 +18,65 @@ class QuestionRepository(BaseRepository[Question]):
         self, survey_id: str, ordered: bool = True
     ) -> List[Question]:
         """Get all questions for a survey"""
-        query = self.model.query.filter_by(survey_id=uuid.UUID(survey_id))
+        query = self.model.query.filter_by(survey_id=uuid.UUID(str(survey_id)))
         if ordered:
             query = query.order_by(self.model.order.asc())
         return query.all()
 
+    def get_cached_by_survey(
+        self, survey_id: str, version: SurveyVersion
+    ) -> List[Question]:
+        """
+        Get detached copies of the ordered questions of a survey, read through the
+        cache under the survey `version`. Like SurveyRepository.get_cached, only
+        use it for reads.
+        """
+        values = cache.get_or_set(
+            self._cache_key(survey_id, version),
+            lambda: [
+                snapshot(question)
+                for question in self.get_questions_by_survey(survey_id, ordered=True)
+            ],
+        )
+        return rehydrate_all(self.model, values)
+
+    def create(self, **kwargs) -> Question:
+        question = super().create(**kwargs)
+        self.invalidate(question.survey_id)
+        return question
+
+    def bulk_create(self, list: List[dict]) -> List[Question]:
+        questions = super().bulk_create(list)
+        self.invalidate(*{question.survey_id for question in questions})
+        return questions
+
+    def update(self, id: str, **kwargs) -> Optional[Question]:
+        question = super().update(id, **kwargs)
+        if question:
+            self.invalidate(question.survey_id)
+        return question
+
+    def delete(self, id: str) -> bool:
+        question = self.get_by_id(id)
+        deleted = super().delete(id)
+        if question:
+            self.invalidate(question.survey_id)
+        return deleted
+
+    def invalidate(self, *survey_ids):
+        """
+        Forget the survey versions read in this request, so the next cached read
+        uses the new version. Entries of older versions are left to expire.
+        """
+        forget_versions()
+
+    @staticmethod
+    def _cache_key(survey_id, version: SurveyVersion) -> str:
+        return (
+            f"questions:{uuid.UUID(str(survey_id))}:"
+            f"{version.question_count}:{version.questions_updated_at}"
+        )
+
     def get_required_questions(self, survey_id: str) -> List[Question]:
         """Get all required questions for a survey"""
         return (
@@ -38,6 +95,7 @@ class QuestionRepository(BaseRepository[Question]):
                 if question and question.survey_id == uuid.UUID(survey_id):
                     question.order = order
             db.session.commit()
+            self.invalidate(survey_id)
             return True
         except Exception:
             db.session.rollback()
@@ -48,11 +48,9 @@ class QuestionService:
         Gets all questions for a given survey
         :param survey_id: ID of the survey
         """
-        survey_exists = self.survey_repository.exists(id=survey_id)
-        if not survey_exists:
+        version = self.survey_repository.get_version(survey_id)
+        if not version:
             raise NotFound("Survey not found")
 
-        questions = self.question_repository.get_questions_by_survey(
-            survey_id, ordered=True
-        )
+        questions = self.question_repository.get_cached_by_survey(survey_id, version)
         return questions
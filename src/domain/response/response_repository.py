@@ -1,9 +1,17 @@
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import csv
+import io
+import json
+from typing import List, Optional, Dict, Any, Iterator
+from datetime import datetime
+from sqlalchemy import func, Row
+from psycopg2.extras import execute_values
 from src.shared.base_repository import BaseRepository
 from src.database.models.response_model import Response
-from src.database.models.response_model import ResponseSource
+from src.database.models.answer_model import Answer
+from src.database.models.question_model import Question
+from src.database.models.distribution_model import Distribution
 from src.database.db import db
+from src.database.routing import read_only
 import uuid
 
 
@@ -13,24 +21,16 @@ class ResponseRepository(BaseRepository[Response]):
     def __init__(self):
         super().__init__(Response)
 
+    @read_only
     def get_responses_by_survey(
-        self, survey_id: str, page: int = 1, per_page: int = 20
+        self, survey_id: str, page: int = 1, per_page: int = 20, **cursor_options
     ) -> Dict[str, Any]:
         """Get all responses for a survey (paginated)"""
         query = self.model.query.filter_by(survey_id=uuid.UUID(survey_id))
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        return {
-            "items": pagination.items,
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": page,
-            "per_page": per_page,
-            "has_next": pagination.has_next,
-            "has_prev": pagination.has_prev,
-        }
+        return self.paginate(query, page, per_page, **cursor_options)
 
     def get_completed_responses(
-        self, survey_id: str, page: int = 1, per_page: int = 20
+        self, survey_id: str, page: int = 1, per_page: int = 20, **cursor_options
     ) -> Dict[str, Any]:
         """Get completed responses for a survey (paginated)"""
         query = self.model.query.filter(
@@ -39,110 +39,239 @@ class ResponseRepository(BaseRepository[Response]):
                 self.model.created_at.isnot(None),
             )
         )
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        return {
-            "items": pagination.items,
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": page,
-            "per_page": per_page,
-            "has_next": pagination.has_next,
-            "has_prev": pagination.has_prev,
-        }
+        return self.paginate(query, page, per_page, **cursor_options)
 
     def get_responses_by_source(
-        self, survey_id: str, source: str, page: int = 1, per_page: int = 20
+        self,
+        survey_id: str,
+        source: str,
+        page: int = 1,
+        per_page: int = 20,
+        **cursor_options,
     ) -> Dict[str, Any]:
         """Get responses by source (internal/external)"""
         query = self.model.query.filter_by(
             survey_id=uuid.UUID(survey_id), source=source
         )
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        return {
-            "items": pagination.items,
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": page,
-            "per_page": per_page,
-            "has_next": pagination.has_next,
-            "has_prev": pagination.has_prev,
-        }
+        return self.paginate(query, page, per_page, **cursor_options)
 
     def get_responses_by_platform(
-        self, survey_id: str, platform: str, page: int = 1, per_page: int = 20
+        self,
+        survey_id: str,
+        platform: str,
+        page: int = 1,
+        per_page: int = 20,
+        **cursor_options,
     ) -> Dict[str, Any]:
         """Get responses by external platform"""
         query = self.model.query.filter_by(
             survey_id=uuid.UUID(survey_id), external_platform=platform
         )
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        return {
-            "items": pagination.items,
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": page,
-            "per_page": per_page,
-            "has_next": pagination.has_next,
-            "has_prev": pagination.has_prev,
-        }
+        return self.paginate(query, page, per_page, **cursor_options)
+
+    @read_only
+    def attach_answer_counts(self, responses: List[Response]) -> List[Response]:
+        """
+        Preload the answer counts of many responses in one grouped query,
+        so serializing them doesn't run a COUNT query per response
+        """
+        if not responses:
+            return responses
+
+        rows = (
+            db.session.query(Answer.response_id, func.count(Answer.id))
+            .filter(Answer.response_id.in_([response.id for response in responses]))
+            .group_by(Answer.response_id)
+            .all()
+        )
+        counts = dict(rows)
+        for response in responses:
+            response._answer_count = counts.get(response.id, 0)
+        return responses
 
     def get_response_with_answers(self, response_id: str) -> Optional[Response]:
         """Get response with all its answers"""
         return self.model.query.filter_by(id=uuid.UUID(response_id)).first()
 
-    def get_response_stats(self, survey_id: str) -> Dict[str, Any]:
-        """Get response statistics for a survey"""
-        total_responses = self.count(survey_id=uuid.UUID(survey_id))
-        completed_responses = self.model.query.filter(
-            db.and_(
-                self.model.survey_id == uuid.UUID(survey_id),
-                self.model.created_at.isnot(None),
+    @read_only
+    def get_responses_with_answers(self, response_ids: List) -> List[Row]:
+        """
+        Get responses with their distribution, answers and the text of the answered
+        questions in one joined query, one row per answer ordered by response.
+        Responses without answers yield a single row with empty answer columns.
+        """
+        ids = []
+        for id in response_ids:
+            try:
+                ids.append(uuid.UUID(str(id)))
+            except ValueError:
+                continue
+        if not ids:
+            return []
+
+        return (
+            db.session.query(
+                self.model.id,
+                self.model.respondent_name,
+                self.model.respondent_email,
+                self.model.created_at,
+                self.model.distribution_id,
+                Distribution.method.label("distribution_method"),
+                Distribution.recipient_email.label("distribution_recipient_email"),
+                Distribution.status.label("distribution_status"),
+                Distribution.scheduled_at.label("distribution_scheduled_at"),
+                Distribution.sent_at.label("distribution_sent_at"),
+                Answer.id.label("answer_id"),
+                Answer.question_id,
+                Answer.value,
+                Answer.values,
+                Answer.rating,
+                Answer.date_value,
+                Answer.created_at.label("answer_created_at"),
+                Question.text.label("question_text"),
             )
-        ).count()
-        internal_responses = self.count(
-            survey_id=uuid.UUID(survey_id), source=ResponseSource.INTERNAL
+            .outerjoin(Distribution, Distribution.id == self.model.distribution_id)
+            .outerjoin(Answer, Answer.response_id == self.model.id)
+            .outerjoin(Question, Question.id == Answer.question_id)
+            .filter(self.model.id.in_(ids))
+            .order_by(self.model.id, Answer.created_at, Answer.id)
+            .all()
         )
-        external_responses = self.count(
-            survey_id=uuid.UUID(survey_id), source=ResponseSource.EXTERNAL
+
+    @read_only
+    def get_response_counts_by_bucket(
+        self,
+        survey_id: str,
+        start: datetime,
+        end: datetime,
+        granularity: str = "day",
+        timezone: str = "UTC",
+    ) -> Dict[datetime, int]:
+        """
+        Get response counts grouped into hour/day/week buckets of the given
+        timezone, for responses created in the naive UTC range [start, end)
+        """
+        local_created_at = func.timezone(
+            timezone, func.timezone("UTC", self.model.created_at)
         )
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_responses = self.model.query.filter(
-            db.and_(
+        bucket = func.date_trunc(granularity, local_created_at)
+        rows = (
+            db.session.query(bucket, func.count(self.model.id))
+            .filter(
                 self.model.survey_id == uuid.UUID(survey_id),
-                self.model.created_at >= week_ago,
+                self.model.created_at >= start,
+                self.model.created_at < end,
             )
-        ).count()
-        return {
-            "survey_id": survey_id,
-            "total_responses": total_responses,
-            "completed_responses": completed_responses,
-            "completion_rate": (
-                (completed_responses / total_responses * 100)
-                if total_responses > 0
-                else 0
-            ),
-            "internal_responses": internal_responses,
-            "external_responses": external_responses,
-            "recent_responses": recent_responses,
-        }
-
-    def get_daily_response_counts(
-        self, survey_id: str, days: int = 30
-    ) -> List[Dict[str, Any]]:
-        """Get daily response counts for the last N days"""
-        start_date = datetime.utcnow() - timedelta(days=days)
-        responses = self.model.query.filter(
-            db.and_(
-                self.model.survey_id == uuid.UUID(survey_id),
-                self.model.created_at >= start_date,
+            .group_by(bucket)
+            .all()
+        )
+        return {bucket_start: count for bucket_start, count in rows}
+
+    def iter_responses_with_answers(
+        self, survey_id: str, batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        Stream every response of a survey joined with its answers, ordered by
+        response, through a server-side cursor fetching `batch_size` rows at a time.
+        Responses without answers yield a single row with empty answer columns.
+        """
+        return iter(
+            db.session.query(
+                self.model.id,
+                self.model.respondent_name,
+                self.model.respondent_email,
+                self.model.source,
+                self.model.external_response_id,
+                self.model.distribution_id,
+                self.model.created_at,
+                Answer.question_id,
+                Answer.value,
+                Answer.values,
+                Answer.rating,
+                Answer.date_value,
             )
-        ).all()
-        daily_counts = {}
-        for response in responses:
-            date_str = response.created_at.strftime("%Y-%m-%d")
-            daily_counts[date_str] = daily_counts.get(date_str, 0) + 1
-        result = []
-        for i in range(days):
-            date = (datetime.utcnow() - timedelta(days=i)).strftime("%Y-%m-%d")
-            result.append({"date": date, "count": daily_counts.get(date, 0)})
-        return result[::-1]  # Chronological order
+            .outerjoin(Answer, Answer.response_id == self.model.id)
+            .filter(self.model.survey_id == uuid.UUID(survey_id))
+            .order_by(self.model.created_at, self.model.id)
+            .yield_per(batch_size)
+        )
+
+    def bulk_import(
+        self, responses: List[dict], answers: List[dict], commit: bool = True
+    ) -> List[dict]:
+        """
+        Insert many responses with a single execute_values, skipping those whose
+        external_response_id already exists in their survey, then COPY the answers
+        of the inserted responses. Returns the inserted responses.
+        """
+        if not responses:
+            return []
+
+        with db.session.connection().connection.cursor() as cursor:
+            inserted_ids = {
+                str(row[0])
+                for row in execute_values(
+                    cursor,
+                    """
+                    INSERT INTO response (
+                        id, survey_id, source, external_response_id,
+                        respondent_name, respondent_email, created_at, updated_at
+                    ) VALUES %s
+                    ON CONFLICT (survey_id, external_response_id)
+                        WHERE external_response_id IS NOT NULL
+                    DO NOTHING
+                    RETURNING id
+                    """,
+                    [
+                        (
+                            str(response["id"]),
+                            str(response["survey_id"]),
+                            response["source"].name,
+                            response["external_response_id"],
+                            response["respondent_name"],
+                            response["respondent_email"],
+                            response["created_at"],
+                            response["created_at"],
+                        )
+                        for response in responses
+                    ],
+                    template="(%s::uuid, %s::uuid, %s::response_source, %s, %s, %s, %s, %s)",
+                    page_size=len(responses),
+                    fetch=True,
+                )
+            }
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            now = datetime.utcnow()
+            for answer in answers:
+                if str(answer["response_id"]) in inserted_ids:
+                    writer.writerow(
+                        [
+                            answer["id"],
+                            answer["response_id"],
+                            answer["question_id"],
+                            answer.get("value"),
+                            (
+                                json.dumps(answer["values"])
+                                if answer.get("values") is not None
+                                else None
+                            ),
+                            answer.get("rating"),
+                            answer.get("date_value"),
+                            now,
+                            now,
+                        ]
+                    )
+            buffer.seek(0)
+            cursor.copy_expert(
+                'COPY answer (id, response_id, question_id, value, "values", rating, '
+                "date_value, created_at, updated_at) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        if commit:
+            db.session.commit()
+
+        return [
+            response for response in responses if str(response["id"]) in inserted_ids
+        ]
@@ -1,17 +1,61 @@
+import csv
+import io
+import json
+import logging
+import re
+import time
+import uuid
+from itertools import groupby
+from typing import Optional
 from injector import inject
 from werkzeug.exceptions import NotFound
 from uuid import uuid4
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
 
 from .response_repository import ResponseRepository
 from ..question.question_repository import QuestionRepository
 from ..survey.survey_repository import SurveyRepository
-from src.database.models.response_model import ResponseSource, Response
+from ..answer.answer_repository import AnswerRepository, ANSWER_COLUMNS
+from ..survey_stats.survey_stats_repository import SurveyStatsRepository
+from src.database.models.response_model import Response, ResponseSource
 from src.database.models.answer_model import Answer
 from src.database.db import db
+from src.database.routing import use_primary
 from werkzeug.exceptions import BadRequest
+from marshmallow import ValidationError
+from src.schema.response_schema import AnswerSchema
 from src.database.models.distribution_model import DistributionStatus
 from src.domain.distribution.distribution_repository import DistributionRepository
+from src.shared.time_buckets import (
+    get_zone,
+    truncate,
+    bucket_starts,
+    bucket_label,
+    to_utc_naive,
+    to_local_naive,
+)
+
+MAX_RESPONSE_COUNT_BUCKETS = 2000
+
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 100
+IMPORT_INTEGER = re.compile(r"\d{1,2}")
+IMPORT_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+IMPORT_TEXT_COLUMNS = ["external_response_id", "respondent_name", "respondent_email"]
+IMPORT_ANSWER_SCHEMA = AnswerSchema(exclude=["question_id"])
+
+EXPORT_COLUMNS = [
+    "response_id",
+    "respondent_name",
+    "respondent_email",
+    "source",
+    "external_response_id",
+    "distribution_id",
+    "created_at",
+]
+
+logger = logging.getLogger(__name__)
 
 
 class ResponseService:
@@ -22,11 +66,15 @@ class ResponseService:
         question_repository: QuestionRepository,
         survey_repository: SurveyRepository,
         distribution_repository: DistributionRepository,
+        answer_repository: AnswerRepository,
+        survey_stats_repository: SurveyStatsRepository,
     ):
         self.response_repository = response_repository
         self.question_repository = question_repository
         self.survey_repository = survey_repository
         self.distribution_repository = distribution_repository
+        self.answer_repository = answer_repository
+        self.survey_stats_repository = survey_stats_repository
 
     def create_response(
         self,
@@ -58,14 +106,32 @@ class ResponseService:
             else:
                 raise BadRequest("Name is required")
 
-        response = self.response_repository.create(**response_data)
+        # The response, its distribution and the rollup are committed together
+        response = self.response_repository.create(commit=False, **response_data)
+        self.survey_stats_repository.record_responses(
+            survey_id, ResponseSource.INTERNAL, [response.created_at]
+        )
 
         if "distribution_id" in response_data:
-            self.distribution_repository.update(
-                str(respondent_data["distribution_id"]),
-                status=DistributionStatus.OPENED,
+            # Responding opens the distribution, unless it is already opened
+            result = self.distribution_repository.bulk_transition(
+                [response_data["distribution_id"]],
+                [
+                    DistributionStatus.PENDING,
+                    DistributionStatus.SENT,
+                    DistributionStatus.FAILED,
+                    DistributionStatus.CLICKED,
+                ],
+                DistributionStatus.OPENED,
+                {"opened_at": datetime.utcnow()},
+                commit=False,
             )
+            for survey_id, previous_status in result["transitioned"].values():
+                self.survey_stats_repository.record_distribution_status_change(
+                    survey_id, previous_status, DistributionStatus.OPENED
+                )
 
+        db.session.commit()
         return response
 
     def submit_answers(self, response_id: str, answers_data: list):
@@ -76,136 +142,561 @@ class ResponseService:
         if not response:
             raise NotFound("Response not found")
 
-        answers = []
-        for answer_data in answers_data:
-            answer = Answer(
-                id=uuid4(),
-                response_id=response_id,
-                question_id=answer_data["question_id"],
-                value=answer_data.get("value"),
-                values=answer_data.get("values"),
-                rating=answer_data.get("rating"),
-                date_value=answer_data.get("date_value"),
-            )
-            answers.append(answer)
+        answers = [
+            {
+                "id": uuid4(),
+                "response_id": response.id,
+                "question_id": answer_data["question_id"],
+                "value": answer_data.get("value"),
+                "values": answer_data.get("values"),
+                "rating": answer_data.get("rating"),
+                "date_value": answer_data.get("date_value"),
+            }
+            for answer_data in answers_data
+        ]
 
-        db.session.add_all(answers)
+        # A single multi-row INSERT instead of one per answer
+        if answers:
+            db.session.execute(insert(Answer), answers)
+        self.survey_stats_repository.record_answers(response.survey_id, len(answers))
         db.session.commit()
 
         return response
 
+    def bulk_import_responses(
+        self,
+        survey_id: str,
+        stream,
+        format: str = "ndjson",
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> dict:
+        """
+        Imports responses with their answers from an NDJSON or CSV stream, in the
+        same layout as the export. Every row is validated before anything is
+        written, then the responses are written in batches with execute_values and
+        COPY in a single transaction. Those whose external_response_id already
+        exists in the survey are skipped.
+
+        Returns:
+            dict: Counts of the imported, duplicate and invalid rows with throughput
+        """
+        survey = self.survey_repository.get_by_id(survey_id)
+        if not survey:
+            raise NotFound("Survey not found")
+
+        questions = self.question_repository.get_questions_by_survey(survey_id)
+        question_ids = {question.id for question in questions}
+        lines = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        started = time.perf_counter()
+        if format == "csv":
+            records = list(self._read_import_csv(lines, questions))
+        else:
+            records = list(self._read_import_ndjson(lines))
+        answer_columns = self._get_import_answer_columns(
+            survey_id, records, question_ids
+        )
+
+        report = {
+            "received": len(records),
+            "imported": 0,
+            "duplicates": 0,
+            "invalid": 0,
+            "answers": 0,
+            "errors": [],
+        }
+        responses, answers, external_ids = [], {}, set()
+        for line, record in records:
+            try:
+                response, response_answers = self._build_import_rows(
+                    survey.id, record, answer_columns
+                )
+            except (ValueError, TypeError, KeyError) as e:
+                report["invalid"] += 1
+                if len(report["errors"]) < MAX_IMPORT_ERRORS:
+                    report["errors"].append({"line": line, "error": str(e)})
+                continue
+
+            if response["external_response_id"] in external_ids:
+                report["duplicates"] += 1
+                continue
+            external_ids.add(response["external_response_id"])
+            responses.append(response)
+            answers[response["id"]] = response_answers
+
+        try:
+            for start in range(0, len(responses), batch_size):
+                batch = responses[start : start + batch_size]
+                imported = self.response_repository.bulk_import(
+                    batch,
+                    [
+                        answer
+                        for response in batch
+                        for answer in answers[response["id"]]
+                    ],
+                    commit=False,
+                )
+                answer_count = sum(
+                    len(answers[response["id"]]) for response in imported
+                )
+                self.survey_stats_repository.record_responses(
+                    survey_id,
+                    ResponseSource.EXTERNAL,
+                    [response["created_at"] for response in imported],
+                    answer_count,
+                )
+                report["imported"] += len(imported)
+                report["duplicates"] += len(batch) - len(imported)
+                report["answers"] += answer_count
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = (
+            round(report["received"] / elapsed, 1) if elapsed else 0.0
+        )
+        report["answers_per_second"] = (
+            round(report["answers"] / elapsed, 1) if elapsed else 0.0
+        )
+        logger.info(
+            f"Imported {report['imported']} responses with {report['answers']} answers "
+            f"into survey '{survey_id}' in {report['elapsed_seconds']}s "
+            f"({report['rows_per_second']} rows/s, {report['duplicates']} duplicates, "
+            f"{report['invalid']} invalid)"
+        )
+        return report
+
+    def _read_import_ndjson(self, lines):
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                record = e
+            yield line_number, record
+
+    def _read_import_csv(self, lines, questions):
+        """
+        Reads CSV rows into import records. Question columns may be headed by the
+        question id or, as in the export, by the question text. Cells are kept as
+        text until the kind of their question is known.
+        """
+        reader = csv.reader(lines)
+        header = next(reader, None) or []
+        questions_by_header = {}
+        for question in questions:
+            questions_by_header[question.text] = question.id
+            questions_by_header[str(question.id)] = question.id
+
+        columns = []
+        for column in header:
+            if column in EXPORT_COLUMNS:
+                columns.append(column)
+            elif column in questions_by_header:
+                columns.append(questions_by_header[column])
+            else:
+                raise BadRequest(f"Unknown column '{column}'")
+
+        # Line 1 is the header
+        for line_number, row in enumerate(reader, start=2):
+            if not any(row):
+                continue
+            record = {"answers": {}}
+            for column, cell in zip(columns, row):
+                if isinstance(column, str):
+                    record[column] = cell or None
+                elif cell != "":
+                    record["answers"][str(column)] = cell
+            yield line_number, record
+
+    def _get_import_answer_columns(self, survey_id: str, records, question_ids: set):
+        """
+        Gets the answer column of every question of the survey. Questions have no
+        type, so it is the column of their existing answers or, for unanswered
+        questions, the one every imported value of the question fits.
+        """
+        values = {question_id: [] for question_id in question_ids}
+        for _, record in records:
+            if not isinstance(record, dict) or not isinstance(
+                record.get("answers"), dict
+            ):
+                continue
+            for question_id, value in record["answers"].items():
+                try:
+                    question_id = uuid.UUID(str(question_id))
+                except ValueError:
+                    continue
+                if question_id in values and value not in (None, "", []):
+                    values[question_id].append(value)
+
+        columns = self.answer_repository.get_answer_columns(survey_id)
+        for question_id, question_values in values.items():
+            if question_id not in columns:
+                columns[question_id] = self._infer_import_answer_column(question_values)
+        return columns
+
+    def _infer_import_answer_column(self, values: list) -> str:
+        """
+        Gets the answer column fitting every imported value of an unanswered
+        question: lists, ratings from 1 to 10, YYYY-MM-DD dates, or text
+        """
+        values = [value for value in values if not isinstance(value, dict)]
+        if not values:
+            return "value"
+        if all(isinstance(value, list) for value in values):
+            return "values"
+        if all(self._parse_import_rating(value) is not None for value in values):
+            return "rating"
+        if all(
+            isinstance(value, str) and IMPORT_DATE.fullmatch(value) for value in values
+        ):
+            return "date_value"
+        return "value"
+
+    def _parse_import_rating(self, value) -> Optional[int]:
+        """The rating of an imported value, None if it isn't one"""
+        if isinstance(value, str) and IMPORT_INTEGER.fullmatch(value):
+            value = int(value)
+        if isinstance(value, int) and not isinstance(value, bool):
+            if 1 <= value <= 10:
+                return value
+        return None
+
+    def _build_import_rows(self, survey_id, record, answer_columns: dict):
+        """
+        Builds the response and answer rows of an import record, raising ValueError
+        when the record is invalid
+        """
+        if isinstance(record, Exception):
+            raise ValueError(f"Invalid JSON: {record}")
+        if not isinstance(record, dict):
+            raise ValueError("Expected an object")
+
+        external_response_id = record.get("external_response_id")
+        if not external_response_id:
+            raise ValueError("external_response_id is required")
+
+        created_at = record.get("created_at")
+        if created_at:
+            created_at = to_utc_naive(
+                datetime.fromisoformat(str(created_at)), get_zone("UTC")
+            )
+        else:
+            created_at = datetime.utcnow()
+
+        response = {
+            "id": uuid4(),
+            "survey_id": survey_id,
+            "source": ResponseSource.EXTERNAL,
+            "external_response_id": str(external_response_id),
+            "respondent_name": record.get("respondent_name"),
+            "respondent_email": record.get("respondent_email"),
+            "created_at": created_at,
+        }
+        for column in IMPORT_TEXT_COLUMNS:
+            if response[column] is None:
+                continue
+            response[column] = str(response[column])
+            max_length = Response.__table__.c[column].type.length
+            if len(response[column]) > max_length:
+                raise ValueError(f"{column} is longer than {max_length} characters")
+
+        answers = []
+        for question_id, value in (record.get("answers") or {}).items():
+            question_id = uuid.UUID(str(question_id))
+            if question_id not in answer_columns:
+                raise ValueError(f"Unknown question '{question_id}'")
+            answer = self._import_answer_columns(value, answer_columns[question_id])
+            if answer:
+                answers.append(
+                    {
+                        "id": uuid4(),
+                        "response_id": response["id"],
+                        "question_id": question_id,
+                        **answer,
+                    }
+                )
+        return response, answers
+
+    def _import_answer_columns(self, value, column: str) -> dict:
+        """
+        Maps an imported answer value to the answer column of its question,
+        raising ValueError when it doesn't fit. CSV cells of multiple choice
+        questions hold their options joined by "; ", as in the export.
+        """
+        if value is None or value == "" or value == []:
+            return {}
+        if isinstance(value, dict):
+            try:
+                answer = IMPORT_ANSWER_SCHEMA.load(value)
+            except ValidationError as e:
+                raise ValueError(f"Invalid answer: {e.messages}")
+            return {
+                column: (
+                    answer[column].isoformat()
+                    if column == "date_value"
+                    else answer[column]
+                )
+                for column in ANSWER_COLUMNS
+                if answer.get(column) is not None
+            }
+
+        if column == "values":
+            if isinstance(value, str):
+                value = value.split("; ")
+            if not isinstance(value, list) or not all(
+                isinstance(item, (str, int, float)) for item in value
+            ):
+                raise ValueError(f"Expected a list of options, got {value!r}")
+            return {"values": [str(item) for item in value]}
+
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            raise ValueError(f"Expected a single value, got {value!r}")
+        if column == "rating":
+            rating = self._parse_import_rating(value)
+            if rating is None:
+                raise ValueError(f"Rating {value!r} is not between 1 and 10")
+            return {"rating": rating}
+        if column == "date_value":
+            return {"date_value": date.fromisoformat(str(value)).isoformat()}
+        return {"value": str(value)}
+
     def get_responses_by_survey(self, survey_id: str, query: dict):
         """
         Returns paginated responses for a survey.
         """
         result = self.response_repository.get_responses_by_survey(survey_id, **query)
+        self.response_repository.attach_answer_counts(result["items"])
         return result
 
-    def get_response_answers(self, response_id: str):
+    def export_responses(self, survey_id: str, format: str = "csv"):
         """
-        Returns all answers for a specific response
+        Returns a generator streaming every response of a survey with its answers,
+        one row per response and one column per question.
         """
-        response = self.response_repository.get_by_id(response_id)
-        if not response:
-            raise NotFound("Response not found")
-
-        answers = db.session.query(Answer).filter_by(response_id=response_id).all()
+        survey = self.survey_repository.get_by_id(survey_id)
+        if not survey:
+            raise NotFound("Survey not found")
 
-        questions = self.question_repository.get_questions_by_survey(
-            str(response.survey_id)
-        )
-        question_map = {str(question.id): question for question in questions}
+        questions = self.question_repository.get_questions_by_survey(survey_id)
+        rows = self.response_repository.iter_responses_with_answers(survey_id)
+        responses = self._group_export_rows(rows, {q.id for q in questions})
 
-        answer_details = []
-        for answer in answers:
-            question = question_map.get(str(answer.question_id))
-            answer_details.append(
-                {
-                    "id": str(answer.id),
-                    "question_id": str(answer.question_id),
-                    "question_text": question.text if question else "Unknown Question",
-                    "question_type": "unknown",
-                    "value": answer.value,
-                    "values": answer.values,
-                    "rating": answer.rating,
-                    "date_value": (
-                        answer.date_value.isoformat() if answer.date_value else None
-                    ),
-                    "created_at": (
-                        answer.created_at.isoformat() if answer.created_at else None
-                    ),
-                }
-            )
+        if format == "ndjson":
+            return self._export_ndjson(responses)
+        return self._export_csv(questions, responses)
 
-        distribution_data = None
-        if response.distribution:
-            distribution = response.distribution
-            distribution_data = {
-                "id": str(distribution.id),
-                "recipient_method": distribution.method.value,
-                "recipient_email": distribution.recipient_email,
-                "status": distribution.status.value,
-                "scheduled_at": (
-                    distribution.scheduled_at.isoformat()
-                    if distribution.scheduled_at
-                    else None
+    def _group_export_rows(self, rows, question_ids: set):
+        """
+        Folds the response/answer join rows into one dict per response
+        """
+        for _, response_rows in groupby(rows, key=lambda row: row.id):
+            response_rows = list(response_rows)
+            response = response_rows[0]
+            answers = {}
+            for row in response_rows:
+                if row.question_id in question_ids:
+                    answers[row.question_id] = self._export_answer_value(row)
+            yield {
+                "response_id": str(response.id),
+                "respondent_name": response.respondent_name,
+                "respondent_email": response.respondent_email,
+                "source": response.source.value if response.source else None,
+                "external_response_id": response.external_response_id,
+                "distribution_id": (
+                    str(response.distribution_id) if response.distribution_id else None
                 ),
-                "sent_at": (
-                    distribution.sent_at.isoformat() if distribution.sent_at else None
+                "created_at": (
+                    response.created_at.isoformat() if response.created_at else None
                 ),
+                "answers": answers,
+            }
+
+    def _export_answer_value(self, row):
+        if row.values is not None:
+            return row.values
+        if row.rating is not None:
+            return row.rating
+        if row.date_value is not None:
+            return row.date_value.isoformat()
+        return row.value
+
+    def _export_csv(self, questions, responses, chunk_size: int = 500):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS + [question.text for question in questions])
+
+        for index, response in enumerate(responses, start=1):
+            answers = response["answers"]
+            cells = []
+            for question in questions:
+                value = answers.get(question.id)
+                cells.append(
+                    "; ".join(map(str, value)) if isinstance(value, list) else value
+                )
+            writer.writerow([response[column] for column in EXPORT_COLUMNS] + cells)
+
+            if index % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    def _export_ndjson(self, responses, chunk_size: int = 500):
+        lines = []
+        for response in responses:
+            response["answers"] = {
+                str(question_id): value
+                for question_id, value in response["answers"].items()
             }
+            lines.append(json.dumps(response))
+            if len(lines) == chunk_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+
+        if lines:
+            yield "\n".join(lines) + "\n"
 
+    def get_response_answers(self, response_id: str):
+        """
+        Returns all answers for a specific response.
+        Reads from the primary, clients fetch a response right after submitting it.
+        """
+        with use_primary():
+            details = self._get_response_details([response_id])
+        if not details:
+            raise NotFound("Response not found")
+        return details[0]
+
+    def batch_get_response_answers(self, response_ids: list):
+        """
+        Returns the answers of many responses, in the order they were requested,
+        with the ids that don't exist listed as missing
+        """
+        response_ids = list(dict.fromkeys(str(id) for id in response_ids))
+        details = {
+            detail["response_id"]: detail
+            for detail in self._get_response_details(response_ids)
+        }
         return {
-            "response_id": response_id,
-            "respondent_name": response.respondent_name,
-            "respondent_email": response.respondent_email,
-            "created_at": (
-                response.created_at.isoformat() if response.created_at else None
-            ),
-            "distribution_id": response.distribution_id,
-            "distribution": distribution_data,
-            "answers": answer_details,
+            "responses": [details[id] for id in response_ids if id in details],
+            "missing": [id for id in response_ids if id not in details],
         }
 
-    def get_survey_analytics(self, survey_id: str):
+    def _get_response_details(self, response_ids: list) -> list:
         """
-        Returns comprehensive analytics for a survey
+        Builds the answer details of responses from a single joined query over
+        the responses, their distributions, answers and answered questions
         """
-        # Get basic response stats
-        response_stats = self.response_repository.get_response_stats(survey_id)
+        details = []
+        rows = self.response_repository.get_responses_with_answers(response_ids)
+        for _, response_rows in groupby(rows, key=lambda row: row.id):
+            response_rows = list(response_rows)
+            response = response_rows[0]
+
+            answer_details = []
+            for answer in response_rows:
+                if answer.answer_id is None:
+                    continue
+                answer_details.append(
+                    {
+                        "id": str(answer.answer_id),
+                        "question_id": str(answer.question_id),
+                        "question_text": (
+                            answer.question_text
+                            if answer.question_text is not None
+                            else "Unknown Question"
+                        ),
+                        "question_type": "unknown",
+                        "value": answer.value,
+                        "values": answer.values,
+                        "rating": answer.rating,
+                        "date_value": (
+                            answer.date_value.isoformat() if answer.date_value else None
+                        ),
+                        "created_at": (
+                            answer.answer_created_at.isoformat()
+                            if answer.answer_created_at
+                            else None
+                        ),
+                    }
+                )
 
-        # Get distribution stats
-        distribution_repo = DistributionRepository()
-        distributions = distribution_repo.get_distributions_by_survey(survey_id)
+            distribution_data = None
+            if response.distribution_id and response.distribution_method:
+                distribution_data = {
+                    "id": str(response.distribution_id),
+                    "recipient_method": response.distribution_method.value,
+                    "recipient_email": response.distribution_recipient_email,
+                    "status": response.distribution_status.value,
+                    "scheduled_at": (
+                        response.distribution_scheduled_at.isoformat()
+                        if response.distribution_scheduled_at
+                        else None
+                    ),
+                    "sent_at": (
+                        response.distribution_sent_at.isoformat()
+                        if response.distribution_sent_at
+                        else None
+                    ),
+                }
 
-        # Calculate distribution stats
-        total_distributions = len(distributions)
-        sent_distributions = len(
-            [d for d in distributions if (d.status == DistributionStatus.SENT)]
-        )
-        opened_distributions = len(
-            [d for d in distributions if d.status == DistributionStatus.OPENED]
-        )
-        clicked_distributions = sum([d.clicked_count for d in distributions])
-
-        # Get recent activity (last 7 days)
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_responses = (
-            db.session.query(Response)
-            .filter(
-                db.and_(
-                    Response.survey_id == survey_id, Response.created_at >= week_ago
-                )
+            details.append(
+                {
+                    "response_id": str(response.id),
+                    "respondent_name": response.respondent_name,
+                    "respondent_email": response.respondent_email,
+                    "created_at": (
+                        response.created_at.isoformat() if response.created_at else None
+                    ),
+                    "distribution_id": response.distribution_id,
+                    "distribution": distribution_data,
+                    "answers": answer_details,
+                }
             )
-            .count()
+        return details
+
+    def get_survey_analytics(self, survey_id: str):
+        """
+        Returns comprehensive analytics for a survey
+        """
+        # All counters are read from the incrementally maintained rollup
+        stats = self.survey_stats_repository.get_counters(survey_id)
+
+        # Every stored response has a created_at, so all of them count as completed
+        total_responses = stats["total_responses"]
+        completed_responses = total_responses
+        recent_responses = self.survey_stats_repository.get_response_count_since(
+            survey_id, datetime.utcnow() - timedelta(days=7)
         )
+        response_stats = {
+            "survey_id": survey_id,
+            "total_responses": total_responses,
+            "completed_responses": completed_responses,
+            "completion_rate": (
+                (completed_responses / total_responses * 100)
+                if total_responses > 0
+                else 0
+            ),
+            "internal_responses": stats["internal_responses"],
+            "external_responses": stats["external_responses"],
+            "recent_responses": recent_responses,
+        }
+
+        total_distributions = stats["total_distributions"]
+        opened_distributions = stats["opened_distributions"]
+        clicked_distributions = stats["total_clicks"]
 
         return {
             "survey_id": survey_id,
             "response_stats": response_stats,
             "distribution_stats": {
                 "total": total_distributions,
-                "sent": sent_distributions,
+                "sent": stats["sent_distributions"],
                 "opened": opened_distributions,
                 "clicked": clicked_distributions,
                 "open_rate": (
@@ -221,58 +712,92 @@ class ResponseService:
             },
             "recent_activity": {
                 "last_7_days": recent_responses,
-                "last_24_hours": db.session.query(Response)
-                .filter(
-                    db.and_(
-                        Response.survey_id == survey_id,
-                        Response.created_at >= datetime.utcnow() - timedelta(days=1),
-                    )
-                )
-                .count(),
+                "last_24_hours": self.survey_stats_repository.get_response_count_since(
+                    survey_id, datetime.utcnow() - timedelta(days=1)
+                ),
             },
         }
 
-    def get_daily_response_counts(self, survey_id: str, days: int = 30):
+    def get_daily_response_counts(self, survey_id: str, query: dict):
         """
-        Returns daily response counts for the specified number of days
+        Returns response counts bucketed by hour, day or week in the given timezone.
+        Defaults to the last `days` days up to now.
         """
-        return self.response_repository.get_daily_response_counts(survey_id, days)
+        granularity = query.get("granularity", "day")
+        timezone = query.get("timezone", "UTC")
+        zone = get_zone(timezone)
+
+        now = datetime.utcnow()
+        end = to_utc_naive(query["end"], zone) if query.get("end") else now
+        if query.get("start"):
+            start = to_utc_naive(query["start"], zone)
+        else:
+            local_end = to_local_naive(end, zone)
+            local_start = truncate(local_end, "day") - timedelta(
+                days=query.get("days", 30) - 1
+            )
+            start = to_utc_naive(local_start, zone)
+        if start >= end:
+            raise BadRequest("start must be before end")
+
+        buckets = bucket_starts(
+            to_local_naive(start, zone), to_local_naive(end, zone), granularity
+        )
+        if len(buckets) > MAX_RESPONSE_COUNT_BUCKETS:
+            raise BadRequest(
+                f"Range spans more than {MAX_RESPONSE_COUNT_BUCKETS} {granularity} buckets"
+            )
+
+        # UTC buckets can be served from the hourly rollup, other zones need raw rows
+        if timezone == "UTC":
+            counts = self.survey_stats_repository.get_response_counts_by_bucket(
+                survey_id, start, end, granularity
+            )
+        else:
+            counts = self.response_repository.get_response_counts_by_bucket(
+                survey_id, start, end, granularity, timezone
+            )
+
+        return [
+            {
+                "date": bucket_label(bucket, granularity),
+                "count": counts.get(bucket, 0),
+            }
+            for bucket in buckets
+        ]
 
     def get_question_analytics(self, survey_id: str):
         """
         Returns analytics for each question in the survey
         """
         # Get all questions for the survey
-        questions = self.question_repository.get_questions_by_survey(survey_id)
+        version = self.survey_repository.get_version(survey_id)
+        if not version:
+            return []
+        questions = self.question_repository.get_cached_by_survey(survey_id, version)
+
+        # Aggregate answers of all questions on the database side
+        aggregates = self.answer_repository.get_question_aggregates(survey_id)
+        breakdowns = self.answer_repository.get_question_breakdowns(survey_id)
 
         question_analytics = []
         for question in questions:
-            # Get all answers for this question
-            answers = (
-                db.session.query(Answer)
-                .join(Response)
-                .filter(
-                    db.and_(
-                        Response.survey_id == survey_id,
-                        Answer.question_id == question.id,
-                    )
-                )
-                .all()
-            )
+            aggregate = aggregates.get(question.id, {})
+            breakdown = breakdowns.get(question.id, {})
 
-            total_answers = len(answers)
-            answered_questions = len(
-                [a for a in answers if a.value or a.values or a.rating or a.date_value]
-            )
+            total_answers = aggregate.get("total", 0)
+            answered_questions = aggregate.get("answered", 0)
             skipped_questions = total_answers - answered_questions
 
-            # For text questions, get average response length
-            avg_response_length = 0
-            if len(question.text) and answered_questions > 0:
-                text_answers = [a for a in answers if a.value]
-                if text_answers:
-                    total_length = sum(len(a.value) for a in text_answers if a.value)
-                    avg_response_length = total_length / len(text_answers)
+            rating_stats = {}
+            if aggregate.get("rating_count"):
+                rating_stats = {
+                    "average": aggregate["rating_avg"],
+                    "min": aggregate["rating_min"],
+                    "max": aggregate["rating_max"],
+                    "count": aggregate["rating_count"],
+                    "distribution": breakdown.get("rating", {}),
+                }
 
             question_analytics.append(
                 {
@@ -287,8 +812,12 @@ class ResponseService:
                         if total_answers > 0
                         else 0
                     ),
-                    "avg_response_length": round(avg_response_length, 1),
-                    "avg_rating": None,
+                    "avg_response_length": round(aggregate.get("avg_length", 0), 1),
+                    "avg_rating": (
+                        round(rating_stats["average"], 1) if rating_stats else None
+                    ),
+                    "rating_stats": rating_stats,
+                    "option_counts": breakdown.get("option", {}),
                 }
             )
 
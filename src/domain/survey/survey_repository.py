@@ -1,10 +1,37 @@
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any
 from datetime import datetime
+from flask import g
 from src.shared.base_repository import BaseRepository
+from sqlalchemy import desc, func, literal, select
 from src.database.models.survey_model import Survey
+from src.database.models.question_model import Question
+from src.database.models.response_model import Response
+from src.database.models.survey_stats_model import SurveyStats
 from src.database.db import db
+from src.database.routing import read_only
+from src.shared.cache import snapshot, rehydrate
+from app import cache
+from markupsafe import escape
+import re
 import uuid
 
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+
+class SurveyVersion(NamedTuple):
+    """What changes whenever a survey, its questions or its recorded activity change"""
+
+    updated_at: Optional[datetime]
+    question_count: int
+    questions_updated_at: Optional[datetime]
+    stats_updated_at: Optional[datetime]
+
+
+def forget_versions():
+    """Drop the versions read so far in the current request, after a write"""
+    g.pop("survey_versions", None)
+
 
 class SurveyRepository(BaseRepository[Survey]):
     """Repository for Survey operations"""
@@ -12,6 +39,79 @@ class SurveyRepository(BaseRepository[Survey]):
     def __init__(self):
         super().__init__(Survey)
 
+    def get_cached(self, id: str) -> Optional[Survey]:
+        """
+        Get a detached copy of a survey by ID, read through the cache under its
+        current version, so it matches the ETag of the request. Only use it for
+        reads, never to decide on a write.
+        """
+        try:
+            id = uuid.UUID(str(id))
+        except ValueError:
+            return None
+        version = self.get_version(id)
+        if version is None:
+            return None
+        values = cache.get_or_set(
+            self._cache_key(id, version), lambda: snapshot(self.get_by_id(str(id)))
+        )
+        return rehydrate(self.model, values)
+
+    def update(self, id: str, **kwargs) -> Optional[Survey]:
+        survey = super().update(id, **kwargs)
+        forget_versions()
+        return survey
+
+    def delete(self, id: str) -> bool:
+        deleted = super().delete(id)
+        forget_versions()
+        return deleted
+
+    def get_version(
+        self, survey_id: str, fresh: bool = False
+    ) -> Optional[SurveyVersion]:
+        """
+        Get what changes whenever a survey, its questions or its recorded activity
+        change, in one query. Returns None if the survey doesn't exist.
+        The version is read once per request, unless `fresh`, so the cached reads
+        of a request are keyed by the version its ETag was derived from.
+        """
+        survey_id = uuid.UUID(str(survey_id))
+        versions = g.setdefault("survey_versions", {})
+        if fresh or survey_id not in versions:
+            versions[survey_id] = self._read_version(survey_id)
+        return versions[survey_id]
+
+    def _read_version(self, survey_id: uuid.UUID) -> Optional[SurveyVersion]:
+        question_count = (
+            select(func.count(Question.id))
+            .where(Question.survey_id == survey_id)
+            .scalar_subquery()
+        )
+        questions_updated_at = (
+            select(func.max(Question.updated_at))
+            .where(Question.survey_id == survey_id)
+            .scalar_subquery()
+        )
+        stats_updated_at = (
+            select(SurveyStats.updated_at)
+            .where(SurveyStats.survey_id == survey_id)
+            .scalar_subquery()
+        )
+        row = db.session.execute(
+            select(
+                self.model.updated_at,
+                question_count,
+                questions_updated_at,
+                stats_updated_at,
+            ).where(self.model.id == survey_id)
+        ).first()
+        return SurveyVersion(*row) if row else None
+
+    @staticmethod
+    def _cache_key(id, version: SurveyVersion) -> str:
+        return f"survey:{uuid.UUID(str(id))}:{version.updated_at}"
+
     def get_active_surveys(self, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
         """Get all active surveys"""
         query = self.model.query.filter_by(status="active")
@@ -61,27 +161,118 @@ class SurveyRepository(BaseRepository[Survey]):
             "has_prev": pagination.has_prev,
         }
 
+    @read_only
     def search_surveys(
         self, search_term: str, page: int = 1, per_page: int = 20
     ) -> Dict[str, Any]:
-        """Search surveys by title or description"""
-        query = self.model.query.filter(
-            db.or_(
-                self.model.title.ilike(f"%{search_term}%"),
-                self.model.description.ilike(f"%{search_term}%"),
-            )
+        """
+        Search surveys by title and description, most relevant first.
+        Every word matches as a prefix through the full-text index, and titles
+        that are only similar to the search term, like typos, match through the
+        trigram index ranked below. The items get a `rank` and a `highlight` of
+        their title and description with the matches in <mark> tags.
+        """
+        tsquery = self._search_tsquery(search_term)
+        similarity = func.word_similarity(search_term, self.model.title)
+        matches = self.model.title.bool_op("%>")(search_term)
+        rank = func.ts_rank_cd(self.model.search_vector, tsquery)
+        if tsquery is not None:
+            matches = db.or_(self.model.search_vector.bool_op("@@")(tsquery), matches)
+        else:
+            rank = literal(0.0)
+
+        query = (
+            db.session.query(self.model, rank.label("rank"))
+            .filter(matches)
+            .order_by(desc("rank"), similarity.desc(), desc(self.model.created_at))
         )
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        result = self.paginate(query, page, per_page)
 
-        return {
-            "items": pagination.items,
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": page,
-            "per_page": per_page,
-            "has_next": pagination.has_next,
-            "has_prev": pagination.has_prev,
+        items = []
+        for survey, survey_rank in result["items"]:
+            survey.rank = round(float(survey_rank), 6)
+            items.append(survey)
+        self._attach_highlights(items, tsquery)
+        result["items"] = items
+        return result
+
+    @staticmethod
+    def _search_tsquery(search_term: str):
+        """A tsquery matching every word of the search term as a prefix"""
+        words = re.findall(r"\w+", search_term)
+        if not words:
+            return None
+        return func.to_tsquery("simple", " & ".join(f"{word}:*" for word in words))
+
+    def _attach_highlights(self, surveys: List[Survey], tsquery):
+        """Highlight the matches of a page of search results in one query"""
+        if not surveys:
+            return
+        if tsquery is None:
+            for survey in surveys:
+                survey.highlight = {
+                    "title": str(escape(survey.title)),
+                    "description": None,
+                }
+            return
+
+        # Mark matches with control characters, so the text can be escaped
+        # before they become <mark> tags
+        selection = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}"'
+        rows = db.session.execute(
+            select(
+                self.model.id,
+                func.ts_headline(
+                    "simple",
+                    self.model.title,
+                    tsquery,
+                    f"{selection}, HighlightAll=true",
+                ),
+                func.ts_headline(
+                    "simple",
+                    self.model.description,
+                    tsquery,
+                    f"{selection}, MaxFragments=2, MaxWords=20, MinWords=5",
+                ),
+            ).where(self.model.id.in_([survey.id for survey in surveys]))
+        )
+        highlights = {
+            id: {"title": _mark(title), "description": _mark(description)}
+            for id, title, description in rows
         }
+        for survey in surveys:
+            survey.highlight = highlights.get(survey.id)
+
+    @read_only
+    def attach_counts(self, surveys: List[Survey]) -> List[Survey]:
+        """
+        Preload the question and response counts of many surveys in one query,
+        so serializing them doesn't run two COUNT queries per survey
+        """
+        if not surveys:
+            return surveys
+
+        question_count = (
+            select(func.count(Question.id))
+            .where(Question.survey_id == self.model.id)
+            .scalar_subquery()
+        )
+        response_count = (
+            select(func.count(Response.id))
+            .where(Response.survey_id == self.model.id)
+            .scalar_subquery()
+        )
+        rows = db.session.execute(
+            select(self.model.id, question_count, response_count).where(
+                self.model.id.in_([survey.id for survey in surveys])
+            )
+        )
+        counts = {id: (questions, responses) for id, questions, responses in rows}
+        for survey in surveys:
+            survey._question_count, survey._response_count = counts.get(
+                survey.id, (0, 0)
+            )
+        return surveys
 
     def get_survey_with_questions(self, survey_id: str) -> Optional[Survey]:
         """Get survey with all its questions"""
@@ -148,3 +339,14 @@ class SurveyRepository(BaseRepository[Survey]):
             if last_response and last_response.created_at
             else None
         )
+
+
+def _mark(headline: Optional[str]) -> Optional[str]:
+    """Escape a search headline and turn its match markers into <mark> tags"""
+    if headline is None:
+        return None
+    return (
+        str(escape(headline))
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
@@ -1,7 +1,6 @@
 from injector import inject
 from .survey_repository import SurveyRepository
-from src.shared.schema import PaginationRequestSchema
-from src.schema.survey_schema import CreateSurveySchema
+from src.schema.survey_schema import CreateSurveySchema, SurveyQuerySchema
 from src.decorators import validate_input
 from werkzeug.exceptions import NotFound
 from src.domain.distribution.distribution_service import DistributionService
@@ -20,20 +19,29 @@ class SurveyService:
         self.survey_repository = survey_repository
         self.distribution_service = distribution_service
 
-    @validate_input(PaginationRequestSchema, target="query")
+    @validate_input(SurveyQuerySchema, target="query")
     def query_surveys(self, query: dict):
         """
-        Paginated query of the survey.
+        Paginated query of the survey, or a ranked search when `q` is given.
         """
-        return self.survey_repository.get_all(**query)
+        search_term = query.pop("q", None)
+        if search_term:
+            result = self.survey_repository.search_surveys(
+                search_term, query["page"], query["per_page"]
+            )
+        else:
+            result = self.survey_repository.get_all(**query)
+        self.survey_repository.attach_counts(result["items"])
+        return result
 
     def get_survey_by_id(self, survey_id: str):
         """
         Gets a survey by its ID.
         """
-        survey = self.survey_repository.get_by_id(survey_id)
+        survey = self.survey_repository.get_cached(survey_id)
         if not survey:
             raise NotFound("Survey not found")
+        self.survey_repository.attach_counts([survey])
         return survey
 
     def publish_survey(self, survey_id: str):
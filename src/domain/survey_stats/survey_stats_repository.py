@@ -0,0 +1,327 @@
+from typing import Dict, Any, List, Optional, Union
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, select, insert, delete, literal, or_, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.shared.base_repository import BaseRepository
+from src.database.models.survey_stats_model import SurveyStats, SurveyStatsBucket
+from src.database.models.survey_model import Survey
+from src.database.models.response_model import Response, ResponseSource
+from src.database.models.answer_model import Answer
+from src.database.models.distribution_model import Distribution, DistributionStatus
+from src.database.db import db
+from src.database.routing import read_only
+import uuid
+
+COUNTER_COLUMNS = [
+    "total_responses",
+    "internal_responses",
+    "external_responses",
+    "total_answers",
+    "total_distributions",
+    "pending_distributions",
+    "sent_distributions",
+    "opened_distributions",
+    "clicked_distributions",
+    "failed_distributions",
+    "total_clicks",
+]
+
+
+class SurveyStatsRepository(BaseRepository[SurveyStats]):
+    """
+    Repository for the per-survey analytics rollup.
+    The record_* methods don't commit, so the counters are updated in the
+    transaction of the write they record, and roll back with it.
+    """
+
+    def __init__(self):
+        super().__init__(SurveyStats)
+
+    @read_only
+    def get_counters(self, survey_id: str) -> Dict[str, Any]:
+        """Get the rollup counters of a survey, zeroed if nothing was recorded yet"""
+        stats = self.get_by_id(str(survey_id))
+        counters = {column: 0 for column in COUNTER_COLUMNS}
+        if stats:
+            counters.update(
+                {column: getattr(stats, column) or 0 for column in COUNTER_COLUMNS}
+            )
+        counters["updated_at"] = stats.updated_at if stats else None
+        return counters
+
+    @read_only
+    def get_response_count_since(self, survey_id: str, since: datetime) -> int:
+        """Get the number of responses created since the naive UTC `since`"""
+        responses = self._responses_between(survey_id, since)
+        total = db.session.query(
+            func.coalesce(func.sum(responses.c.responses), 0)
+        ).scalar()
+        return int(total or 0)
+
+    @read_only
+    def get_response_counts_by_bucket(
+        self, survey_id: str, start: datetime, end: datetime, granularity: str = "day"
+    ) -> Dict[datetime, int]:
+        """
+        Get UTC hour/day/week response counts of the responses created in the
+        naive UTC range [start, end)
+        """
+        responses = self._responses_between(survey_id, start, end)
+        bucket = func.date_trunc(granularity, responses.c.moment)
+        rows = (
+            db.session.query(bucket, func.sum(responses.c.responses))
+            .group_by(bucket)
+            .all()
+        )
+        return {bucket_start: int(count) for bucket_start, count in rows}
+
+    def record_responses(
+        self,
+        survey_id: str,
+        source: ResponseSource,
+        created_ats: List[datetime],
+        answer_count: int = 0,
+    ):
+        """Record newly created responses of a survey"""
+        if not created_ats:
+            return
+        source_column = (
+            "external_responses"
+            if source == ResponseSource.EXTERNAL
+            else "internal_responses"
+        )
+        self._increment(
+            survey_id,
+            total_responses=len(created_ats),
+            total_answers=answer_count,
+            **{source_column: len(created_ats)},
+        )
+
+        buckets = Counter(self._bucket_start(created_at) for created_at in created_ats)
+        stmt = pg_insert(SurveyStatsBucket).values(
+            [
+                {
+                    "survey_id": uuid.UUID(str(survey_id)),
+                    "bucket_start": bucket_start,
+                    "responses": count,
+                }
+                for bucket_start, count in buckets.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SurveyStatsBucket.survey_id,
+                SurveyStatsBucket.bucket_start,
+            ],
+            set_={"responses": SurveyStatsBucket.responses + stmt.excluded.responses},
+        )
+        db.session.execute(stmt)
+
+    def record_answers(self, survey_id: str, count: int):
+        """Record newly submitted answers of a survey"""
+        if count:
+            self._increment(survey_id, total_answers=count)
+
+    def record_distributions(
+        self,
+        survey_id: str,
+        count: int,
+        status: DistributionStatus = DistributionStatus.PENDING,
+    ):
+        """Record newly created distributions of a survey"""
+        if count:
+            self._increment(
+                survey_id,
+                total_distributions=count,
+                **{self._status_column(status): count},
+            )
+
+    def record_distribution_status_change(
+        self,
+        survey_id: str,
+        from_status: Union[DistributionStatus, str],
+        to_status: Union[DistributionStatus, str],
+        count: int = 1,
+    ):
+        """Move `count` distributions of a survey from one status counter to another"""
+        from_column = self._status_column(from_status)
+        to_column = self._status_column(to_status)
+        if count and from_column != to_column:
+            self._increment(survey_id, **{from_column: -count, to_column: count})
+
+    def record_clicks(self, survey_id: str, count: int = 1):
+        """Record distribution link clicks of a survey"""
+        if count:
+            self._increment(survey_id, total_clicks=count)
+
+    def rebuild(self, survey_id: Optional[str] = None) -> int:
+        """
+        Recompute the rollup from the raw tables, for one survey or all of them.
+        Returns the number of surveys rebuilt.
+        """
+        survey_uuid = uuid.UUID(str(survey_id)) if survey_id else None
+
+        def only(column):
+            return [column == survey_uuid] if survey_uuid else []
+
+        db.session.execute(
+            delete(SurveyStatsBucket).where(*only(SurveyStatsBucket.survey_id))
+        )
+        db.session.execute(delete(SurveyStats).where(*only(SurveyStats.survey_id)))
+
+        bucket_start = func.date_trunc("hour", Response.created_at)
+        db.session.execute(
+            insert(SurveyStatsBucket).from_select(
+                ["survey_id", "bucket_start", "responses"],
+                select(Response.survey_id, bucket_start, func.count())
+                .where(Response.created_at.isnot(None), *only(Response.survey_id))
+                .group_by(Response.survey_id, bucket_start),
+            )
+        )
+
+        responses = (
+            select(
+                Response.survey_id,
+                func.count().label("total"),
+                func.count()
+                .filter(Response.source == ResponseSource.INTERNAL)
+                .label("internal"),
+                func.count()
+                .filter(Response.source == ResponseSource.EXTERNAL)
+                .label("external"),
+            )
+            .where(*only(Response.survey_id))
+            .group_by(Response.survey_id)
+            .subquery()
+        )
+        answers = (
+            select(Response.survey_id, func.count(Answer.id).label("total"))
+            .join(Answer, Answer.response_id == Response.id)
+            .where(*only(Response.survey_id))
+            .group_by(Response.survey_id)
+            .subquery()
+        )
+        distributions = (
+            select(
+                Distribution.survey_id,
+                func.count().label("total"),
+                func.sum(Distribution.clicked_count).label("clicks"),
+                *[
+                    func.count()
+                    .filter(Distribution.status == status)
+                    .label(status.value)
+                    for status in DistributionStatus
+                ],
+            )
+            .where(*only(Distribution.survey_id))
+            .group_by(Distribution.survey_id)
+            .subquery()
+        )
+
+        def zero(column):
+            return func.coalesce(column, 0)
+
+        stats = (
+            select(
+                Survey.id,
+                zero(responses.c.total),
+                zero(responses.c.internal),
+                zero(responses.c.external),
+                zero(answers.c.total),
+                zero(distributions.c.total),
+                *[zero(distributions.c[status.value]) for status in DistributionStatus],
+                zero(distributions.c.clicks),
+                literal(datetime.utcnow()),
+            )
+            .outerjoin(responses, responses.c.survey_id == Survey.id)
+            .outerjoin(answers, answers.c.survey_id == Survey.id)
+            .outerjoin(distributions, distributions.c.survey_id == Survey.id)
+            .where(*only(Survey.id))
+        )
+        result = db.session.execute(
+            insert(SurveyStats).from_select(
+                [
+                    "survey_id",
+                    "total_responses",
+                    "internal_responses",
+                    "external_responses",
+                    "total_answers",
+                    "total_distributions",
+                    *[self._status_column(status) for status in DistributionStatus],
+                    "total_clicks",
+                    "updated_at",
+                ],
+                stats,
+            )
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def _responses_between(
+        self, survey_id: str, start: datetime, end: Optional[datetime] = None
+    ):
+        """
+        Subquery of (moment, responses) rows adding up to the responses of a
+        survey created in the naive UTC range [start, end): the hourly buckets of
+        the whole hours in it, and the raw responses of the partial hours at its
+        edges, so the counts are exact and at most two hours of rows are read
+        """
+        survey_uuid = uuid.UUID(str(survey_id))
+        first_hour = self._bucket_start(start)
+        if first_hour < start:
+            first_hour += timedelta(hours=1)
+        last_hour = self._bucket_start(end) if end else None
+        if last_hour is not None and first_hour > last_hour:
+            # Within a single hour, every response is counted from the raw rows
+            first_hour = last_hour = end
+
+        buckets = select(
+            SurveyStatsBucket.bucket_start.label("moment"),
+            SurveyStatsBucket.responses.label("responses"),
+        ).where(
+            SurveyStatsBucket.survey_id == survey_uuid,
+            SurveyStatsBucket.bucket_start >= first_hour,
+            *(
+                [SurveyStatsBucket.bucket_start < last_hour]
+                if last_hour is not None
+                else []
+            ),
+        )
+        edges = [and_(Response.created_at >= start, Response.created_at < first_hour)]
+        if last_hour is not None:
+            edges.append(
+                and_(Response.created_at >= last_hour, Response.created_at < end)
+            )
+        partial = select(
+            Response.created_at.label("moment"), literal(1).label("responses")
+        ).where(Response.survey_id == survey_uuid, or_(*edges))
+        return union_all(buckets, partial).subquery()
+
+    def _increment(self, survey_id: str, **deltas: int):
+        """Atomically add the given deltas to the counters of a survey"""
+        now = datetime.utcnow()
+        stmt = pg_insert(self.model).values(
+            survey_id=uuid.UUID(str(survey_id)), updated_at=now, **deltas
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.survey_id],
+            set_={
+                **{
+                    column: getattr(self.model, column) + stmt.excluded[column]
+                    for column in deltas
+                },
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.session.execute(stmt)
+
+    @staticmethod
+    def _status_column(status: Union[DistributionStatus, str]) -> str:
+        if isinstance(status, str):
+            status = DistributionStatus[status]
+        return f"{status.value}_distributions"
+
+    @staticmethod
+    def _bucket_start(moment: datetime) -> datetime:
+        return moment.replace(minute=0, second=0, microsecond=0)
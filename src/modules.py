@@ -7,7 +7,10 @@ from .domain.distribution.distribution_repository import DistributionRepository
 from .domain.distribution.distribution_service import DistributionService
 from .domain.response.response_repository import ResponseRepository
 from .domain.response.response_service import ResponseService
+from .domain.answer.answer_repository import AnswerRepository
+from .domain.survey_stats.survey_stats_repository import SurveyStatsRepository
 from .services.mail_service import MailService
+from .services.email_render_service import EmailRenderService
 from .services.scheduler_service import SchedulerService
 
 
@@ -24,6 +27,11 @@ def bind_modules(binder):
     binder.bind(ResponseRepository, to=ResponseRepository, scope=singleton)
     binder.bind(ResponseService, to=ResponseService, scope=singleton)
 
+    binder.bind(AnswerRepository, to=AnswerRepository, scope=singleton)
+
+    binder.bind(SurveyStatsRepository, to=SurveyStatsRepository, scope=singleton)
+
     binder.bind(MailService, to=MailService, scope=singleton)
+    binder.bind(EmailRenderService, to=EmailRenderService, scope=singleton)
 
     binder.bind(SchedulerService, to=SchedulerService, scope=singleton)
@@ -1,4 +1,5 @@
 from marshmallow import Schema, fields
+from src.shared.fast_schema import FastDumpSchema
 from src.shared.schema import PaginationResponseSchema
 from src.database.models.distribution_model import (
     DistributionMethod,
@@ -6,7 +7,7 @@ from src.database.models.distribution_model import (
 )
 
 
-class DistributionSchema(Schema):
+class DistributionSchema(FastDumpSchema):
     id = fields.UUID(required=True)
     method = fields.Enum(DistributionMethod, required=True)
     recipient_email = fields.Str()
@@ -1,7 +1,8 @@
 from marshmallow import Schema, fields
+from src.shared.fast_schema import FastDumpSchema
 
 
-class QuestionSchema(Schema):
+class QuestionSchema(FastDumpSchema):
     id = fields.UUID(required=True)
     text = fields.Str(required=True)
     required = fields.Boolean()
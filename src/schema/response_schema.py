@@ -1,5 +1,13 @@
-from marshmallow import Schema, fields, validate, ValidationError
+from marshmallow import (
+    Schema,
+    fields,
+    validate,
+    validates,
+    ValidationError,
+)
+from src.shared.fast_schema import FastDumpSchema
 from src.shared.schema import PaginationResponseSchema
+from src.shared.time_buckets import GRANULARITIES, get_zone
 from src.database.models.response_model import ResponseSource
 
 
@@ -36,7 +44,7 @@ class SubmitAnswersSchema(Schema):
     answers = fields.List(fields.Nested(AnswerSchema), required=True)
 
 
-class ResponseSchema(Schema):
+class ResponseSchema(FastDumpSchema):
     id = fields.UUID()
     respondent_email = fields.String(allow_none=True)
     respondent_name = fields.String(allow_none=True)
@@ -46,7 +54,42 @@ class ResponseSchema(Schema):
     updated_at = fields.DateTime()
     survey_id = fields.UUID()
     distribution_id = fields.UUID(allow_none=True)
+    answer_count = fields.Integer(dump_only=True)
 
 
 class SurveyResponsePaginatedSchema(PaginationResponseSchema):
     items = fields.List(fields.Nested(ResponseSchema))
+
+
+class ResponseCountsQuerySchema(Schema):
+    granularity = fields.String(
+        load_default="day", validate=validate.OneOf(GRANULARITIES)
+    )
+    timezone = fields.String(load_default="UTC")
+    start = fields.DateTime()
+    end = fields.DateTime()
+    days = fields.Integer(load_default=30, validate=validate.Range(min=1, max=366))
+
+    @validates("timezone")
+    def validate_timezone(self, value, **_):
+        try:
+            get_zone(value)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+
+class ExportResponsesQuerySchema(Schema):
+    format = fields.String(
+        load_default="csv", validate=validate.OneOf(["csv", "ndjson"])
+    )
+
+
+class BulkImportQuerySchema(Schema):
+    # Defaults to the format of the request content type
+    format = fields.String(validate=validate.OneOf(["csv", "ndjson"]))
+
+
+class BatchGetResponseAnswersSchema(Schema):
+    response_ids = fields.List(
+        fields.UUID(), required=True, validate=validate.Length(min=1, max=500)
+    )
@@ -1,9 +1,10 @@
-from marshmallow import Schema, fields, validates_schema, ValidationError
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
 from src.database.models.survey_model import SurveyType
-from src.shared.schema import PaginationResponseSchema
+from src.shared.fast_schema import FastDumpSchema
+from src.shared.schema import PaginationRequestSchema, PaginationResponseSchema
 
 
-class SurveySchema(Schema):
+class SurveySchema(FastDumpSchema):
     id = fields.UUID(required=True)
     title = fields.Str(required=True)
     description = fields.Str()
@@ -12,6 +13,13 @@ class SurveySchema(Schema):
     external_url = fields.Str()
     created_at = fields.DateTime()
     updated_at = fields.DateTime()
+    question_count = fields.Integer(dump_only=True)
+    response_count = fields.Integer(dump_only=True)
+    # Only on search results
+    rank = fields.Float(dump_only=True)
+    highlight = fields.Dict(
+        keys=fields.String(), values=fields.String(allow_none=True), dump_only=True
+    )
 
 
 class CreateSurveySchema(Schema):
@@ -29,5 +37,10 @@ class CreateSurveySchema(Schema):
             )
 
 
+class SurveyQuerySchema(PaginationRequestSchema):
+    # Searches titles and descriptions, results are ranked and paged by offset
+    q = fields.String(validate=validate.Length(min=1, max=200))
+
+
 class SurveyPaginatedSchema(PaginationResponseSchema):
     items = fields.List(fields.Nested(SurveySchema))
@@ -0,0 +1,154 @@
+from email.message import EmailMessage
+from threading import Lock, Thread
+from typing import List, Optional
+import asyncio
+import atexit
+import logging
+import socket
+import aiosmtplib
+from src.config.mail_config import MailConfig
+
+logger = logging.getLogger(__name__)
+
+# Server replies, after which aiosmtplib resets the envelope and the connection
+# can send the next message
+REUSABLE_ERRORS = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
+
+
+class AsyncMailTransport:
+    """
+    Sends emails with aiosmtplib from an asyncio event loop on a background
+    thread, over a pool of at most `pool_size` SMTP connections, which also
+    bounds the number of messages in flight. Callers block until their own
+    messages are sent.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        use_ssl: bool = False,
+        pool_size: int = 10,
+        timeout: float = 30,
+    ):
+        self.local_hostname = socket.getfqdn()
+        self.connection_options = dict(
+            hostname=host,
+            port=port,
+            username=username or None,
+            password=password or None,
+            # aiosmtplib calls implicit TLS use_tls, and STARTTLS start_tls
+            use_tls=use_ssl,
+            start_tls=use_tls and not use_ssl,
+            timeout=timeout,
+            local_hostname=self.local_hostname,
+        )
+        self.pool_size = pool_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._idle: List[aiosmtplib.SMTP] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_config(cls) -> "AsyncMailTransport":
+        return cls(
+            host=MailConfig.MAIL_SERVER,
+            port=MailConfig.MAIL_PORT,
+            username=MailConfig.MAIL_USERNAME,
+            password=MailConfig.MAIL_PASSWORD,
+            use_tls=MailConfig.MAIL_USE_TLS,
+            use_ssl=MailConfig.MAIL_USE_SSL,
+            pool_size=MailConfig.MAIL_POOL_SIZE,
+            timeout=MailConfig.MAIL_TIMEOUT,
+        )
+
+    def send(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        """
+        Send messages concurrently, the envelope is taken from their headers
+
+        Returns:
+            List[Optional[Exception]]: The error of each message, None when it was sent
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._send_all(messages), self._get_loop()
+        )
+        return future.result()
+
+    def close(self):
+        """Quit the pooled connections and stop the event loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close_idle(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._slots = None
+                self._thread = Thread(
+                    target=self._loop.run_forever, name="mail-transport", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+            return self._loop
+
+    async def _send_all(self, messages: List[EmailMessage]):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        # A failure of one message never fails the others, they may be sent already
+        return await asyncio.gather(
+            *(self._send_one(message) for message in messages), return_exceptions=True
+        )
+
+    async def _send_one(self, message: EmailMessage) -> Optional[Exception]:
+        async with self._slots:
+            connection = None
+            try:
+                connection = await self._acquire()
+                await connection.send_message(message)
+                return None
+            except Exception as e:
+                logger.error(f"Failed to send email to {message['To']}: {e}")
+                if not isinstance(e, REUSABLE_ERRORS):
+                    # The connection is in an unknown state, don't pool it
+                    self._discard(connection)
+                    connection = None
+                return e
+            finally:
+                if connection is not None and connection.is_connected:
+                    self._idle.append(connection)
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        # Pooled connections the server closed while idle are dropped, so a
+        # message is never retried after it may have been delivered
+        while self._idle:
+            connection = self._idle.pop()
+            if connection.is_connected:
+                return connection
+        connection = aiosmtplib.SMTP(**self.connection_options)
+        try:
+            await connection.connect()
+        except Exception:
+            self._discard(connection)
+            raise
+        return connection
+
+    def _discard(self, connection: Optional[aiosmtplib.SMTP]):
+        if connection is not None and connection.is_connected:
+            connection.close()
+
+    async def _close_idle(self):
+        idle, self._idle = self._idle, []
+        await asyncio.gather(
+            *(connection.quit() for connection in idle if connection.is_connected),
+            return_exceptions=True,
+        )
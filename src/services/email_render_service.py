@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+from uuid import uuid4
+import logging
+from flask import render_template
+from markupsafe import escape
+from src.config.mail_config import MailConfig
+
+logger = logging.getLogger(__name__)
+
+
+class SurveyEmailTemplate:
+    """A survey email rendered once per campaign, with the survey url left as a slot"""
+
+    __slots__ = ("plain_parts", "html_parts")
+
+    def __init__(self, plain_parts: List[str], html_parts: List[str]):
+        self.plain_parts = plain_parts
+        self.html_parts = html_parts
+
+    def render(self, survey_url: str) -> Tuple[str, str]:
+        """
+        Fill in the survey url of a recipient
+
+        Returns:
+            Tuple[str, str]: The plain and html bodies
+        """
+        # Jinja autoescapes the url in the html template, so escape it the same way
+        return (
+            survey_url.join(self.plain_parts),
+            str(escape(survey_url)).join(self.html_parts),
+        )
+
+
+class EmailRenderService:
+    """Service for rendering survey emails, cached per survey and message"""
+
+    def __init__(self, max_size: int = MailConfig.MAIL_TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self._templates: "OrderedDict[Tuple[str, str], SurveyEmailTemplate]" = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_survey_email_template(
+        self, survey_id: str, message: str
+    ) -> SurveyEmailTemplate:
+        """
+        Get the compiled survey email of a campaign, rendering it on a cache miss
+        """
+        key = (str(survey_id), sha256((message or "").encode()).hexdigest())
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        template = self._compile(message)
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        return template
+
+    def render_survey_email(
+        self, survey_id: str, message: str, survey_url: str
+    ) -> Tuple[str, str]:
+        """
+        Render the plain and html bodies of a survey email for one recipient
+        """
+        return self.get_survey_email_template(survey_id, message).render(survey_url)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Template hit and miss counts of this process"""
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._templates)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "size": size,
+            "max_size": self.max_size,
+        }
+
+    def _compile(self, message: str) -> SurveyEmailTemplate:
+        # A random slot can't collide with anything in the message
+        slot = f"survey-url-{uuid4().hex}"
+        html_body = render_template(
+            "survey_email.html", message=message, survey_url=slot
+        )
+        plain_body = f"{message}\n\nSurvey Link: {slot}"
+        return SurveyEmailTemplate(plain_body.split(slot), html_body.split(slot))
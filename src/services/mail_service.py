@@ -1,14 +1,28 @@
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
 from flask_mail import Message
 from typing import List, Optional
 import logging
 from app import mail
 from src.config.mail_config import MailConfig
+from src.services.async_mail_transport import AsyncMailTransport
 
 logger = logging.getLogger(__name__)
 
 
 class MailService:
-    """Service for handling email operations"""
+    """
+    Service for handling email operations.
+    With MAIL_TRANSPORT=async, emails go through the pooled asyncio transport
+    instead of Flask-Mail.
+    """
+
+    def __init__(self):
+        self.transport = (
+            AsyncMailTransport.from_config()
+            if MailConfig.MAIL_TRANSPORT == "async"
+            else None
+        )
 
     def send_email(
         self,
@@ -28,6 +42,14 @@ class MailService:
             html_body: HTML email body (optional)
             sender: Sender email address (optional, uses default if not provided)
         """
+        if self.transport:
+            error = self.transport.send(
+                [self._build_message(to_emails, subject, body, html_body, sender)]
+            )[0]
+            if error:
+                raise error
+            return
+
         from server import app
 
         with app.app_context():
@@ -39,3 +61,71 @@ class MailService:
                 sender=sender or MailConfig.MAIL_DEFAULT_SENDER,
             )
             mail.send(msg)
+
+    def send_bulk(
+        self, emails: List[dict], sender: Optional[str] = None
+    ) -> List[Optional[Exception]]:
+        """
+        Send many emails over a single SMTP connection
+
+        Args:
+            emails: Dicts with to_emails, subject, body and optional html_body
+            sender: Sender email address (optional, uses default if not provided)
+
+        Returns:
+            List[Optional[Exception]]: The error of each email, None when it was sent
+        """
+        if self.transport:
+            return self.transport.send(
+                [
+                    self._build_message(
+                        email["to_emails"],
+                        email["subject"],
+                        email["body"],
+                        email.get("html_body"),
+                        sender,
+                    )
+                    for email in emails
+                ]
+            )
+
+        from server import app
+
+        results: List[Optional[Exception]] = []
+        with app.app_context():
+            with mail.connect() as connection:
+                for email in emails:
+                    msg = Message(
+                        subject=email["subject"],
+                        recipients=email["to_emails"],
+                        body=email["body"],
+                        html=email.get("html_body"),
+                        sender=sender or MailConfig.MAIL_DEFAULT_SENDER,
+                    )
+                    try:
+                        connection.send(msg)
+                        results.append(None)
+                    except Exception as e:
+                        # Keep going, the emails sent so far must be recorded
+                        logger.error(f"Failed to send email to {msg.recipients}: {e}")
+                        results.append(e)
+        return results
+
+    def _build_message(
+        self,
+        to_emails: List,
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        sender: Optional[str] = None,
+    ) -> EmailMessage:
+        msg = EmailMessage()
+        msg["Subject"] = subject
+        msg["From"] = sender or MailConfig.MAIL_DEFAULT_SENDER
+        msg["To"] = ", ".join(to_emails)
+        msg["Date"] = formatdate(localtime=True)
+        msg["Message-ID"] = make_msgid(domain=self.transport.local_hostname)
+        msg.set_content(body)
+        if html_body:
+            msg.add_alternative(html_body, subtype="html")
+        return msg
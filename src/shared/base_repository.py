@@ -1,7 +1,9 @@
 from typing import List, Optional, TypeVar, Generic, Type, Any, Dict
 from src.database.db import db
+from src.database.routing import read_only
 from sqlalchemy.orm import Query
-from sqlalchemy import desc
+from sqlalchemy import desc, tuple_
+from src.shared.cursor import encode_cursor, decode_cursor
 import uuid
 
 T = TypeVar("T")
@@ -20,9 +22,37 @@ class BaseRepository(Generic[T]):
         except (ValueError, TypeError):
             return None
 
-    def get_all(self, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
+    @read_only
+    def get_all(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        mode: str = "offset",
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Dict[str, Any]:
         """Get all entities with pagination"""
+        if mode == "cursor":
+            return self.paginate_by_cursor(
+                self.model.query, per_page, cursor, include_total
+            )
+
         query = self.model.query.order_by(desc(self.model.created_at))
+        return self.paginate(query, page, per_page)
+
+    def paginate(
+        self,
+        query: Query,
+        page: int = 1,
+        per_page: int = 20,
+        mode: str = "offset",
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Dict[str, Any]:
+        """Paginate a query by page number, or by cursor in cursor mode"""
+        if mode == "cursor":
+            return self.paginate_by_cursor(query, per_page, cursor, include_total)
+
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
         return {
@@ -35,20 +65,64 @@ class BaseRepository(Generic[T]):
             "has_prev": pagination.has_prev,
         }
 
-    def create(self, **kwargs) -> T:
-        """Create a new entity"""
+    def paginate_by_cursor(
+        self,
+        query: Query,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Keyset pagination over (created_at, id), newest first.
+        Each page is an index range scan, so deep pages cost the same as the first.
+        The total is only counted when explicitly requested.
+        """
+        total = query.order_by(None).count() if include_total else None
+
+        keyset = tuple_(self.model.created_at, self.model.id)
+        if cursor:
+            created_at, id = decode_cursor(cursor)
+            query = query.filter(keyset < tuple_(created_at, id))
+
+        items = (
+            query.order_by(desc(self.model.created_at), desc(self.model.id))
+            .limit(per_page + 1)
+            .all()
+        )
+        has_next = len(items) > per_page
+        items = items[:per_page]
+
+        result = {
+            "items": items,
+            "per_page": per_page,
+            "has_next": has_next,
+            "has_prev": bool(cursor),
+            "next_cursor": (
+                encode_cursor(items[-1].created_at, items[-1].id) if has_next else None
+            ),
+        }
+        if include_total:
+            result["total"] = total
+        return result
+
+    def create(self, commit: bool = True, **kwargs) -> T:
+        """Create a new entity, only flushed when the caller commits"""
         entity = self.model(**kwargs)
         db.session.add(entity)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
         return entity
 
-    def bulk_create(self, list: List[dict]) -> List[T]:
+    def bulk_create(self, list: List[dict], commit: bool = True) -> List[T]:
         """
         Bulk creates entities
         """
         objects = [self.model(**data) for data in list]
         db.session.bulk_save_objects(objects)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return objects
 
     def update(self, id: str, **kwargs) -> Optional[T]:
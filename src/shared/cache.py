@@ -0,0 +1,219 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict, Counter
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Type
+import logging
+import pickle
+import time
+import redis
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Storage of a cache, values are pickled by the backends that share them"""
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Get a value, or MISSING if it isn't cached or has expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: int):
+        pass
+
+    @abstractmethod
+    def delete(self, *keys: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry TTL. Invalidations only reach the
+    process making them, so it only suits a single process.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared between processes in Redis, or anything speaking its protocol"""
+
+    def __init__(self, url: str, prefix: str = ""):
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        value = self.client.get(self.prefix + key)
+        return MISSING if value is None else pickle.loads(value)
+
+    def set(self, key: str, value: Any, ttl: int):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl)
+
+    def delete(self, *keys: str):
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def clear(self):
+        keys = list(self.client.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class NullCacheBackend(CacheBackend):
+    """Disables caching"""
+
+    def get(self, key: str) -> Any:
+        return MISSING
+
+    def set(self, key: str, value: Any, ttl: int):
+        pass
+
+    def delete(self, *keys: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+class Cache:
+    """Read-through cache with a pluggable backend and hit/miss metrics"""
+
+    def __init__(self):
+        self.backend: CacheBackend = MemoryCacheBackend()
+        self.default_ttl = 300
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def init_app(self, app):
+        backend = app.config.get("CACHE_BACKEND", "memory")
+        if backend == "redis":
+            self.backend = RedisCacheBackend(
+                app.config["CACHE_URL"], app.config.get("CACHE_KEY_PREFIX", "")
+            )
+        elif backend == "none":
+            self.backend = NullCacheBackend()
+        else:
+            self.backend = MemoryCacheBackend(app.config.get("CACHE_MAX_SIZE", 1024))
+        self.default_ttl = app.config.get("CACHE_DEFAULT_TTL", self.default_ttl)
+
+    def get_or_set(
+        self, key: str, loader: Callable[[], Any], ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Get a cached value, loading and caching it on a miss.
+        None is never cached, so lookups of missing rows always reach the database.
+        """
+        namespace = key.split(":", 1)[0]
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.exception(f"Failed to read '{key}' from the cache")
+            value = MISSING
+        if value is not MISSING:
+            self.hits[namespace] += 1
+            return value
+
+        self.misses[namespace] += 1
+        value = loader()
+        if value is not None:
+            try:
+                self.backend.set(key, value, ttl or self.default_ttl)
+            except Exception:
+                logger.exception(f"Failed to write '{key}' to the cache")
+        return value
+
+    def delete(self, *keys: str):
+        try:
+            self.backend.delete(*keys)
+        except Exception:
+            logger.exception(f"Failed to invalidate {keys} in the cache")
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counts of this process, per key namespace"""
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "namespaces": {
+                namespace: {
+                    "hits": self.hits[namespace],
+                    "misses": self.misses[namespace],
+                }
+                for namespace in namespaces
+            },
+        }
+
+
+def snapshot(entity) -> Optional[Dict[str, Any]]:
+    """The column values of an ORM entity, safe to cache and share"""
+    if entity is None:
+        return None
+    # Deferred columns would be loaded one query at a time
+    return {
+        attribute.key: getattr(entity, attribute.key)
+        for attribute in inspect(entity).mapper.column_attrs
+        if not attribute.deferred
+    }
+
+
+def rehydrate(model: Type, values: Optional[Dict[str, Any]]):
+    """
+    Turn a cached snapshot back into a detached copy of its entity, without
+    querying. The copy stays out of the session, so whatever the session holds
+    for the same row is left untouched, and its relationships don't load.
+    """
+    if values is None:
+        return None
+    entity = model(**values)
+    make_transient_to_detached(entity)
+    return entity
+
+
+def rehydrate_all(model: Type, values: List[Dict[str, Any]]) -> List:
+    return [rehydrate(model, item) for item in values]
@@ -0,0 +1,55 @@
+import gzip
+import brotli
+from flask import request
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+}
+
+
+def init_compression(app):
+    """
+    Compress responses above COMPRESS_MIN_SIZE bytes with br or gzip,
+    whichever the client accepts with the higher preference
+    """
+
+    @app.after_request
+    def compress_response(response):
+        min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+        if (
+            min_size < 0
+            or not 200 <= response.status_code < 300
+            or response.status_code == 204
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        encoding = negotiate_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        level = app.config.get("COMPRESS_LEVEL", 6)
+        if encoding == "br":
+            data = brotli.compress(data, quality=min(level, 11))
+        else:
+            data = gzip.compress(data, compresslevel=min(level, 9), mtime=0)
+
+        response.set_data(data)
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+
+
+def negotiate_encoding(accept_encodings):
+    return accept_encodings.best_match(["br", "gzip"])
@@ -0,0 +1,69 @@
+from collections import Counter
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Hashable
+import atexit
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """
+    In-process counter that aggregates increments per key and hands the deltas
+    to `flush` every `interval_ms` from a background thread.
+    Deltas of a failed flush are merged back and retried on the next one.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Dict[Hashable, int]], None],
+        interval_ms: int,
+        name: str = "counter-buffer",
+    ):
+        self._flush = flush
+        self.interval = interval_ms / 1000
+        self.name = name
+        self._counts: Counter = Counter()
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._stopped = Event()
+        self._thread = None
+
+    def add(self, key: Hashable, count: int = 1):
+        with self._lock:
+            self._counts[key] += count
+            if self._thread is None:
+                self._start()
+
+    def flush(self):
+        """Hand the buffered deltas to the flush function now"""
+        # Serialize flushes so retried deltas are never applied twice at once
+        with self._flush_lock:
+            with self._lock:
+                counts, self._counts = self._counts, Counter()
+            if not counts:
+                return
+            try:
+                self._flush(dict(counts))
+            except Exception:
+                logger.exception(
+                    f"Failed to flush {sum(counts.values())} buffered counts of {self.name}"
+                )
+                with self._lock:
+                    self._counts.update(counts)
+
+    def stop(self):
+        """Stop the flush thread and flush what is left"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _start(self):
+        self._thread = Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
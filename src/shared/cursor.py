@@ -0,0 +1,23 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Tuple
+from werkzeug.exceptions import BadRequest
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """Encode the keyset position of a row into an opaque cursor"""
+    payload = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor created by `encode_cursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise BadRequest("Invalid cursor")
@@ -0,0 +1,35 @@
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+import orjson
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding with orjson. orjson serializes UUIDs, dates and
+    datetimes natively, as the same ISO 8601 strings the schemas produce.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Pretty printed debug responses keep going through the stdlib json
+        if not self.compact and self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self._orjson_dumps(obj) + b"\n", mimetype=self.mimetype
+        )
+
+    def _orjson_dumps(self, obj: Any) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
@@ -0,0 +1,130 @@
+from collections import Counter
+import logging
+import re
+import time
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+PARAMETER = re.compile(r"%\(\w+\)s|%s|\?|\$\d+|(?<!:):\w+")
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+WHITESPACE = re.compile(r"\s+")
+
+
+class QueryProfile:
+    """The queries run while handling a request"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int):
+        """Statements run at least `threshold` times, the usual sign of an N+1"""
+        return [
+            (statement, count)
+            for statement, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+def fingerprint(statement: str) -> str:
+    """A statement with its parameters and literals replaced by ?"""
+    statement = STRING.sub("?", statement)
+    statement = PARAMETER.sub("?", statement)
+    statement = NUMBER.sub("?", statement)
+    statement = PARAMETER_LIST.sub("?", statement)
+    return WHITESPACE.sub(" ", statement).strip()
+
+
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    _record_query(conn, statement)
+
+
+def _fail_query(context):
+    # after_cursor_execute doesn't run for a query that raises
+    if context.connection is not None:
+        _record_query(context.connection, context.statement)
+
+
+def _record_query(conn, statement):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    profile = g.get("query_profile") if has_app_context() else None
+    if profile is not None:
+        profile.record(statement or "", duration)
+
+
+QUERY_LISTENERS = {
+    "before_cursor_execute": _start_query,
+    "after_cursor_execute": _end_query,
+    "handle_error": _fail_query,
+}
+
+
+def init_query_profiler(app):
+    """
+    When QUERY_PROFILER is on, count the queries of each request with their time
+    and report them in the X-Query-Count and Server-Timing headers. A warning is
+    logged when a request runs more than QUERY_BUDGET queries, or the same
+    statement at least QUERY_REPEAT_THRESHOLD times.
+    Queries of streamed response bodies run after the headers are sent and are
+    not counted.
+    """
+    if not app.config.get("QUERY_PROFILER"):
+        return
+
+    budget = app.config.get("QUERY_BUDGET", 30)
+    repeat_threshold = app.config.get("QUERY_REPEAT_THRESHOLD", 5)
+
+    # Listening on the Engine class covers the primary and the read replicas
+    for identifier, listener in QUERY_LISTENERS.items():
+        if not event.contains(Engine, identifier, listener):
+            event.listen(Engine, identifier, listener)
+
+    @app.before_request
+    def start_profile():
+        g.query_profile = QueryProfile()
+
+    @app.after_request
+    def report_profile(response):
+        profile = g.pop("query_profile", None)
+        if profile is None:
+            return response
+
+        total = (time.perf_counter() - profile.started_at) * 1000
+        response.headers["X-Query-Count"] = str(profile.count)
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={profile.duration * 1000:.1f};desc="{profile.count} queries"',
+        )
+        response.headers.add("Server-Timing", f"app;dur={total:.1f}")
+
+        endpoint = f"{request.method} {request.path}"
+        if budget and profile.count > budget:
+            logger.warning(
+                f"{endpoint} ran {profile.count} queries, over the budget of {budget}, "
+                f"in {profile.duration * 1000:.1f}ms"
+            )
+        for statement, count in profile.repeated(repeat_threshold):
+            logger.warning(
+                f"{endpoint} ran the same statement {count} times, possible N+1: "
+                f"{statement[:300]}"
+            )
+        return response
@@ -0,0 +1,152 @@
+from threading import Event, Thread
+from typing import Optional
+from zlib import crc32
+import logging
+import os
+import click
+from apscheduler.schedulers.base import BaseScheduler
+from sqlalchemy import Connection, create_engine, text
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key shared by every process of the app
+LEADER_LOCK_ID = crc32(b"levo-survey:scheduler")
+
+
+class SchedulerLeader:
+    """
+    Lets a single process execute the jobs of the shared jobstore.
+
+    Schedulers start paused and their processes compete for a Postgres session
+    advisory lock every `interval` seconds. The holder resumes its scheduler and
+    keeps checking its lock connection, pausing again as soon as it is lost.
+    It also wakes its scheduler every interval, to pick up the jobs other
+    processes added to the jobstore.
+    The lock goes away with the connection, so a crashed leader is replaced
+    within an interval. Databases without advisory locks always lead.
+    """
+
+    def __init__(
+        self,
+        scheduler: BaseScheduler,
+        database_uri: str,
+        interval: float = 10,
+        lock_id: int = LEADER_LOCK_ID,
+    ):
+        self.scheduler = scheduler
+        self.engine = create_engine(database_uri, poolclass=NullPool)
+        self.interval = interval
+        self.lock_id = lock_id
+        self.is_leader = False
+        self._connection: Optional[Connection] = None
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self):
+        """Run the election on a background thread"""
+        self._thread = Thread(target=self.run, name="scheduler-leader", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """Run the election until stopped"""
+        try:
+            while not self._stopped.is_set():
+                self.elect()
+                self._stopped.wait(self.interval)
+        finally:
+            self._resign()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def elect(self):
+        """Try to become the leader, or check that this process still is"""
+        try:
+            if self.is_leader:
+                if self._connection is not None:
+                    self._connection.execute(text("SELECT 1"))
+                # Jobs added by other processes don't wake this scheduler
+                self.scheduler.wakeup()
+            else:
+                self._try_lock()
+        except Exception:
+            logger.exception("Lost the scheduler leader lock")
+            self._resign()
+
+    def _try_lock(self):
+        if self.engine.dialect.name != "postgresql":
+            self._lead()
+            return
+
+        # Autocommit, a session holding the lock must not sit idle in a transaction
+        connection = self.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:lock_id)"), {"lock_id": self.lock_id}
+            ).scalar()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return
+        self._connection = connection
+        self._lead()
+
+    def _lead(self):
+        self.is_leader = True
+        self.scheduler.resume()
+        logger.info("Became the scheduler leader, executing jobs")
+
+    def _resign(self):
+        if self.is_leader:
+            self.is_leader = False
+            self.scheduler.pause()
+            logger.info("Resigned as the scheduler leader, jobs are paused")
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+
+def is_serving() -> bool:
+    """
+    Whether this process serves the app, from a WSGI server or `flask run`,
+    rather than running another Flask CLI command like `flask db upgrade`.
+    """
+    if not os.environ.get("FLASK_RUN_FROM_CLI"):
+        return True
+    # The app is loaded from the context of `flask run` itself, but from the
+    # context of the `flask` group for commands of the app
+    ctx = click.get_current_context(silent=True)
+    return (
+        ctx is not None
+        and ctx.info_name == "run"
+        and ctx.parent is not None
+        and ctx.parent.parent is None
+    )
+
+
+def init_scheduler(app, scheduler: BaseScheduler):
+    """
+    Start the scheduler of a process according to SCHEDULER_MODE.
+    It always starts paused, so jobs can be added without executing them.
+    Only server processes run for the leadership, CLI commands never execute
+    jobs, and `flask scheduler run` runs its own election.
+    """
+    scheduler.start(paused=True)
+    if app.config["SCHEDULER_MODE"] == "leader" and is_serving():
+        leader = SchedulerLeader(
+            scheduler,
+            app.config["SQLALCHEMY_DATABASE_URI"],
+            app.config["SCHEDULER_LEADER_INTERVAL"],
+        )
+        leader.start()
+        app.extensions["scheduler_leader"] = leader
@@ -1,12 +1,19 @@
 from marshmallow import Schema, fields, validate
+from src.shared.fast_schema import FastDumpSchema
 
 
 class PaginationRequestSchema(Schema):
     page = fields.Integer(load_default=1, validate=validate.Range(min=1))
     per_page = fields.Integer(load_default=10, validate=validate.Range(min=1, max=200))
+    # Cursor mode pages by (created_at, id) and ignores `page`
+    mode = fields.String(
+        load_default="offset", validate=validate.OneOf(["offset", "cursor"])
+    )
+    cursor = fields.String()
+    include_total = fields.Boolean(load_default=False)
 
 
-class PaginationResponseSchema(Schema):
+class PaginationResponseSchema(FastDumpSchema):
     # items= pagination.items
     total = fields.Integer()
     pages = fields.Integer()
@@ -14,3 +21,4 @@ class PaginationResponseSchema(Schema):
     per_page = fields.Integer()
     has_next = fields.Boolean()
     has_prev = fields.Boolean()
+    next_cursor = fields.String(allow_none=True)
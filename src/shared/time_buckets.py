@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import List
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+GRANULARITIES = ("hour", "day", "week")
+
+BUCKET_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+BUCKET_LABEL_FORMATS = {
+    "hour": "%Y-%m-%dT%H:00",
+    "day": "%Y-%m-%d",
+    "week": "%Y-%m-%d",
+}
+
+
+def get_zone(name: str) -> tzinfo:
+    """Resolve an IANA timezone name, raising ValueError if it is unknown"""
+    if name == "UTC":
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{name}'")
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    """Truncate a naive datetime the same way postgres date_trunc does"""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "hour":
+        return moment
+    moment = moment.replace(hour=0)
+    if granularity == "week":
+        moment -= timedelta(days=moment.weekday())
+    return moment
+
+
+def bucket_starts(start: datetime, end: datetime, granularity: str) -> List[datetime]:
+    """All bucket starts covering the naive local range [start, end)"""
+    step = BUCKET_STEPS[granularity]
+    bucket = truncate(start, granularity)
+    buckets = []
+    while bucket < end:
+        buckets.append(bucket)
+        bucket += step
+    return buckets
+
+
+def bucket_label(bucket: datetime, granularity: str) -> str:
+    return bucket.strftime(BUCKET_LABEL_FORMATS[granularity])
+
+
+def to_utc_naive(moment: datetime, zone: tzinfo) -> datetime:
+    """Convert a datetime to naive UTC; naive input is read in the given zone"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=zone)
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local_naive(moment: datetime, zone: tzinfo) -> datetime:
+    """Convert a naive UTC datetime to naive local time of the given zone"""
+    return moment.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+import factory
+from factory.alchemy import SQLAlchemyModelFactory
+from src.database.db import db
+from src.database.models.survey_model import Survey, SurveyType
+from src.database.models.question_model import Question
+from src.database.models.response_model import Response, ResponseSource
+from src.database.models.answer_model import Answer
+from src.database.models.distribution_model import (
+    Distribution,
+    DistributionMethod,
+    DistributionStatus,
+)
+
+
+class BaseFactory(SQLAlchemyModelFactory):
+    """Factory adding its objects to the current session, flushed but not committed"""
+
+    class Meta:
+        abstract = True
+        sqlalchemy_session_factory = lambda: db.session
+        sqlalchemy_session_persistence = "flush"
+
+
+class SurveyFactory(BaseFactory):
+    class Meta:
+        model = Survey
+
+    title = factory.Sequence(lambda n: f"Customer satisfaction survey {n}")
+    description = "How satisfied are you with our product and support?"
+    is_draft = False
+    type = SurveyType.INTERNAL
+
+
+class QuestionFactory(BaseFactory):
+    class Meta:
+        model = Question
+
+    survey_id = factory.SelfAttribute("survey.id")
+    text = factory.Sequence(lambda n: f"Question {n}")
+    order = factory.Sequence(lambda n: n)
+    required = False
+
+    class Params:
+        survey = factory.SubFactory(SurveyFactory)
+
+
+class DistributionFactory(BaseFactory):
+    class Meta:
+        model = Distribution
+
+    survey_id = factory.SelfAttribute("survey.id")
+    method = DistributionMethod.EMAIL
+    recipient_email = factory.Sequence(lambda n: f"recipient{n}@example.com")
+    subject = "We would love your feedback"
+    message = "It only takes a minute."
+    status = DistributionStatus.SENT
+    sent_at = factory.LazyFunction(datetime.utcnow)
+
+    class Params:
+        survey = factory.SubFactory(SurveyFactory)
+
+
+class ResponseFactory(BaseFactory):
+    class Meta:
+        model = Response
+
+    survey_id = factory.SelfAttribute("survey.id")
+    respondent_name = factory.Sequence(lambda n: f"Respondent {n}")
+    respondent_email = factory.Sequence(lambda n: f"respondent{n}@example.com")
+    source = ResponseSource.INTERNAL
+    created_at = factory.Sequence(lambda n: datetime.utcnow() - timedelta(hours=n))
+
+    class Params:
+        survey = factory.SubFactory(SurveyFactory)
+
+
+class AnswerFactory(BaseFactory):
+    class Meta:
+        model = Answer
+
+    response_id = factory.SelfAttribute("response.id")
+    question_id = factory.SelfAttribute("question.id")
+    rating = factory.Sequence(lambda n: n % 10 + 1)
+
+    class Params:
+        response = factory.SubFactory(ResponseFactory)
+        question = factory.SubFactory(QuestionFactory)
@@ -0,0 +1,137 @@
+import ssl
+import aiosmtplib
+import pytest
+from src.config.mail_config import MailConfig
+from src.database.db import db
+from tests.factories import SurveyFactory, DistributionFactory
+from src.database.models.distribution_model import Distribution, DistributionStatus
+from src.domain.distribution.distribution_service import DistributionService
+from src.services.async_mail_transport import AsyncMailTransport
+from src.services.mail_service import MailService
+
+MESSAGES = 500
+POOL_SIZE = 8
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(MailConfig, "MAIL_POOL_SIZE", POOL_SIZE)
+    transport = AsyncMailTransport.from_config()
+    yield transport
+    transport.close()
+
+
+@pytest.fixture
+def mail_service(transport):
+    mail_service = MailService()
+    mail_service.transport = transport
+    return mail_service
+
+
+def build_emails(count):
+    return [
+        {
+            "to_emails": [f"recipient{index}@example.com"],
+            "subject": f"Survey {index}",
+            "body": "Tell us what you think",
+            "html_body": "<p>Tell us what you think</p>",
+        }
+        for index in range(count)
+    ]
+
+
+def test_load_is_sent_over_the_pool(mail_service, transport, smtp_server):
+    emails = build_emails(MESSAGES)
+    refused = {f"recipient{index}@example.com" for index in range(0, MESSAGES, 10)}
+    smtp_server.refused.update(refused)
+
+    errors = mail_service.send_bulk(emails)
+
+    assert len(errors) == MESSAGES
+    failed = {email["to_emails"][0] for email, error in zip(emails, errors) if error}
+    assert failed == refused
+    assert all(
+        isinstance(errors[index], aiosmtplib.SMTPRecipientsRefused)
+        for index in range(0, MESSAGES, 10)
+    )
+    assert smtp_server.attempts == {email["to_emails"][0]: 1 for email in emails}
+    assert (
+        set(smtp_server.recipients)
+        == {email["to_emails"][0] for email in emails} - refused
+    )
+    assert max(smtp_server.recipients.values()) == 1
+    assert len(smtp_server.connections) <= POOL_SIZE
+
+    # The pooled connections are reused by the next batch
+    connections = set(smtp_server.connections)
+    smtp_server.refused.clear()
+    assert not any(mail_service.send_bulk(build_emails(POOL_SIZE)))
+    assert smtp_server.connections <= connections
+
+
+def test_any_error_only_fails_its_own_message(mail_service, smtp_server, monkeypatch):
+    send_message = aiosmtplib.SMTP.send_message
+
+    async def fail_one(self, message, *args, **kwargs):
+        if message["To"] == "recipient3@example.com":
+            raise ssl.SSLError("handshake failed")
+        if message["To"] == "recipient5@example.com":
+            raise ConnectionResetError("reset by peer")
+        return await send_message(self, message, *args, **kwargs)
+
+    monkeypatch.setattr(aiosmtplib.SMTP, "send_message", fail_one)
+
+    errors = mail_service.send_bulk(build_emails(20))
+
+    assert isinstance(errors[3], ssl.SSLError)
+    assert isinstance(errors[5], ConnectionResetError)
+    assert [index for index, error in enumerate(errors) if error] == [3, 5]
+    assert len(smtp_server.recipients) == 18
+
+
+def test_unreachable_server_fails_every_message(mail_service):
+    # No smtp_server fixture, nothing listens on MAIL_PORT
+    errors = mail_service.send_bulk(build_emails(3))
+
+    assert len(errors) == 3
+    assert all(isinstance(error, Exception) for error in errors)
+
+
+def test_send_email_raises_its_error(mail_service, smtp_server):
+    smtp_server.refused.add("nobody@example.com")
+
+    mail_service.send_email(["somebody@example.com"], "Hi", "Body")
+    with pytest.raises(aiosmtplib.SMTPRecipientsRefused):
+        mail_service.send_email(["nobody@example.com"], "Hi", "Body")
+
+    assert smtp_server.recipients == {"somebody@example.com": 1}
+
+
+def test_campaign_sends_through_the_pool(app, transport, smtp_server, monkeypatch):
+    monkeypatch.setattr(MailConfig, "MAIL_BATCH_SIZE", 25)
+    distribution_service = app.extensions["injector"].get(DistributionService)
+    monkeypatch.setattr(distribution_service.mail_service, "transport", transport)
+    survey = SurveyFactory()
+    distributions = DistributionFactory.create_batch(
+        100, survey=survey, status=DistributionStatus.PENDING, sent_at=None
+    )
+    db.session.commit()
+    refused = {d.recipient_email for d in distributions[::5]}
+    smtp_server.refused.update(refused)
+
+    summary = distribution_service.send_campaign(str(survey.id))
+
+    assert (summary["sent"], summary["failed"]) == (80, 20)
+    assert smtp_server.attempts == {d.recipient_email: 1 for d in distributions}
+    db.session.expire_all()
+    assert {
+        d.recipient_email: d.status
+        for d in Distribution.query.filter_by(survey_id=survey.id)
+    } == {
+        d.recipient_email: (
+            DistributionStatus.FAILED
+            if d.recipient_email in refused
+            else DistributionStatus.SENT
+        )
+        for d in distributions
+    }
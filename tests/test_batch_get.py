@@ -0,0 +1,157 @@
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+import pytest
+from src.database.db import db
+from tests.factories import (
+    AnswerFactory,
+    DistributionFactory,
+    QuestionFactory,
+    ResponseFactory,
+    SurveyFactory,
+)
+from src.database.models.distribution_model import DistributionStatus
+
+URL = "/api/v1/responses/answers:batchGet"
+CREATED_AT = datetime(2026, 3, 2, 9, 30)
+
+
+@pytest.fixture
+def responses():
+    survey = SurveyFactory()
+    comment, score, day = [
+        QuestionFactory(survey=survey, text=text)
+        for text in ("Comment", "Score", "Day")
+    ]
+    distribution = DistributionFactory(
+        survey=survey,
+        recipient_email="ada@example.com",
+        status=DistributionStatus.OPENED,
+        sent_at=CREATED_AT - timedelta(days=1),
+    )
+    answered = ResponseFactory(
+        survey=survey,
+        respondent_name="Ada",
+        respondent_email="ada@example.com",
+        distribution_id=distribution.id,
+        created_at=CREATED_AT,
+    )
+    # Answers are listed in the order they were given
+    AnswerFactory(
+        response=answered,
+        question=score,
+        rating=8,
+        created_at=CREATED_AT + timedelta(seconds=1),
+    )
+    AnswerFactory(
+        response=answered,
+        question=comment,
+        rating=None,
+        value="Great",
+        created_at=CREATED_AT + timedelta(seconds=2),
+    )
+    AnswerFactory(
+        response=answered,
+        question=day,
+        rating=None,
+        date_value=date(2026, 3, 1),
+        created_at=CREATED_AT + timedelta(seconds=3),
+    )
+    unanswered = ResponseFactory(survey=survey, respondent_name="Bob")
+    other = ResponseFactory(respondent_name="Cy")
+    AnswerFactory(response=other, values=["Email"], rating=None)
+    db.session.commit()
+    return {
+        "answered": answered,
+        "unanswered": unanswered,
+        "other": other,
+        "distribution": distribution,
+        "questions": (comment, score, day),
+    }
+
+
+def batch_get(client, response_ids):
+    response = client.post(URL, json={"response_ids": response_ids})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_details_of_a_response(client, responses):
+    answered, distribution = responses["answered"], responses["distribution"]
+    comment, score, day = responses["questions"]
+
+    (detail,) = batch_get(client, [str(answered.id)])["responses"]
+
+    assert detail["response_id"] == str(answered.id)
+    assert detail["respondent_name"] == "Ada"
+    assert detail["respondent_email"] == "ada@example.com"
+    assert detail["created_at"] == CREATED_AT.isoformat()
+    assert detail["distribution"] == {
+        "id": str(distribution.id),
+        "recipient_method": "email",
+        "recipient_email": "ada@example.com",
+        "status": "opened",
+        "scheduled_at": None,
+        "sent_at": (CREATED_AT - timedelta(days=1)).isoformat(),
+    }
+    assert [
+        (
+            answer["question_id"],
+            answer["question_text"],
+            answer["value"],
+            answer["rating"],
+            answer["date_value"],
+        )
+        for answer in detail["answers"]
+    ] == [
+        (str(score.id), "Score", None, 8, None),
+        (str(comment.id), "Comment", "Great", None, None),
+        (str(day.id), "Day", None, None, "2026-03-01"),
+    ]
+
+
+def test_responses_are_returned_in_request_order_with_missing_ids(client, responses):
+    answered, unanswered, other = (
+        str(responses[name].id) for name in ("answered", "unanswered", "other")
+    )
+    missing = str(uuid4())
+
+    body = batch_get(
+        client, [other, missing, answered.upper(), unanswered, answered, missing]
+    )
+
+    assert [detail["response_id"] for detail in body["responses"]] == [
+        other,
+        answered,
+        unanswered,
+    ]
+    assert body["missing"] == [missing]
+    assert body["responses"][2]["answers"] == []
+    assert body["responses"][2]["distribution"] is None
+    assert body["responses"][0]["answers"][0]["values"] == ["Email"]
+
+
+def test_batch_details_match_the_single_response_endpoint(client, responses):
+    response_id = str(responses["answered"].id)
+
+    single = client.get(f"/api/v1/responses/{response_id}/answers")
+
+    assert single.status_code == 200
+    assert batch_get(client, [response_id])["responses"] == [single.json]
+
+
+def test_only_missing_ids(client, responses):
+    missing = [str(uuid4()), str(uuid4())]
+
+    assert batch_get(client, missing) == {"responses": [], "missing": missing}
+    assert client.get(f"/api/v1/responses/{missing[0]}/answers").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "response_ids",
+    [[], ["not-a-uuid"], [str(uuid4()) for _ in range(501)]],
+    ids=["empty", "invalid", "too-many"],
+)
+def test_invalid_requests_are_rejected(client, response_ids):
+    response = client.post(URL, json={"response_ids": response_ids})
+
+    assert response.status_code == 422
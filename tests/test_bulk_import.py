@@ -0,0 +1,186 @@
+import csv
+import io
+import json
+from datetime import date
+import pytest
+from src.database.db import db
+from tests.factories import (
+    SurveyFactory,
+    QuestionFactory,
+    ResponseFactory,
+    AnswerFactory,
+)
+from src.database.models.answer_model import Answer
+from src.database.models.response_model import Response
+from src.domain.response.response_service import ResponseService
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+
+@pytest.fixture
+def survey():
+    survey = SurveyFactory()
+    text, rating, choices, _ = QuestionFactory.create_batch(4, survey=survey)
+    response = ResponseFactory(survey=survey)
+    AnswerFactory(response=response, question=text, rating=None, value="Fast")
+    AnswerFactory(response=response, question=rating, rating=7)
+    AnswerFactory(response=response, question=choices, rating=None, values=["a"])
+    db.session.commit()
+    SurveyStatsRepository().rebuild(str(survey.id))
+    return survey
+
+
+@pytest.fixture
+def questions(survey):
+    text, rating, choices, unanswered = sorted(
+        survey.questions, key=lambda question: question.order
+    )
+    return {"text": text, "rating": rating, "choices": choices, "new": unanswered}
+
+
+def import_url(survey, format):
+    return f"/api/v1/responses/survey/{survey.id}/bulk-import?format={format}"
+
+
+def import_csv(client, survey, header, rows):
+    body = io.StringIO()
+    writer = csv.writer(body)
+    writer.writerow(["external_response_id", *header])
+    writer.writerows(rows)
+    response = client.post(
+        import_url(survey, "csv"), data=body.getvalue(), content_type="text/csv"
+    )
+    assert response.status_code == 200
+    return response.json
+
+
+def import_ndjson(client, survey, records):
+    response = client.post(
+        import_url(survey, "ndjson"),
+        data="\n".join(json.dumps(record) for record in records),
+        content_type="application/x-ndjson",
+    )
+    assert response.status_code == 200
+    return response.json
+
+
+def imported_answers(question):
+    db.session.expire_all()
+    return {
+        answer.response.external_response_id: answer
+        for answer in Answer.query.filter_by(question_id=question.id)
+        if answer.response.external_response_id
+    }
+
+
+def test_csv_cells_are_parsed_by_the_kind_of_their_question(client, survey, questions):
+    header = [question.text for question in questions.values()]
+    report = import_csv(
+        client,
+        survey,
+        header,
+        [
+            ["1", "3", "4", "a; b", "2024-01-31"],
+            ["2", "a; b", "10", "c", "2024-02-01"],
+        ],
+    )
+
+    assert report["imported"] == 2
+    assert report["answers"] == 8
+    text = imported_answers(questions["text"])
+    assert (text["1"].value, text["2"].value) == ("3", "a; b")
+    assert text["1"].rating is None and text["2"].values is None
+    rating = imported_answers(questions["rating"])
+    assert (rating["1"].rating, rating["2"].rating) == (4, 10)
+    choices = imported_answers(questions["choices"])
+    assert (choices["1"].values, choices["2"].values) == (["a", "b"], ["c"])
+    dates = imported_answers(questions["new"])
+    assert dates["1"].date_value == date(2024, 1, 31)
+
+
+def test_unanswered_questions_are_text_unless_every_value_fits_a_kind(
+    client, survey, questions
+):
+    report = import_csv(
+        client,
+        survey,
+        [questions["new"].text],
+        [["1", "3"], ["2", "Very good"], ["3", "2024-01-31"]],
+    )
+
+    assert report["imported"] == 3
+    answers = imported_answers(questions["new"])
+    assert [answers[id].value for id in ("1", "2", "3")] == [
+        "3",
+        "Very good",
+        "2024-01-31",
+    ]
+
+
+def test_invalid_rows_are_reported_without_importing_them(client, survey, questions):
+    rating_id = str(questions["rating"].id)
+    report = import_ndjson(
+        client,
+        survey,
+        [
+            {"external_response_id": "1", "answers": {rating_id: 5}},
+            {"external_response_id": "2", "answers": {rating_id: 11}},
+            {"external_response_id": "3", "answers": {rating_id: "Great"}},
+            {"external_response_id": "4", "answers": {rating_id: {"rating": 50}}},
+            {"external_response_id": "5", "answers": {rating_id: {"unknown": 1}}},
+            {"external_response_id": "6", "respondent_name": "x" * 256},
+            {"external_response_id": "7", "answers": {rating_id: {"rating": 2}}},
+        ],
+    )
+
+    assert report["imported"] == 2
+    assert report["invalid"] == 5
+    assert [error["line"] for error in report["errors"]] == [2, 3, 4, 5, 6]
+    assert {
+        id: answer.rating
+        for id, answer in imported_answers(questions["rating"]).items()
+    } == {"1": 5, "7": 2}
+
+
+def test_reimporting_skips_duplicates(client, survey, questions):
+    records = [
+        {"external_response_id": str(id), "answers": {str(questions["text"].id): "Ok"}}
+        for id in range(5)
+    ]
+    import_ndjson(client, survey, records)
+
+    report = import_ndjson(client, survey, records + records[:1])
+
+    assert report["imported"] == 0
+    assert report["duplicates"] == 6
+    counters = SurveyStatsRepository().get_counters(str(survey.id))
+    assert counters["external_responses"] == 5
+    assert counters["total_answers"] == 8
+
+
+def test_a_failed_import_writes_nothing(app, survey, questions, monkeypatch):
+    response_service = app.extensions["injector"].get(ResponseService)
+    bulk_import = response_service.response_repository.bulk_import
+    batches = []
+
+    def fail_on_second_batch(*args, **kwargs):
+        batches.append(args)
+        if len(batches) == 2:
+            raise RuntimeError("connection lost")
+        return bulk_import(*args, **kwargs)
+
+    monkeypatch.setattr(
+        response_service.response_repository, "bulk_import", fail_on_second_batch
+    )
+    body = "\n".join(
+        json.dumps({"external_response_id": str(id)}) for id in range(3)
+    ).encode()
+
+    with pytest.raises(RuntimeError):
+        response_service.bulk_import_responses(
+            str(survey.id), io.BytesIO(body), "ndjson", batch_size=1
+        )
+
+    db.session.expire_all()
+    assert Response.query.filter_by(survey_id=survey.id).count() == 1
+    counters = SurveyStatsRepository().get_counters(str(survey.id))
+    assert counters["total_responses"] == 1
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app import cache, scheduler
+from src.database.db import db
+from tests.factories import SurveyFactory, QuestionFactory
+from src.database.models.survey_model import Survey
+from src.domain.survey.survey_repository import SurveyRepository
+
+
+@pytest.fixture
+def survey():
+    survey = SurveyFactory(is_draft=True)
+    QuestionFactory.create_batch(2, survey=survey)
+    db.session.commit()
+    return survey
+
+
+def write_from_another_process(survey, **values):
+    """Update a survey without invalidating this process's cache, like another worker"""
+    db.session.execute(update(Survey).where(Survey.id == survey.id).values(**values))
+    db.session.commit()
+
+
+def test_survey_reads_are_served_from_the_cache(client, survey):
+    url = f"/api/v1/surveys/{survey.id}"
+
+    first = client.get(url).json
+    second = client.get(url).json
+
+    assert first == second
+    assert second["question_count"] == 2
+    assert cache.hits["survey"] == 1
+    assert cache.misses["survey"] == 1
+
+
+def test_question_writes_invalidate_the_cached_list(client, survey):
+    url = f"/api/v1/questions/by-survey/{survey.id}"
+    assert len(client.get(url).json) == 2
+
+    response = client.post(
+        "/api/v1/questions/",
+        json={"survey_id": str(survey.id), "text": "Anything else?", "order": 3},
+    )
+    assert response.status_code == 200
+
+    texts = [question["text"] for question in client.get(url).json]
+    assert len(texts) == 3
+    assert "Anything else?" in texts
+
+
+def test_cached_copies_leave_the_session_alone(survey):
+    repository = SurveyRepository()
+    repository.get_cached(str(survey.id))
+
+    survey.title = "Edited, not flushed yet"
+    cached = repository.get_cached(str(survey.id))
+
+    assert cached is not survey
+    assert cached not in db.session
+    assert survey.title == "Edited, not flushed yet"
+    assert cached.title != survey.title
+
+
+def test_writes_are_decided_on_the_database_not_the_cache(client, survey):
+    # This process caches the draft, then another one publishes the survey
+    assert client.get(f"/api/v1/surveys/{survey.id}").json["is_draft"] is True
+    write_from_another_process(survey, is_draft=False)
+
+    scheduled_at = (datetime.utcnow() + timedelta(days=365)).replace(microsecond=0)
+    response = client.post(
+        "/api/v1/distribution/bulk-distribution",
+        json={
+            "survey_id": str(survey.id),
+            "recipient_emails": ["someone@example.com"],
+            "method": "EMAIL",
+            "subject": "Feedback",
+            "message": "Tell us",
+            "scheduled_at": scheduled_at.isoformat(),
+        },
+    )
+
+    assert response.status_code == 200
+    assert scheduler.get_job(f"campaign:{survey.id}:{scheduled_at.isoformat()}")
+
+
+def test_bodies_match_the_etag_after_another_process_writes(client, survey):
+    url = f"/api/v1/surveys/{survey.id}"
+    first = client.get(url)
+    write_from_another_process(survey, title="Renamed elsewhere")
+
+    second = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.json["title"] == "Renamed elsewhere"
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert (
+        client.get(url, headers={"If-None-Match": second.headers["ETag"]}).status_code
+        == 304
+    )
+
+
+def test_question_lists_match_the_etag_after_another_process_writes(client, survey):
+    url = f"/api/v1/questions/by-survey/{survey.id}"
+    first = client.get(url)
+    # Factories write without going through the repository, like another worker
+    QuestionFactory(survey=survey, text="Added elsewhere")
+    db.session.commit()
+
+    second = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert "Added elsewhere" in [question["text"] for question in second.json]
@@ -0,0 +1,112 @@
+from threading import Thread
+import pytest
+from src.config.mail_config import MailConfig
+from src.database.db import db
+from tests.factories import SurveyFactory, DistributionFactory
+from src.database.models.distribution_model import Distribution, DistributionStatus
+from src.domain.distribution.distribution_repository import DistributionRepository
+from src.domain.distribution.distribution_service import DistributionService
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+
+@pytest.fixture
+def distribution_service(app):
+    return app.extensions["injector"].get(DistributionService)
+
+
+@pytest.fixture
+def campaign(monkeypatch):
+    monkeypatch.setattr(MailConfig, "MAIL_BATCH_SIZE", 5)
+    survey = SurveyFactory()
+    distributions = DistributionFactory.create_batch(
+        40, survey=survey, status=DistributionStatus.PENDING, sent_at=None
+    )
+    db.session.commit()
+    SurveyStatsRepository().rebuild(str(survey.id))
+    return survey, distributions
+
+
+def statuses(survey):
+    db.session.expire_all()
+    return {
+        distribution.recipient_email: distribution.status
+        for distribution in Distribution.query.filter_by(survey_id=survey.id)
+    }
+
+
+def send_concurrently(distribution_service, survey_id, senders=4):
+    summaries = []
+    threads = [
+        Thread(
+            target=lambda: summaries.append(
+                distribution_service.send_campaign(survey_id)
+            )
+        )
+        for _ in range(senders)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summaries
+
+
+def test_campaign_sends_every_pending_distribution(
+    distribution_service, campaign, smtp_server
+):
+    survey, distributions = campaign
+
+    summary = distribution_service.send_campaign(str(survey.id))
+
+    assert summary["sent"] == 40
+    assert summary["failed"] == 0
+    assert smtp_server.recipients == {d.recipient_email: 1 for d in distributions}
+    assert set(statuses(survey).values()) == {DistributionStatus.SENT}
+
+
+def test_concurrent_campaign_jobs_send_each_email_once(
+    distribution_service, campaign, smtp_server
+):
+    survey, distributions = campaign
+    refused = {d.recipient_email for d in distributions[::4]}
+    smtp_server.refused.update(refused)
+
+    summaries = send_concurrently(distribution_service, str(survey.id))
+
+    assert sum(summary["sent"] for summary in summaries) == 30
+    assert sum(summary["failed"] for summary in summaries) == 10
+    # Refused recipients are only attempted once too, their rows stay claimed
+    # until the failures are recorded
+    assert smtp_server.attempts == {d.recipient_email: 1 for d in distributions}
+    assert smtp_server.recipients == {
+        d.recipient_email: 1 for d in distributions if d.recipient_email not in refused
+    }
+    assert statuses(survey) == {
+        d.recipient_email: (
+            DistributionStatus.FAILED
+            if d.recipient_email in refused
+            else DistributionStatus.SENT
+        )
+        for d in distributions
+    }
+
+    counters = SurveyStatsRepository().get_counters(str(survey.id))
+    assert counters["pending_distributions"] == 0
+    assert counters["sent_distributions"] == 30
+    assert counters["failed_distributions"] == 10
+
+
+def test_claimed_distributions_are_skipped_by_other_claims(app, campaign):
+    survey, _ = campaign
+    repository = DistributionRepository()
+
+    claimed = repository.claim_pending_email_distributions(str(survey.id), None, 15)
+    # A new app context has its own session, like another campaign job
+    with app.app_context():
+        others = repository.claim_pending_email_distributions(str(survey.id), None, 40)
+        db.session.rollback()
+    db.session.rollback()
+
+    assert len(claimed) == 15
+    assert len(others) == 25
+    assert not {row.id for row in claimed} & {row.id for row in others}
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+import pytest
+from src.config.app_config import AppConfig
+from src.database.db import db
+from tests.factories import SurveyFactory, DistributionFactory
+from src.database.models.distribution_model import Distribution, DistributionStatus
+from src.domain.distribution.distribution_service import DistributionService
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+from src.shared.counter_buffer import CounterBuffer
+
+THREADS = 8
+CLICKS_PER_THREAD = 25
+
+
+@pytest.fixture
+def distributions():
+    distributions = DistributionFactory.create_batch(
+        2, survey=SurveyFactory(), status=DistributionStatus.SENT
+    )
+    db.session.commit()
+    SurveyStatsRepository().rebuild(str(distributions[0].survey_id))
+    return distributions
+
+
+def click_concurrently(click, ids):
+    """Click each id CLICKS_PER_THREAD times from every thread at once"""
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(
+            executor.map(
+                lambda _: [click(id) for _ in range(CLICKS_PER_THREAD) for id in ids],
+                range(THREADS),
+            )
+        )
+
+
+def assert_clicks(distributions, per_distribution):
+    db.session.expire_all()
+    for distribution in distributions:
+        stored = db.session.get(Distribution, distribution.id)
+        assert stored.clicked_count == per_distribution
+        assert stored.status == DistributionStatus.CLICKED
+
+    counters = SurveyStatsRepository().get_counters(str(distributions[0].survey_id))
+    assert counters["total_clicks"] == per_distribution * len(distributions)
+    assert counters["clicked_distributions"] == len(distributions)
+    assert counters["sent_distributions"] == 0
+
+
+def test_buffer_aggregates_increments_per_key():
+    flushed = []
+    buffer = CounterBuffer(flushed.append, interval_ms=60_000)
+
+    click_concurrently(buffer.add, ["a", "b"])
+    buffer.flush()
+    buffer.flush()
+
+    assert flushed == [
+        {"a": THREADS * CLICKS_PER_THREAD, "b": THREADS * CLICKS_PER_THREAD}
+    ]
+
+
+def test_buffer_retries_the_deltas_of_a_failed_flush():
+    flushed = []
+
+    def flush(deltas):
+        if not flushed:
+            flushed.append(None)
+            raise RuntimeError("database is down")
+        flushed.append(deltas)
+
+    buffer = CounterBuffer(flush, interval_ms=60_000)
+    buffer.add("a", 2)
+    buffer.flush()
+    buffer.add("a")
+    buffer.add("b")
+    buffer.flush()
+
+    assert flushed == [None, {"a": 3, "b": 1}]
+
+
+def test_buffer_flushes_in_the_background():
+    flushed = Event()
+    buffer = CounterBuffer(lambda deltas: flushed.set(), interval_ms=10)
+
+    buffer.add("a")
+
+    assert flushed.wait(5)
+    buffer.stop()
+
+
+def test_concurrent_clicks_are_never_lost(app, distributions):
+    def click(id):
+        response = app.test_client().put(f"/api/v1/distribution/{id}/clicked")
+        assert response.status_code == 200
+
+    click_concurrently(click, [d.id for d in distributions])
+
+    assert_clicks(distributions, THREADS * CLICKS_PER_THREAD)
+
+
+def test_buffered_clicks_are_applied_on_flush(app, distributions, monkeypatch):
+    monkeypatch.setattr(AppConfig, "CLICK_BUFFER_FLUSH_MS", 50)
+    distribution_service = app.extensions["injector"].create_object(DistributionService)
+
+    click_concurrently(
+        distribution_service.increment_distribution_click,
+        [str(d.id) for d in distributions],
+    )
+    distribution_service.click_buffer.stop()
+
+    assert_clicks(distributions, THREADS * CLICKS_PER_THREAD)
@@ -0,0 +1,70 @@
+import pytest
+from src.database.db import db
+from tests.factories import SurveyFactory, QuestionFactory
+
+
+@pytest.fixture
+def survey():
+    survey = SurveyFactory(is_draft=True)
+    QuestionFactory.create_batch(2, survey=survey)
+    db.session.commit()
+    return survey
+
+
+def survey_urls(survey):
+    return [
+        f"/api/v1/surveys/{survey.id}",
+        f"/api/v1/questions/by-survey/{survey.id}",
+        f"/api/v1/responses/survey/{survey.id}/analytics",
+        f"/api/v1/responses/survey/{survey.id}/analytics/question-analytics",
+    ]
+
+
+def test_matching_etag_returns_not_modified(client, survey):
+    for url in survey_urls(survey):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        cached = client.get(url, headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304, url
+        assert cached.data == b""
+        assert cached.headers["ETag"] == etag
+
+
+def test_etag_changes_with_the_survey(client, survey):
+    url = f"/api/v1/surveys/{survey.id}"
+    etag = client.get(url).headers["ETag"]
+
+    assert client.post(f"{url}/publish").status_code == 200
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json["is_draft"] is False
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_changes_with_the_questions(client, survey):
+    url = f"/api/v1/questions/by-survey/{survey.id}"
+    etag = client.get(url).headers["ETag"]
+
+    client.post(
+        "/api/v1/questions/",
+        json={"survey_id": str(survey.id), "text": "Anything else?", "order": 3},
+    )
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json) == 3
+
+
+def test_unknown_survey_has_no_etag(client):
+    response = client.get(
+        "/api/v1/surveys/00000000-0000-0000-0000-000000000000",
+        headers={"If-None-Match": "*"},
+    )
+
+    assert response.status_code != 304
+    assert "ETag" not in response.headers
@@ -0,0 +1,93 @@
+import pytest
+from src.database.db import db
+from tests.factories import SurveyFactory, DistributionFactory
+from src.database.models.distribution_model import Distribution, DistributionStatus
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+
+@pytest.fixture
+def distribution():
+    distribution = DistributionFactory(
+        survey=SurveyFactory(), status=DistributionStatus.SENT
+    )
+    db.session.commit()
+    SurveyStatsRepository().rebuild(str(distribution.survey_id))
+    return distribution
+
+
+def click(client, distribution):
+    response = client.put(f"/api/v1/distribution/{distribution.id}/clicked")
+    assert response.status_code == 200
+    return response
+
+
+def respond(client, distribution):
+    response = client.post(
+        "/api/v1/responses/",
+        json={
+            "survey_id": str(distribution.survey_id),
+            "respondent_data": {"distribution_id": str(distribution.id)},
+        },
+    )
+    assert response.status_code == 200
+    return response
+
+
+def assert_funnel(distribution, status, **counters):
+    db.session.expire_all()
+    stored = db.session.get(Distribution, distribution.id)
+    assert stored.status == status
+    assert stored.clicked_count == 1
+
+    stats = SurveyStatsRepository()
+    recorded = stats.get_counters(str(distribution.survey_id))
+    for name, value in counters.items():
+        assert recorded[name] == value, name
+
+    # The counters recorded along the way match a rebuild from the raw tables
+    stats.rebuild(str(distribution.survey_id))
+    db.session.expire_all()
+    assert stats.get_counters(str(distribution.survey_id)) | {
+        "updated_at": None
+    } == recorded | {"updated_at": None}
+
+
+def test_click_then_respond_opens_the_distribution(client, distribution):
+    click(client, distribution)
+    respond(client, distribution)
+
+    assert_funnel(
+        distribution,
+        DistributionStatus.OPENED,
+        sent_distributions=0,
+        clicked_distributions=0,
+        opened_distributions=1,
+        total_clicks=1,
+    )
+
+
+def test_respond_then_click_keeps_the_distribution_opened(client, distribution):
+    respond(client, distribution)
+    click(client, distribution)
+
+    assert_funnel(
+        distribution,
+        DistributionStatus.OPENED,
+        sent_distributions=0,
+        clicked_distributions=0,
+        opened_distributions=1,
+        total_clicks=1,
+    )
+
+
+def test_click_moves_a_sent_distribution_to_clicked(client, distribution):
+    click(client, distribution)
+
+    assert_funnel(
+        distribution,
+        DistributionStatus.CLICKED,
+        sent_distributions=0,
+        clicked_distributions=1,
+        opened_distributions=0,
+        total_clicks=1,
+    )
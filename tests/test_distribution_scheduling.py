@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+import pytest
+from app import scheduler
+from src.database.db import db
+from tests.factories import SurveyFactory
+from src.database.models.distribution_model import Distribution, DistributionStatus
+from src.domain.distribution.distribution_service import send_campaign_job
+
+SCHEDULED_AT = datetime(2030, 1, 1, 9, 0)
+
+
+def distribute(client, survey, method="EMAIL", count=3):
+    response = client.post(
+        "/api/v1/distribution/bulk-distribution",
+        json={
+            "survey_id": str(survey.id),
+            "method": method,
+            "recipient_emails": [f"scheduled{n}@example.com" for n in range(count)],
+            "subject": "Survey",
+            "message": "Tell us",
+            "scheduled_at": SCHEDULED_AT.isoformat(),
+        },
+    )
+    assert response.status_code == 200
+    return response.json
+
+
+@pytest.fixture
+def survey():
+    survey = SurveyFactory()
+    db.session.commit()
+    return survey
+
+
+def test_email_distributions_store_a_campaign_job_of_ids(client, survey):
+    distribute(client, survey)
+    distribute(client, survey)
+
+    # Read back from the jobstore, so the job was pickled and can be loaded
+    (job,) = scheduler.get_jobs()
+    assert job.func is send_campaign_job
+    assert job.args == (str(survey.id), SCHEDULED_AT.isoformat())
+    assert job.id == f"campaign:{survey.id}:{SCHEDULED_AT.isoformat()}"
+    assert job.next_run_time.replace(tzinfo=None) == SCHEDULED_AT
+
+
+def test_campaign_job_sends_the_distributions(client, survey, smtp_server):
+    distribute(client, survey)
+    (job,) = scheduler.get_jobs()
+
+    summary = job.func(*job.args)
+
+    assert summary["sent"] == 3
+    assert set(smtp_server.recipients) == {
+        f"scheduled{n}@example.com" for n in range(3)
+    }
+    db.session.expire_all()
+    assert {
+        distribution.status
+        for distribution in Distribution.query.filter_by(survey_id=survey.id)
+    } == {DistributionStatus.SENT}
+
+
+def test_link_distributions_are_not_scheduled(client, survey):
+    distribute(client, survey, method="LINK")
+
+    assert scheduler.get_jobs() == []
+
+
+def test_publishing_a_draft_schedules_its_campaigns(client):
+    draft = SurveyFactory(is_draft=True)
+    db.session.commit()
+    distribute(client, draft)
+    assert scheduler.get_jobs() == []
+
+    response = client.post(f"/api/v1/surveys/{draft.id}/publish")
+
+    assert response.status_code == 200
+    (job,) = scheduler.get_jobs()
+    assert job.args == (str(draft.id), SCHEDULED_AT.isoformat())
@@ -0,0 +1,78 @@
+from uuid import uuid4
+import pytest
+from flask import render_template
+from src.services.email_render_service import EmailRenderService
+
+MESSAGE = 'Tell us about <b>"Q3"</b> & more'
+URLS = [
+    "http://localhost:3000/surveys/1/take?distribution_id=2&clicked_at=3",
+    'https://example.com/take?next="><script>alert(1)</script>',
+    # Looks like the slot of another template
+    f"https://example.com/survey-url-{uuid4().hex}",
+]
+
+
+@pytest.fixture
+def renderer():
+    return EmailRenderService(max_size=2)
+
+
+@pytest.mark.parametrize("survey_url", URLS)
+def test_recipients_get_the_bodies_of_a_full_render(renderer, survey_url):
+    survey_id = uuid4()
+    renderer.render_survey_email(survey_id, MESSAGE, "https://example.com/first")
+
+    plain_body, html_body = renderer.render_survey_email(survey_id, MESSAGE, survey_url)
+
+    assert plain_body == f"{MESSAGE}\n\nSurvey Link: {survey_url}"
+    assert html_body == render_template(
+        "survey_email.html", message=MESSAGE, survey_url=survey_url
+    )
+    assert renderer.stats()["hits"] == 1
+
+
+def test_html_escapes_the_message_and_the_url(renderer):
+    _, html_body = renderer.render_survey_email(uuid4(), MESSAGE, URLS[1])
+
+    assert "<script>" not in html_body
+    assert "&lt;script&gt;" in html_body
+    assert "&lt;b&gt;&#34;Q3&#34;&lt;/b&gt; &amp; more" in html_body
+    assert (
+        "distribution_id=2&amp;clicked_at=3"
+        in renderer.render_survey_email(uuid4(), MESSAGE, URLS[0])[1]
+    )
+
+
+def test_templates_are_cached_per_survey_and_message(renderer):
+    survey_id, other_survey_id = uuid4(), uuid4()
+
+    renderer.render_survey_email(survey_id, MESSAGE, URLS[0])
+    renderer.render_survey_email(survey_id, MESSAGE, URLS[1])
+    renderer.render_survey_email(survey_id, "Another message", URLS[0])
+    renderer.render_survey_email(other_survey_id, MESSAGE, URLS[0])
+
+    assert renderer.stats() == {
+        "hits": 1,
+        "misses": 3,
+        "hit_ratio": 0.25,
+        "size": 2,
+        "max_size": 2,
+    }
+    # The least recently used template was evicted
+    renderer.render_survey_email(survey_id, MESSAGE, URLS[0])
+    assert renderer.stats()["misses"] == 4
+
+
+def test_counters_are_served_as_metrics(app, client):
+    renderer = app.extensions["injector"].get(EmailRenderService)
+    renderer.clear()
+    survey_id = uuid4()
+    for url in URLS:
+        renderer.render_survey_email(survey_id, MESSAGE, url)
+
+    response = client.get("/api/v1/metrics/email-templates")
+
+    assert response.status_code == 200
+    assert response.json["hits"] == 2
+    assert response.json["misses"] == 1
+    renderer.clear()
@@ -0,0 +1,43 @@
+import gzip
+import json
+import brotli
+import pytest
+from src.database.db import db
+from tests.factories import SurveyFactory
+
+URL = "/api/v1/surveys/?per_page=50"
+
+
+@pytest.fixture(autouse=True)
+def surveys():
+    SurveyFactory.create_batch(50)
+    db.session.commit()
+
+
+def test_json_is_encoded_with_orjson(app, client):
+    response = client.get(URL)
+
+    assert type(app.json).__name__ == "FastJSONProvider"
+    assert len(response.json["items"]) == 50
+    assert response.json == json.loads(app.json.dumps(response.json))
+    assert response.data.endswith(b"}\n")
+    assert b": " not in response.data
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress", [("br", brotli.decompress), ("gzip", gzip.decompress)]
+)
+def test_large_responses_are_compressed(client, encoding, decompress):
+    plain = client.get(URL)
+
+    response = client.get(URL, headers={"Accept-Encoding": encoding})
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(decompress(response.data)) == plain.json
+
+
+def test_brotli_is_preferred(client):
+    response = client.get(URL, headers={"Accept-Encoding": "gzip, deflate, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
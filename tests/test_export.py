@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+import pytest
+from src.database.db import db
+from tests.factories import (
+    AnswerFactory,
+    QuestionFactory,
+    ResponseFactory,
+    SurveyFactory,
+)
+from src.domain.response.response_service import EXPORT_COLUMNS
+
+CREATED_AT = datetime(2026, 3, 2, 9, 30)
+EMPTY = dict(value=None, values=None, rating=None, date_value=None)
+
+
+@pytest.fixture
+def survey():
+    survey = SurveyFactory()
+    text, rating, choices, day, _ = [
+        QuestionFactory(survey=survey, text=text, order=order)
+        for order, text in enumerate(["Comment", "Score", "Channels", "Day", "Unused"])
+    ]
+
+    first = ResponseFactory(
+        survey=survey,
+        respondent_name="Ada",
+        respondent_email="ada@example.com",
+        created_at=CREATED_AT,
+    )
+    AnswerFactory(
+        response=first, question=text, **{**EMPTY, "value": 'Said "hi",\nbye'}
+    )
+    AnswerFactory(response=first, question=rating, **{**EMPTY, "rating": 9})
+    AnswerFactory(
+        response=first, question=choices, **{**EMPTY, "values": ["Email", "Chat"]}
+    )
+    AnswerFactory(
+        response=first, question=day, **{**EMPTY, "date_value": date(2026, 3, 1)}
+    )
+
+    # Options stored as numbers, as imported from JSON
+    second = ResponseFactory(
+        survey=survey,
+        respondent_name="Bob",
+        respondent_email=None,
+        created_at=CREATED_AT + timedelta(minutes=1),
+    )
+    AnswerFactory(response=second, question=choices, **{**EMPTY, "values": [1, 2.5]})
+
+    # No answers at all
+    ResponseFactory(
+        survey=survey,
+        respondent_name="Cy",
+        created_at=CREATED_AT + timedelta(minutes=2),
+    )
+
+    # Another survey's response is not exported
+    ResponseFactory(created_at=CREATED_AT)
+    db.session.commit()
+    return survey
+
+
+def export(client, survey, format):
+    response = client.get(
+        f"/api/v1/responses/survey/{survey.id}/export",
+        query_string={"format": format},
+    )
+    assert response.status_code == 200
+    return response
+
+
+def test_csv_has_a_row_per_response_and_a_column_per_question(client, survey):
+    response = export(client, survey, "csv")
+
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == (
+        f"attachment; filename=survey-{survey.id}-responses.csv"
+    )
+    header, *rows = csv.reader(io.StringIO(response.get_data(as_text=True)))
+    assert header == EXPORT_COLUMNS + ["Comment", "Score", "Channels", "Day", "Unused"]
+    records = [dict(zip(header, row)) for row in rows]
+    assert [record["respondent_name"] for record in records] == ["Ada", "Bob", "Cy"]
+    assert records[0] | {"response_id": None} == {
+        "response_id": None,
+        "respondent_name": "Ada",
+        "respondent_email": "ada@example.com",
+        "source": "internal",
+        "external_response_id": "",
+        "distribution_id": "",
+        "created_at": CREATED_AT.isoformat(),
+        "Comment": 'Said "hi",\nbye',
+        "Score": "9",
+        "Channels": "Email; Chat",
+        "Day": "2026-03-01",
+        "Unused": "",
+    }
+    assert records[1]["Channels"] == "1; 2.5"
+    assert records[1]["respondent_email"] == ""
+    assert [records[2][text] for text in ("Comment", "Score", "Channels")] == [
+        "",
+        "",
+        "",
+    ]
+
+
+def test_ndjson_has_a_record_per_response_with_typed_answers(client, survey):
+    response = export(client, survey, "ndjson")
+
+    assert response.mimetype == "application/x-ndjson"
+    records = [
+        json.loads(line) for line in response.get_data(as_text=True).splitlines()
+    ]
+    assert [record["respondent_name"] for record in records] == ["Ada", "Bob", "Cy"]
+    questions = {question.text: str(question.id) for question in survey.questions}
+    assert records[0]["answers"] == {
+        questions["Comment"]: 'Said "hi",\nbye',
+        questions["Score"]: 9,
+        questions["Channels"]: ["Email", "Chat"],
+        questions["Day"]: "2026-03-01",
+    }
+    assert records[0]["created_at"] == CREATED_AT.isoformat()
+    assert records[0]["source"] == "internal"
+    assert records[1]["answers"] == {questions["Channels"]: [1, 2.5]}
+    assert records[1]["respondent_email"] is None
+    assert records[2]["answers"] == {}
+
+
+def test_export_streams_every_response_in_chunks(client, survey):
+    ResponseFactory.create_batch(
+        600, survey=survey, created_at=CREATED_AT + timedelta(hours=1)
+    )
+    db.session.commit()
+
+    csv_rows = export(client, survey, "csv").get_data(as_text=True)
+    ndjson_lines = export(client, survey, "ndjson").get_data(as_text=True)
+
+    assert len(list(csv.reader(io.StringIO(csv_rows)))) == 1 + 603
+    assert len(ndjson_lines.splitlines()) == 603
+
+
+def test_unknown_survey_is_not_found(client):
+    response = client.get(
+        "/api/v1/responses/survey/00000000-0000-0000-0000-000000000000/export"
+    )
+
+    assert response.status_code == 404
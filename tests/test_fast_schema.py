@@ -0,0 +1,172 @@
+from datetime import date, datetime
+import enum
+import uuid
+import pytest
+from marshmallow import Schema, fields, post_dump
+from src.database.db import db
+from tests.factories import (
+    SurveyFactory,
+    QuestionFactory,
+    ResponseFactory,
+    DistributionFactory,
+)
+from src.schema.distribution_schema import DistributionPaginatedSchema
+from src.schema.question_schema import QuestionSchema
+from src.schema.response_schema import SurveyResponsePaginatedSchema
+from src.schema.survey_schema import SurveyPaginatedSchema
+from src.shared.fast_schema import FastDumpSchema
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class EverythingSchema(FastDumpSchema):
+    id = fields.UUID()
+    name = fields.String()
+    email = fields.Email()
+    count = fields.Integer()
+    count_as_string = fields.Integer(as_string=True)
+    ratio = fields.Float()
+    active = fields.Boolean()
+    created_at = fields.DateTime()
+    created_on = fields.Date()
+    timestamp = fields.DateTime(format="timestamp")
+    color_value = fields.Enum(Color, by_value=True)
+    color_name = fields.Enum(Color)
+    tags = fields.List(fields.String())
+    meta = fields.Dict()
+    renamed = fields.String(data_key="renamedKey")
+    attribute = fields.String(attribute="source")
+    defaulted = fields.String(dump_default="fallback")
+    called_default = fields.Integer(dump_default=lambda: 7)
+    child = fields.Nested(QuestionSchema)
+
+
+class Everything:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+EVERYTHING = dict(
+    id=uuid.uuid4(),
+    name="Name",
+    email="someone@example.com",
+    count=3,
+    count_as_string=4,
+    ratio=0.5,
+    active=True,
+    created_at=datetime(2024, 1, 31, 12, 30, 15, 120),
+    created_on=date(2024, 1, 31),
+    timestamp=datetime(2024, 1, 31, 12, 30),
+    color_value=Color.RED,
+    color_name=Color.RED,
+    tags=["a", "b"],
+    meta={"a": 1},
+    renamed="renamed",
+    source="from source",
+    child={"id": uuid.uuid4(), "text": "How?", "order": 1},
+)
+
+
+def plain(schema_class):
+    """The same schema on plain marshmallow, with plain nested schemas too"""
+
+    def convert(field):
+        if isinstance(field, fields.List):
+            return fields.List(convert(field.inner))
+        if (
+            isinstance(field, fields.Nested)
+            and isinstance(field.nested, type)
+            and issubclass(field.nested, FastDumpSchema)
+        ):
+            return fields.Nested(plain(field.nested), many=field.many)
+        return field
+
+    declared = {
+        name: convert(field) for name, field in schema_class._declared_fields.items()
+    }
+    return type(f"Plain{schema_class.__name__}", (Schema,), declared)
+
+
+def assert_same_dump(schema_class, obj, many=False):
+    dumped = schema_class(many=many).dump(obj)
+    assert dumped == plain(schema_class)(many=many).dump(obj)
+    return dumped
+
+
+def page(items):
+    return {
+        "items": items,
+        "total": len(items),
+        "pages": 1,
+        "current_page": 1,
+        "per_page": 10,
+        "has_next": False,
+        "has_prev": False,
+    }
+
+
+def test_every_supported_field_dumps_like_marshmallow():
+    dumped = assert_same_dump(EverythingSchema, Everything(**EVERYTHING))
+
+    assert EverythingSchema()._get_dumper() is not None
+    assert dumped["renamedKey"] == "renamed"
+    assert dumped["defaulted"] == "fallback"
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Everything(**dict.fromkeys(EVERYTHING)),
+        Everything(),
+        EVERYTHING,
+        {"name": "Only a name"},
+    ],
+    ids=["none", "missing", "mapping", "partial-mapping"],
+)
+def test_none_missing_and_mappings_dump_like_marshmallow(obj):
+    assert_same_dump(EverythingSchema, obj)
+
+
+def test_many_dumps_like_marshmallow():
+    assert_same_dump(EverythingSchema, [Everything(**EVERYTHING), Everything()], True)
+
+
+def test_schemas_that_cannot_compile_use_marshmallow():
+    class HookSchema(FastDumpSchema):
+        name = fields.String()
+
+        @post_dump
+        def shout(self, data, **kwargs):
+            return {"name": data["name"].upper()}
+
+    class MethodSchema(FastDumpSchema):
+        name = fields.Method("get_name")
+
+        def get_name(self, obj):
+            return obj.name * 2
+
+    class DottedSchema(FastDumpSchema):
+        name = fields.String(attribute="child.text")
+
+    obj = Everything(name="a", child={"text": "b"})
+    for schema_class in (HookSchema, MethodSchema, DottedSchema):
+        schema = schema_class()
+        assert schema._get_dumper() is None
+        assert schema.dump(obj) == Schema.dump(schema, obj)
+    assert HookSchema().dump(obj) == {"name": "A"}
+
+
+def test_paginated_models_dump_like_marshmallow():
+    survey = SurveyFactory()
+    questions = QuestionFactory.create_batch(3, survey=survey)
+    responses = ResponseFactory.create_batch(3, survey=survey)
+    distributions = DistributionFactory.create_batch(3, survey=survey)
+    db.session.commit()
+
+    surveys = assert_same_dump(SurveyPaginatedSchema, page([survey]))
+    assert surveys["items"][0]["question_count"] == 3
+    assert_same_dump(QuestionSchema, questions, many=True)
+    assert_same_dump(SurveyResponsePaginatedSchema, page(responses))
+    assert_same_dump(DistributionPaginatedSchema, page(distributions))
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from src.database.db import db
+from tests.factories import (
+    SurveyFactory,
+    QuestionFactory,
+    ResponseFactory,
+    AnswerFactory,
+    DistributionFactory,
+)
+from src.domain.answer.answer_repository import AnswerRepository
+from src.domain.distribution.distribution_repository import DistributionRepository
+from src.domain.question.question_repository import QuestionRepository
+from src.domain.response.response_repository import ResponseRepository
+
+# Tables growing with every survey, which must never be scanned whole
+LARGE_TABLES = {"response", "answer", "distribution", "question"}
+
+
+@pytest.fixture
+def survey():
+    survey = SurveyFactory()
+    questions = QuestionFactory.create_batch(3, survey=survey)
+    for response in ResponseFactory.create_batch(5, survey=survey):
+        for question in questions:
+            AnswerFactory(response=response, question=question)
+    DistributionFactory.create_batch(5, survey=survey)
+    db.session.commit()
+    return survey
+
+
+def captured_statements(call):
+    """Run a call and return the SQL statements it executed with their parameters"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+    return statements
+
+
+def sequential_scans(statement, parameters):
+    """Tables of LARGE_TABLES that the plan of a statement scans sequentially"""
+    connection = db.engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            # Tiny test tables are cheaper to scan, so only a missing index forces one
+            cursor.execute("SET enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = cursor.fetchone()[0][0]["Plan"]
+        connection.rollback()
+    finally:
+        connection.close()
+
+    scans = set()
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"] in LARGE_TABLES:
+            scans.add(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return scans
+
+
+def first_response_id(survey_id):
+    return str(ResponseRepository().get_responses_by_survey(survey_id)["items"][0].id)
+
+
+def first_question_id(survey_id):
+    return str(QuestionRepository().get_questions_by_survey(survey_id)[0].id)
+
+
+CALLS = {
+    "responses_by_survey": lambda id: ResponseRepository().get_responses_by_survey(id),
+    "responses_by_survey_cursor": lambda id: ResponseRepository().get_responses_by_survey(
+        id, mode="cursor", per_page=2
+    ),
+    "completed_responses": lambda id: ResponseRepository().get_completed_responses(id),
+    "responses_by_source": lambda id: ResponseRepository().get_responses_by_source(
+        id, "INTERNAL"
+    ),
+    "response_counts_by_bucket": lambda id: ResponseRepository().get_response_counts_by_bucket(
+        id, datetime.utcnow() - timedelta(days=7), datetime.utcnow()
+    ),
+    "responses_with_answers": lambda id: ResponseRepository().get_responses_with_answers(
+        [first_response_id(id)]
+    ),
+    "iter_responses_with_answers": lambda id: list(
+        ResponseRepository().iter_responses_with_answers(id)
+    ),
+    "answers_by_response": lambda id: AnswerRepository().get_answers_by_response(
+        first_response_id(id)
+    ),
+    "answers_by_question": lambda id: AnswerRepository().get_answers_by_question(
+        first_question_id(id)
+    ),
+    "answer_columns": lambda id: AnswerRepository().get_answer_columns(id),
+    "question_aggregates": lambda id: AnswerRepository().get_question_aggregates(id),
+    "question_breakdowns": lambda id: AnswerRepository().get_question_breakdowns(id),
+    "questions_by_survey": lambda id: QuestionRepository().get_questions_by_survey(id),
+    "required_questions": lambda id: QuestionRepository().get_required_questions(id),
+    "distributions_by_survey": lambda id: DistributionRepository().get_distributions_by_survey(
+        id
+    ),
+    "pending_email_schedules": lambda id: DistributionRepository().get_pending_email_schedules(
+        id
+    ),
+    "claim_pending_email_distributions": lambda id: DistributionRepository().claim_pending_email_distributions(
+        id, None, 10
+    ),
+}
+
+
+@pytest.mark.parametrize("name", CALLS)
+def test_repository_queries_use_an_index(survey, name):
+    statements = captured_statements(lambda: CALLS[name](str(survey.id)))
+    db.session.rollback()
+
+    assert statements
+    for statement, parameters in statements:
+        assert not sequential_scans(statement, parameters), statement
@@ -0,0 +1,83 @@
+from datetime import datetime
+import pytest
+from src.database.db import db
+from tests.factories import SurveyFactory, ResponseFactory
+
+
+@pytest.fixture
+def survey():
+    survey = SurveyFactory()
+    # Two responses share a created_at, so only the id breaks their tie
+    ResponseFactory.create_batch(6, survey=survey)
+    ResponseFactory.create_batch(2, survey=survey, created_at=datetime(2024, 1, 1))
+    db.session.commit()
+    return survey
+
+
+def responses_url(survey):
+    return f"/api/v1/responses/survey/{survey.id}/responses"
+
+
+def walk_cursor_pages(client, url, per_page):
+    ids, pages, cursor = [], 0, None
+    while True:
+        query = {"mode": "cursor", "per_page": per_page}
+        if cursor:
+            query["cursor"] = cursor
+        body = client.get(url, query_string=query).json
+        ids += [item["id"] for item in body["items"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if not body["has_next"]:
+            assert cursor is None
+            return ids, pages
+
+
+def test_cursor_pages_return_every_response_once_newest_first(client, survey):
+    ids, pages = walk_cursor_pages(client, responses_url(survey), per_page=3)
+
+    expected = [
+        str(response.id)
+        for response in sorted(
+            survey.responses, key=lambda r: (r.created_at, r.id), reverse=True
+        )
+    ]
+    assert ids == expected
+    assert pages == 3
+
+
+def test_cursor_pages_match_offset_pages(client, survey):
+    cursor_ids, _ = walk_cursor_pages(client, responses_url(survey), per_page=8)
+    body = client.get(responses_url(survey), query_string={"per_page": 8}).json
+
+    assert sorted(item["id"] for item in body["items"]) == sorted(cursor_ids)
+    assert body["total"] == 8
+    assert body["pages"] == 1
+
+
+def test_cursor_pages_only_count_the_total_when_asked(client, survey):
+    url = responses_url(survey)
+
+    body = client.get(url, query_string={"mode": "cursor"}).json
+    assert "total" not in body
+
+    body = client.get(url, query_string={"mode": "cursor", "include_total": True}).json
+    assert body["total"] == 8
+
+
+def test_invalid_cursor_is_a_bad_request(client, survey):
+    response = client.get(
+        responses_url(survey), query_string={"mode": "cursor", "cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_survey_list_cursor_pages(client):
+    SurveyFactory.create_batch(5)
+    db.session.commit()
+
+    ids, pages = walk_cursor_pages(client, "/api/v1/surveys/", per_page=2)
+
+    assert len(set(ids)) == 5
+    assert pages == 3
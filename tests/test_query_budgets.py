@@ -0,0 +1,256 @@
+"""
+Query budgets of every API endpoint. Each call runs against a small and a
+larger seeded dataset, and must stay within its number of SQL statements, run
+the same number of them on both (no N+1) and answer within MAX_TIME.
+"""
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+import time
+import pytest
+from sqlalchemy import event
+from app import cache
+from src.database.db import db
+from tests.factories import (
+    AnswerFactory,
+    DistributionFactory,
+    QuestionFactory,
+    ResponseFactory,
+    SurveyFactory,
+)
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+SCALES = (1, 5)
+MAX_TIME = 1.0
+
+Dataset = Dict[str, Any]
+FromDataset = Union[Any, Callable[[Dataset], Any]]
+
+
+class Call(NamedTuple):
+    """A request to an endpoint, with the number of queries it was measured to run"""
+
+    endpoint: str
+    budget: int
+    path: Optional[Dict[str, str]] = None
+    query: Optional[Dict[str, Any]] = None
+    json: FromDataset = None
+    data: FromDataset = None
+    content_type: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        if not self.query:
+            return self.endpoint
+        return f"{self.endpoint}?{'&'.join(f'{k}={v}' for k, v in self.query.items())}"
+
+
+SURVEY = {"survey_id": "survey_id"}
+
+# Reads first, so writes do not change what they read
+CALLS = [
+    Call("surveys_api_v1.query_surveys", 3),
+    Call("surveys_api_v1.query_surveys", 2, query={"mode": "cursor"}),
+    Call("surveys_api_v1.query_surveys", 4, query={"q": "customer satisfaction"}),
+    Call("surveys_api_v1.get_survey_by_id", 3, SURVEY),
+    Call("questions_api_v1.get_questions_by_survey_id", 3, SURVEY),
+    Call("distribution_api_v1.query_distributions", 2),
+    Call("distribution_api_v1.get_distributions_by_survey_id", 2, SURVEY),
+    Call("responses_api_v1.get_survey_responses", 3, SURVEY),
+    Call("responses_api_v1.get_survey_responses", 2, SURVEY, {"mode": "cursor"}),
+    Call("responses_api_v1.get_response_answers", 1, {"response_id": "response_id"}),
+    Call(
+        "responses_api_v1.batch_get_response_answers",
+        1,
+        json=lambda dataset: {"response_ids": dataset["response_ids"][:10]},
+    ),
+    Call("responses_api_v1.export_survey_responses", 3, SURVEY),
+    Call("responses_api_v1.export_survey_responses", 3, SURVEY, {"format": "ndjson"}),
+    Call("responses_api_v1.get_survey_analytics", 4, SURVEY),
+    Call("responses_api_v1.get_daily_responses", 2, SURVEY),
+    Call(
+        "responses_api_v1.get_daily_responses",
+        2,
+        SURVEY,
+        {"granularity": "hour", "days": 2},
+    ),
+    Call("responses_api_v1.get_question_analytics", 4, SURVEY),
+    Call("metrics_api_v1.get_cache_metrics", 0),
+    Call("metrics_api_v1.get_email_template_metrics", 0),
+    Call(
+        "surveys_api_v1.create_survey",
+        4,
+        json={"title": "Budget survey", "type": "internal", "is_draft": True},
+    ),
+    Call("surveys_api_v1.publish_survey", 6, {"survey_id": "draft_survey_id"}),
+    Call(
+        "questions_api_v1.create_question",
+        3,
+        json=lambda dataset: {
+            "survey_id": dataset["survey_id"],
+            "text": "Anything else?",
+        },
+    ),
+    Call(
+        "questions_api_v1.bulk_create_question",
+        2,
+        json=lambda dataset: {
+            "survey_id": dataset["survey_id"],
+            "questions": [{"text": f"Extra {n}", "order": n} for n in range(3)],
+        },
+    ),
+    Call(
+        "responses_api_v1.create_response",
+        6,
+        json=lambda dataset: {
+            "survey_id": dataset["survey_id"],
+            "respondent_data": {"name": "Budget", "email": "budget@example.com"},
+        },
+    ),
+    Call(
+        "responses_api_v1.submit_answers",
+        5,
+        {"response_id": "unanswered_response_id"},
+        json=lambda dataset: {
+            "answers": [
+                {"question_id": id, "rating": 5} for id in dataset["question_ids"][:3]
+            ]
+        },
+    ),
+    Call(
+        "responses_api_v1.bulk_import_survey_responses",
+        5,
+        SURVEY,
+        data=lambda dataset: "\n".join(
+            '{"external_response_id": "budget-%d", "answers": {"%s": 4}}'
+            % (index, dataset["question_ids"][0])
+            for index in range(5)
+        ),
+        content_type="application/x-ndjson",
+    ),
+    Call(
+        "distribution_api_v1.create_bulk_distribution",
+        4,
+        json=lambda dataset: {
+            "survey_id": dataset["survey_id"],
+            "method": "LINK",
+            "recipient_emails": [f"budget{n}@example.com" for n in range(5)],
+            "subject": "Budget",
+            "message": "Budget",
+        },
+    ),
+    Call(
+        "distribution_api_v1.increment_distribution_click",
+        3,
+        {"distribution_id": "distribution_id"},
+    ),
+]
+
+
+def seed_dataset(scale: int) -> Dataset:
+    """
+    Seed a survey whose questions, responses, answers and distributions, and the
+    number of other surveys, grow with `scale`
+    """
+    survey = SurveyFactory(title="Customer satisfaction")
+    questions = QuestionFactory.create_batch(3 * scale, survey=survey)
+    responses = ResponseFactory.create_batch(10 * scale, survey=survey)
+    for response in responses:
+        for question in questions:
+            AnswerFactory(response=response, question=question)
+    distributions = DistributionFactory.create_batch(10 * scale, survey=survey)
+    SurveyFactory.create_batch(10 * scale)
+    draft = SurveyFactory(is_draft=True)
+    unanswered = ResponseFactory(survey=survey)
+    db.session.commit()
+    SurveyStatsRepository().rebuild()
+
+    return {
+        "survey_id": str(survey.id),
+        "draft_survey_id": str(draft.id),
+        "question_ids": [str(question.id) for question in questions],
+        "response_id": str(responses[0].id),
+        "response_ids": [str(response.id) for response in responses],
+        "unanswered_response_id": str(unanswered.id),
+        "distribution_id": str(distributions[0].id),
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """The tests of this module share `datasets`, emptied after the last one"""
+    yield
+
+
+@pytest.fixture(scope="module")
+def datasets(app, empty_database):
+    with app.app_context():
+        datasets = {scale: seed_dataset(scale) for scale in SCALES}
+        db.session.remove()
+    yield datasets
+    empty_database()
+
+
+def resolve(value: FromDataset, dataset: Dataset):
+    return value(dataset) if callable(value) else value
+
+
+def measure(app, client, call: Call, dataset: Dataset):
+    """Run a call as a fresh request, counting its queries until the body is read"""
+    rule = next(app.url_map.iter_rules(call.endpoint))
+    method = next(iter(rule.methods - {"HEAD", "OPTIONS"}))
+    path = app.url_map.bind("localhost").build(
+        call.endpoint,
+        {name: dataset[key] for name, key in (call.path or {}).items()},
+        method=method,
+    )
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Nothing carried over from earlier calls, like cached entries or loaded rows
+    db.session.remove()
+    cache.clear()
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        started = time.perf_counter()
+        response = client.open(
+            path,
+            method=method,
+            query_string=call.query,
+            json=resolve(call.json, dataset),
+            data=resolve(call.data, dataset),
+            content_type=call.content_type,
+        )
+        response.get_data()
+        duration = time.perf_counter() - started
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+    return response, statements, duration
+
+
+def test_every_endpoint_has_a_budget(app):
+    covered = {call.endpoint for call in CALLS}
+
+    assert (
+        sorted(
+            rule.endpoint
+            for rule in app.url_map.iter_rules()
+            if rule.rule.startswith("/api/") and rule.endpoint not in covered
+        )
+        == []
+    )
+
+
+@pytest.mark.parametrize("call", CALLS, ids=[call.label for call in CALLS])
+def test_endpoint_stays_within_its_query_budget(app, client, datasets, call):
+    counts = []
+    for scale, dataset in datasets.items():
+        response, statements, duration = measure(app, client, call, dataset)
+
+        assert 200 <= response.status_code < 400, (scale, response.json)
+        assert duration < MAX_TIME, f"took {duration:.3f}s at scale {scale}"
+        assert len(statements) <= call.budget, "\n".join(statements)
+        counts.append(len(statements))
+
+    assert len(set(counts)) == 1, f"query counts grow with the data: {counts}"
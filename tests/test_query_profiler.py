@@ -0,0 +1,140 @@
+import logging
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+from src.shared.query_profiler import QUERY_LISTENERS, fingerprint, init_query_profiler
+
+BUDGET = 4
+REPEAT_THRESHOLD = 3
+
+
+@pytest.fixture
+def engine():
+    # A single connection, so its info can be checked after the requests
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def profiled_app(engine, monkeypatch):
+    """An app running queries of its own with QUERY_PROFILER on"""
+    # Migrating the test database configures logging, disabling existing loggers
+    monkeypatch.setattr(
+        logging.getLogger("src.shared.query_profiler"), "disabled", False
+    )
+    app = Flask(__name__)
+    app.config.update(
+        QUERY_PROFILER=True,
+        QUERY_BUDGET=BUDGET,
+        QUERY_REPEAT_THRESHOLD=REPEAT_THRESHOLD,
+    )
+    init_query_profiler(app)
+
+    @app.get("/queries/<int:count>")
+    def run_queries(count):
+        with engine.connect() as connection:
+            for value in range(count):
+                connection.execute(text("SELECT :value"), {"value": value})
+        return {"count": count}
+
+    @app.get("/failing")
+    def run_a_failing_query():
+        with engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+            connection.execute(text("SELECT 1"))
+        return {}
+
+    yield app
+    for identifier, listener in QUERY_LISTENERS.items():
+        event.remove(Engine, identifier, listener)
+
+
+@pytest.fixture
+def profiled_client(profiled_app):
+    return profiled_app.test_client()
+
+
+def server_timing(response):
+    return dict(
+        timing.split(";", 1) for timing in response.headers.get_all("Server-Timing")
+    )
+
+
+def test_queries_are_counted_and_timed(profiled_client):
+    response = profiled_client.get("/queries/2")
+
+    assert response.headers["X-Query-Count"] == "2"
+    timings = server_timing(response)
+    assert timings["db"].endswith('desc="2 queries"')
+    db_duration = float(timings["db"].split(";")[0].removeprefix("dur="))
+    app_duration = float(timings["app"].removeprefix("dur="))
+    assert 0 <= db_duration <= app_duration
+
+
+def test_requests_without_queries(profiled_client):
+    assert profiled_client.get("/queries/0").headers["X-Query-Count"] == "0"
+
+
+def test_requests_over_the_budget_are_logged(profiled_client, caplog):
+    with caplog.at_level(logging.WARNING, "src.shared.query_profiler"):
+        profiled_client.get(f"/queries/{BUDGET}")
+        assert caplog.messages == [
+            f"GET /queries/{BUDGET} ran the same statement {BUDGET} times, "
+            f"possible N+1: SELECT ?"
+        ]
+        caplog.clear()
+
+        profiled_client.get(f"/queries/{BUDGET + 1}")
+
+    assert caplog.messages[0].startswith(
+        f"GET /queries/{BUDGET + 1} ran {BUDGET + 1} queries, over the budget of "
+        f"{BUDGET}, in "
+    )
+
+
+def test_statements_repeated_below_the_threshold_are_not_logged(
+    profiled_client, caplog
+):
+    with caplog.at_level(logging.WARNING, "src.shared.query_profiler"):
+        profiled_client.get(f"/queries/{REPEAT_THRESHOLD - 1}")
+
+    assert caplog.messages == []
+
+
+def test_failing_queries_are_counted_and_leave_no_timer_behind(profiled_client, engine):
+    response = profiled_client.get("/failing")
+
+    assert response.headers["X-Query-Count"] == "2"
+    with engine.connect() as connection:
+        assert connection.info["query_started_at"] == []
+
+
+def test_the_profiler_is_off_by_default(client):
+    assert "X-Query-Count" not in client.get("/api/v1/surveys/").headers
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        (
+            "SELECT * FROM survey WHERE id = %(id_1)s AND title = 'It''s'",
+            "SELECT * FROM survey WHERE id = ? AND title = ?",
+        ),
+        (
+            "SELECT * FROM answer WHERE rating > 3.5",
+            "SELECT * FROM answer WHERE rating > ?",
+        ),
+        (
+            "SELECT *\n  FROM response WHERE id IN (?, ?, ?)",
+            "SELECT * FROM response WHERE id IN (?)",
+        ),
+        ("SELECT :value", "SELECT ?"),
+    ],
+)
+def test_fingerprints_replace_parameters_and_literals(statement, expected):
+    assert fingerprint(statement) == expected
@@ -0,0 +1,121 @@
+from datetime import date
+import pytest
+from benchmarks.question_analytics import python_question_analytics, same_analytics
+from src.database.db import db
+from tests.factories import (
+    AnswerFactory,
+    QuestionFactory,
+    ResponseFactory,
+    SurveyFactory,
+)
+from src.domain.response.response_service import ResponseService
+
+EMPTY = dict(value=None, values=None, rating=None, date_value=None)
+
+# Answers of each question, one per response, with the edge cases of "answered"
+ANSWERS = {
+    "text": [
+        {"value": "Great support"},
+        {"value": "Ünïcode ✓"},
+        {"value": ""},
+        {},
+        {"value": "ok"},
+    ],
+    "checkbox": [
+        {"values": ["Email", "Chat"]},
+        {"values": ["Email"]},
+        {"values": []},
+        {"values": ["Phone", "Email", "Chat"]},
+        {},
+    ],
+    "rating": [
+        {"rating": 5},
+        {"rating": 0},
+        {"rating": 3},
+        {"rating": 5},
+        {},
+    ],
+    "date": [
+        {"date_value": date(2026, 1, 31)},
+        {},
+        {"date_value": date(2026, 2, 1)},
+        {},
+        {},
+    ],
+    "mixed": [
+        {"value": "Other", "values": ["Other"]},
+        {"rating": 1, "value": ""},
+        {},
+        {},
+        {"values": ["Other"], "rating": 2},
+    ],
+}
+
+
+@pytest.fixture
+def survey_id():
+    survey = SurveyFactory()
+    questions = {
+        kind: QuestionFactory(survey=survey, text=f"{kind} question", order=order)
+        for order, kind in enumerate(ANSWERS)
+    }
+    # Never answered
+    QuestionFactory(survey=survey, text="unanswered question", order=len(ANSWERS))
+    for index in range(5):
+        response = ResponseFactory(survey=survey)
+        for kind, answers in ANSWERS.items():
+            AnswerFactory(
+                response=response,
+                question=questions[kind],
+                **{**EMPTY, **answers[index]},
+            )
+
+    # Answers of another survey are not counted
+    other = SurveyFactory()
+    other_question = QuestionFactory(survey=other)
+    AnswerFactory.create_batch(
+        3, response=ResponseFactory(survey=other), question=other_question
+    )
+    db.session.commit()
+    return str(survey.id)
+
+
+def test_aggregates_match_the_python_computation(app, survey_id):
+    response_service = app.extensions["injector"].get(ResponseService)
+
+    analytics = response_service.get_question_analytics(survey_id)
+    expected = python_question_analytics(survey_id)
+
+    assert same_analytics(analytics, expected), (analytics, expected)
+    by_text = {question["question_text"]: question for question in analytics}
+    assert [question["question_text"] for question in analytics] == [
+        f"{kind} question" for kind in ANSWERS
+    ] + ["unanswered question"]
+    assert by_text["text question"]["answered"] == 3
+    assert by_text["checkbox question"]["option_counts"] == {
+        "Email": 3,
+        "Chat": 2,
+        "Phone": 1,
+    }
+    assert by_text["rating question"]["rating_stats"]["distribution"] == {
+        5: 2,
+        0: 1,
+        3: 1,
+    }
+    assert by_text["unanswered question"]["total_responses"] == 0
+
+
+def test_endpoint_returns_the_aggregates(client, survey_id):
+    response = client.get(
+        f"/api/v1/responses/survey/{survey_id}/analytics/question-analytics"
+    )
+
+    assert response.status_code == 200
+    rating = response.json[2]
+    assert rating["question_text"] == "rating question"
+    assert (rating["total_responses"], rating["answered"], rating["skipped"]) == (
+        5,
+        3,
+        2,
+    )
+    assert rating["avg_rating"] == 3.2
@@ -0,0 +1,161 @@
+import socket
+import pytest
+from sqlalchemy import event, func, select, update
+from src.database.db import db
+from tests.factories import SurveyFactory
+from src.database.models.survey_model import Survey
+from src.database.routing import ReplicaPool, read_only, use_primary
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+# Tells the servers, and the databases standing in for them, apart
+SERVER = select(func.inet_server_port(), func.current_database())
+
+
+def server_of(engine):
+    with engine.connect() as connection:
+        return tuple(connection.execute(SERVER).one())
+
+
+def current_server():
+    return tuple(db.session.execute(SERVER).one())
+
+
+@read_only
+def read_only_server():
+    return current_server()
+
+
+def unreachable_uri(uri):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return uri.replace(uri.split("@", 1)[1].split("/", 1)[0], f"127.0.0.1:{port}")
+
+
+@pytest.fixture
+def use_replicas(app, monkeypatch):
+    """Make the app route read_only calls through a pool of `uris`"""
+    pools = []
+
+    def use(uris, **options):
+        pool = ReplicaPool(uris, check_interval=0, **options)
+        pools.append(pool)
+        monkeypatch.setitem(app.extensions, "replicas", pool)
+        return pool
+
+    # Sessions that wrote while setting up tests read from the primary
+    db.session.close()
+    yield use
+    db.session.close()
+    for pool in pools:
+        for replica in pool.replicas:
+            replica.engine.dispose()
+
+
+@pytest.fixture
+def replica(use_replicas, replica_uri):
+    return use_replicas([replica_uri]).replicas[0]
+
+
+@pytest.fixture
+def survey_id():
+    survey_id = SurveyFactory().id
+    db.session.commit()
+    db.session.close()
+    return survey_id
+
+
+def test_read_only_calls_read_from_the_replica(replica):
+    assert server_of(replica.engine) != server_of(db.engine)
+
+    assert read_only_server() == server_of(replica.engine)
+    assert current_server() == server_of(db.engine)
+    assert replica.healthy
+
+
+def test_reads_after_an_orm_write_go_to_the_primary(replica):
+    SurveyFactory()
+    db.session.flush()
+
+    assert read_only_server() == server_of(db.engine)
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda survey_id: SurveyStatsRepository().record_distributions(
+            str(survey_id), 1
+        ),
+        lambda survey_id: db.session.execute(
+            update(Survey).where(Survey.id == survey_id).values(title="Renamed")
+        ),
+    ],
+    ids=["upsert", "update"],
+)
+def test_reads_after_a_core_write_go_to_the_primary(replica, survey_id, write):
+    assert read_only_server() == server_of(replica.engine)
+    db.session.commit()
+
+    write(survey_id)
+
+    assert read_only_server() == server_of(db.engine)
+    # Including after the write is committed, for the rest of the request
+    db.session.commit()
+    assert read_only_server() == server_of(db.engine)
+
+
+def test_use_primary_reads_from_the_primary(replica):
+    with use_primary():
+        assert read_only_server() == server_of(db.engine)
+
+    assert read_only_server() == server_of(replica.engine)
+
+
+def test_replicas_are_picked_in_round_robin_per_transaction(use_replicas, replica_uri):
+    pool = use_replicas([replica_uri, replica_uri])
+    first, second = (replica.engine for replica in pool.replicas)
+
+    read_only_server()
+    read_only_server()
+    assert db.session.info["replica"] is first
+    db.session.commit()
+    read_only_server()
+    assert db.session.info["replica"] is second
+    db.session.commit()
+    read_only_server()
+    assert db.session.info["replica"] is first
+
+
+def test_lagging_replicas_are_skipped(use_replicas, replica_uri):
+    pool = use_replicas([replica_uri], max_lag=-1)
+
+    assert read_only_server() == server_of(db.engine)
+    assert not pool.replicas[0].healthy
+    assert pool.status()[0]["lag_seconds"] >= 0
+
+
+def test_unreachable_replicas_fall_back_to_the_next_one_or_the_primary(
+    use_replicas, replica_uri
+):
+    pool = use_replicas([unreachable_uri(replica_uri), replica_uri])
+
+    assert read_only_server() == server_of(pool.replicas[1].engine)
+    db.session.commit()
+    pool.replicas.pop()
+    assert read_only_server() == server_of(db.engine)
+    assert [replica["healthy"] for replica in pool.status()] == [False]
+
+
+def test_analytics_endpoints_read_from_the_replica(client, replica, survey_id):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(replica.engine, "before_cursor_execute", listener)
+    try:
+        response = client.get(
+            f"/api/v1/responses/survey/{survey_id}/analytics/daily-responses"
+        )
+    finally:
+        event.remove(replica.engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert any("survey_stats" in statement for statement in statements)
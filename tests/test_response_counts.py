@@ -0,0 +1,159 @@
+from datetime import datetime
+import pytest
+from src.database.db import db
+from tests.factories import ResponseFactory, SurveyFactory
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+# UTC, 2026-03-02 and 2026-03-09 are Mondays. New York moves to daylight saving
+# time on 2026-03-08, from UTC-5 to UTC-4.
+CREATED_ATS = [
+    datetime(2026, 3, 1, 23, 30),
+    datetime(2026, 3, 2, 0, 15),
+    datetime(2026, 3, 2, 0, 45),
+    datetime(2026, 3, 2, 13, 0),
+    datetime(2026, 3, 8, 9, 0),
+    datetime(2026, 3, 9, 1, 0),
+]
+
+
+@pytest.fixture
+def survey_id():
+    survey = SurveyFactory()
+    for created_at in CREATED_ATS:
+        ResponseFactory(survey=survey, created_at=created_at)
+    # Responses of another survey are not counted
+    ResponseFactory(created_at=CREATED_ATS[0])
+    db.session.commit()
+    SurveyStatsRepository().rebuild(str(survey.id))
+    return str(survey.id)
+
+
+def counts(client, survey_id, **query):
+    response = client.get(
+        f"/api/v1/responses/survey/{survey_id}/analytics/daily-responses",
+        query_string=query,
+    )
+    assert response.status_code == 200, response.json
+    return [(bucket["date"], bucket["count"]) for bucket in response.json]
+
+
+def test_hourly_counts(client, survey_id):
+    assert counts(
+        client,
+        survey_id,
+        granularity="hour",
+        start="2026-03-01T23:00:00",
+        end="2026-03-02T02:00:00",
+    ) == [
+        ("2026-03-01T23:00", 1),
+        ("2026-03-02T00:00", 2),
+        ("2026-03-02T01:00", 0),
+    ]
+
+
+def test_daily_counts(client, survey_id):
+    assert counts(
+        client, survey_id, start="2026-03-01T00:00:00", end="2026-03-04T00:00:00"
+    ) == [("2026-03-01", 1), ("2026-03-02", 3), ("2026-03-03", 0)]
+
+
+def test_weekly_counts_start_on_monday(client, survey_id):
+    assert counts(
+        client,
+        survey_id,
+        granularity="week",
+        start="2026-03-01T00:00:00",
+        end="2026-03-10T00:00:00",
+    ) == [("2026-02-23", 1), ("2026-03-02", 4), ("2026-03-09", 1)]
+
+
+def test_daily_counts_in_a_timezone_behind_utc(client, survey_id):
+    assert counts(
+        client,
+        survey_id,
+        timezone="America/New_York",
+        start="2026-03-01T00:00:00",
+        end="2026-03-03T00:00:00",
+    ) == [("2026-03-01", 3), ("2026-03-02", 1)]
+
+
+def test_hourly_counts_in_a_half_hour_offset_timezone(client, survey_id):
+    assert counts(
+        client,
+        survey_id,
+        granularity="hour",
+        timezone="Asia/Kolkata",
+        start="2026-03-02T05:00:00",
+        end="2026-03-02T07:00:00",
+    ) == [("2026-03-02T05:00", 2), ("2026-03-02T06:00", 1)]
+
+
+def test_weekly_counts_across_a_daylight_saving_change(client, survey_id):
+    # Both March 8 and 9 UTC responses fall on Sunday March 8 in New York
+    assert counts(
+        client,
+        survey_id,
+        granularity="week",
+        timezone="America/New_York",
+        start="2026-03-02T00:00:00",
+        end="2026-03-16T00:00:00",
+    ) == [("2026-03-02", 3), ("2026-03-09", 0)]
+
+
+@pytest.mark.parametrize("timezone", ["UTC", "Europe/London"])
+def test_start_is_included_and_end_excluded(client, survey_id, timezone):
+    # London is on UTC in March before the 29th
+    assert counts(
+        client,
+        survey_id,
+        timezone=timezone,
+        start="2026-03-02T00:15:00",
+        end="2026-03-02T13:00:00",
+    ) == [("2026-03-02", 2)]
+
+
+def test_offsets_of_start_and_end_override_the_timezone(client, survey_id):
+    assert counts(
+        client,
+        survey_id,
+        granularity="hour",
+        start="2026-03-02T01:15:00+01:00",
+        end="2026-03-02T02:45:00+01:00",
+    ) == [("2026-03-02T00:00", 2), ("2026-03-02T01:00", 0)]
+
+
+def test_default_range_ends_today(client, survey_id):
+    now = datetime.utcnow()
+    ResponseFactory(survey_id=survey_id, created_at=now)
+    db.session.commit()
+    SurveyStatsRepository().rebuild(survey_id)
+
+    buckets = counts(client, survey_id, days=3)
+
+    assert len(buckets) == 3
+    assert buckets[-1] == (now.strftime("%Y-%m-%d"), 1)
+
+
+@pytest.mark.parametrize(
+    "query, status",
+    [
+        ({"start": "2026-03-02T00:00:00", "end": "2026-03-02T00:00:00"}, 400),
+        (
+            {
+                "granularity": "hour",
+                "start": "2026-01-01T00:00:00",
+                "end": "2026-06-01T00:00:00",
+            },
+            400,
+        ),
+        ({"timezone": "Mars/Olympus_Mons"}, 422),
+        ({"granularity": "month"}, 422),
+    ],
+)
+def test_invalid_ranges_are_rejected(client, survey_id, query, status):
+    response = client.get(
+        f"/api/v1/responses/survey/{survey_id}/analytics/daily-responses",
+        query_string=query,
+    )
+
+    assert response.status_code == status
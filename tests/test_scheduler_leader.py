@@ -0,0 +1,204 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+import multiprocessing
+import time
+import click
+import pytest
+from sqlalchemy import text
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from flask.cli import FlaskGroup, run_command
+from app import scheduler
+from src.database.db import db
+from tests.factories import SurveyFactory
+from src.database.models.distribution_model import Distribution, DistributionStatus
+from src.shared.scheduler_leader import SchedulerLeader, is_serving
+
+WORKERS = 4
+JOBS = 30
+INTERVAL = 0.1
+LOCK_ID = 4242
+
+runs = Counter()
+runs_lock = Lock()
+
+
+def record_run(job_id):
+    with runs_lock:
+        runs[job_id] += 1
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def workers(app):
+    """Worker processes running the leader election on the shared jobstore"""
+    runs.clear()
+    started = []
+    for _ in range(WORKERS):
+        worker_scheduler = BackgroundScheduler(
+            jobstores={
+                "default": SQLAlchemyJobStore(url=app.config["SQLALCHEMY_DATABASE_URI"])
+            },
+            job_defaults={"misfire_grace_time": 60},
+            timezone="UTC",
+        )
+        worker_scheduler.start(paused=True)
+        leader = SchedulerLeader(
+            worker_scheduler,
+            app.config["SQLALCHEMY_DATABASE_URI"],
+            INTERVAL,
+            LOCK_ID,
+        )
+        leader.start()
+        started.append(leader)
+    wait_for(lambda: any(leader.is_leader for leader in started))
+    yield started
+    for leader in started:
+        leader.stop()
+        leader.scheduler.shutdown()
+
+
+def enqueue(job_id, delay=0.2):
+    """Add a job the way web workers do, from a scheduler that never executes"""
+    scheduler.add_job(
+        record_run,
+        "date",
+        run_date=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        args=[job_id],
+        id=job_id,
+    )
+
+
+def leaders(workers):
+    return [leader for leader in workers if leader.is_leader]
+
+
+def test_a_single_worker_leads(workers):
+    time.sleep(INTERVAL * 5)
+
+    assert len(leaders(workers)) == 1
+
+
+def test_enqueued_jobs_run_exactly_once(workers):
+    job_ids = [f"job-{index}" for index in range(JOBS)]
+    for job_id in job_ids:
+        enqueue(job_id)
+
+    wait_for(lambda: len(runs) == JOBS)
+    time.sleep(INTERVAL * 5)
+
+    assert runs == {job_id: 1 for job_id in job_ids}
+    assert scheduler.get_jobs() == []
+
+
+def test_another_worker_takes_over_and_runs_the_remaining_jobs(workers):
+    enqueue("before")
+    wait_for(lambda: runs["before"])
+
+    (leader,) = leaders(workers)
+    leader.stop()
+    wait_for(lambda: leaders(workers))
+    enqueue("after")
+    wait_for(lambda: runs["after"])
+
+    assert leaders(workers) != [leader]
+    assert not leader.is_leader
+    assert runs == {"before": 1, "after": 1}
+
+
+def leader_locks():
+    """Advisory locks held on the database, by any process"""
+    return db.session.execute(
+        text("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND granted")
+    ).scalar()
+
+
+def serve(ready, stopped):
+    """A web worker process, importing the app in leader mode like gunicorn does"""
+    from server import app
+
+    ready.set()
+    stopped.wait()
+    app.extensions["scheduler_leader"].stop()
+
+
+@pytest.fixture
+def worker_processes(monkeypatch):
+    """Worker processes of the app, inheriting the test environment"""
+    monkeypatch.setenv("SCHEDULER_MODE", "leader")
+    monkeypatch.setenv("SCHEDULER_LEADER_INTERVAL", str(INTERVAL))
+    context = multiprocessing.get_context("spawn")
+    stopped = context.Event()
+    processes = []
+    for _ in range(WORKERS):
+        ready = context.Event()
+        process = context.Process(target=serve, args=(ready, stopped), daemon=True)
+        process.start()
+        processes.append((process, ready))
+    for process, ready in processes:
+        assert ready.wait(60), "worker did not start"
+    yield [process for process, _ in processes]
+    stopped.set()
+    for process, _ in processes:
+        process.join(10)
+        if process.is_alive():
+            process.kill()
+
+
+def test_worker_processes_send_a_distribution_exactly_once(
+    client, worker_processes, smtp_server
+):
+    survey = SurveyFactory()
+    db.session.commit()
+    recipients = [f"worker{n}@example.com" for n in range(5)]
+    scheduled_at = (datetime.utcnow() + timedelta(seconds=1)).replace(microsecond=0)
+
+    response = client.post(
+        "/api/v1/distribution/bulk-distribution",
+        json={
+            "survey_id": str(survey.id),
+            "method": "EMAIL",
+            "recipient_emails": recipients,
+            "subject": "Survey",
+            "message": "Tell us",
+            "scheduled_at": scheduled_at.isoformat(),
+        },
+    )
+    assert response.status_code == 200
+
+    wait_for(lambda: len(smtp_server.recipients) == len(recipients), timeout=30)
+    time.sleep(INTERVAL * 10)
+
+    assert leader_locks() == 1
+    assert smtp_server.recipients == {recipient: 1 for recipient in recipients}
+    assert scheduler.get_jobs() == []
+    db.session.expire_all()
+    assert {
+        distribution.status
+        for distribution in Distribution.query.filter_by(survey_id=survey.id)
+    } == {DistributionStatus.SENT}
+
+
+def test_only_server_processes_run_for_the_leadership(monkeypatch):
+    # Under a WSGI server, no Flask CLI is involved
+    monkeypatch.delenv("FLASK_RUN_FROM_CLI", raising=False)
+    assert is_serving()
+
+    monkeypatch.setenv("FLASK_RUN_FROM_CLI", "true")
+    group = click.Context(FlaskGroup(), info_name="flask")
+    # `flask run` loads the app from its own context
+    with click.Context(run_command, info_name="run", parent=group):
+        assert is_serving()
+    # App commands like `flask db upgrade` or `flask scheduler run` load it from
+    # the group, and built-in ones like `flask routes` from their own context
+    with group:
+        assert not is_serving()
+    with click.Context(click.Command("routes"), info_name="routes", parent=group):
+        assert not is_serving()
@@ -0,0 +1,68 @@
+import pytest
+from src.database.db import db
+from tests.factories import SurveyFactory
+
+URL = "/api/v1/surveys/"
+
+
+@pytest.fixture(autouse=True)
+def surveys():
+    SurveyFactory(
+        title="Customer satisfaction",
+        description="How happy are our customers?",
+    )
+    SurveyFactory(title="Onboarding feedback", description="Satisfied users & admins")
+    SurveyFactory(title="Team offsite", description="Pick a date")
+    db.session.commit()
+
+
+def search(client, q, **query):
+    response = client.get(URL, query_string={"q": q, **query})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_search_matches_words_as_prefixes(client):
+    body = search(client, "satisf")
+
+    titles = [item["title"] for item in body["items"]]
+    assert titles == ["Customer satisfaction", "Onboarding feedback"]
+    assert body["total"] == 2
+    assert body["items"][0]["rank"] >= body["items"][1]["rank"] > 0
+    assert body["items"][0]["highlight"]["title"] == (
+        "Customer <mark>satisfaction</mark>"
+    )
+    # Matches are marked in the escaped text
+    assert body["items"][1]["highlight"]["description"] == (
+        "<mark>Satisfied</mark> users &amp; admins"
+    )
+
+
+def test_search_matches_titles_with_typos(client):
+    body = search(client, "custmer satisfction")
+
+    assert [item["title"] for item in body["items"]] == ["Customer satisfaction"]
+    assert body["items"][0]["rank"] == 0
+
+
+def test_search_pages_by_offset(client):
+    first = search(client, "satisf", per_page=1)
+    second = search(client, "satisf", per_page=1, page=2)
+
+    assert first["has_next"] and not second["has_next"]
+    assert first["items"][0]["id"] != second["items"][0]["id"]
+
+
+def test_search_without_matches_is_empty(client):
+    assert search(client, "zebra")["items"] == []
+
+
+def test_empty_search_is_rejected(client):
+    assert client.get(URL, query_string={"q": ""}).status_code == 422
+
+
+def test_listing_without_q_is_not_ranked(client):
+    body = client.get(URL).json
+
+    assert len(body["items"]) == 3
+    assert "rank" not in body["items"][0]
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+import pytest
+from src.database.db import db
+from tests.factories import (
+    DistributionFactory,
+    QuestionFactory,
+    ResponseFactory,
+    SurveyFactory,
+)
+from src.database.models.distribution_model import DistributionStatus
+from src.database.models.survey_stats_model import SurveyStatsBucket
+from src.domain.survey_stats.survey_stats_repository import SurveyStatsRepository
+
+# Responses at the start, middle and end of several hours of two days
+CREATED_ATS = [
+    datetime(2026, 1, 14, 23, 59, 59),
+    datetime(2026, 1, 15, 10, 0),
+    datetime(2026, 1, 15, 10, 20),
+    datetime(2026, 1, 15, 10, 40),
+    datetime(2026, 1, 15, 11, 10),
+    datetime(2026, 1, 15, 11, 59, 59),
+    datetime(2026, 1, 15, 12, 30),
+]
+HOUR = timedelta(hours=1)
+
+
+@pytest.fixture
+def survey_id():
+    survey = SurveyFactory()
+    for created_at in CREATED_ATS:
+        ResponseFactory(survey=survey, created_at=created_at)
+    db.session.commit()
+    SurveyStatsRepository().rebuild(str(survey.id))
+    return str(survey.id)
+
+
+def expected_count(start, end=datetime.max):
+    return sum(start <= created_at < end for created_at in CREATED_ATS)
+
+
+@pytest.mark.parametrize(
+    "since",
+    [
+        datetime(2026, 1, 14),
+        datetime(2026, 1, 15, 10, 0),
+        datetime(2026, 1, 15, 10, 30),
+        datetime(2026, 1, 15, 11, 59, 59),
+        datetime(2026, 1, 15, 12, 31),
+    ],
+)
+def test_count_since_is_exact_within_an_hour(survey_id, since):
+    count = SurveyStatsRepository().get_response_count_since(survey_id, since)
+
+    assert count == expected_count(since)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        # Partial hours at both edges
+        (datetime(2026, 1, 15, 10, 30), datetime(2026, 1, 15, 12, 15)),
+        # Within a single hour
+        (datetime(2026, 1, 15, 10, 10), datetime(2026, 1, 15, 10, 50)),
+        # Whole hours only, the end is excluded
+        (datetime(2026, 1, 15, 10), datetime(2026, 1, 15, 12)),
+        (datetime(2026, 1, 14, 23, 59, 59), datetime(2026, 1, 15, 10, 0, 1)),
+    ],
+)
+def test_counts_by_bucket_are_exact_at_the_edges(survey_id, start, end):
+    stats = SurveyStatsRepository()
+
+    hourly = stats.get_response_counts_by_bucket(survey_id, start, end, "hour")
+    daily = stats.get_response_counts_by_bucket(survey_id, start, end, "day")
+
+    assert sum(hourly.values()) == sum(daily.values()) == expected_count(start, end)
+    assert hourly == {
+        bucket: expected_count(max(start, bucket), min(end, bucket + HOUR))
+        for bucket in {
+            created_at.replace(minute=0, second=0) for created_at in CREATED_ATS
+        }
+        if expected_count(max(start, bucket), min(end, bucket + HOUR))
+    }
+
+
+def rollup(survey_id):
+    db.session.expire_all()
+    buckets = SurveyStatsBucket.query.filter_by(survey_id=survey_id)
+    return (
+        SurveyStatsRepository().get_counters(survey_id) | {"updated_at": None},
+        {bucket.bucket_start: bucket.responses for bucket in buckets},
+    )
+
+
+def test_recorded_counters_match_a_rebuild(client):
+    survey = SurveyFactory()
+    questions = QuestionFactory.create_batch(3, survey=survey)
+    distributions = DistributionFactory.create_batch(
+        3, survey=survey, status=DistributionStatus.SENT
+    )
+    db.session.commit()
+    survey_id = str(survey.id)
+    SurveyStatsRepository().rebuild(survey_id)
+
+    for index in range(4):
+        respondent = {"name": f"Respondent {index}"}
+        if index < len(distributions):
+            respondent["distribution_id"] = str(distributions[index].id)
+        response = client.post(
+            "/api/v1/responses/",
+            json={"survey_id": survey_id, "respondent_data": respondent},
+        )
+        assert response.status_code == 200
+        answers = client.post(
+            f"/api/v1/responses/{response.json['id']}/answers",
+            json={
+                "answers": [
+                    {"question_id": str(question.id), "rating": index + 1}
+                    for question in questions[: index + 1]
+                ]
+            },
+        )
+        assert answers.status_code == 200
+    imported = client.post(
+        f"/api/v1/responses/survey/{survey_id}/bulk-import?format=ndjson",
+        data="\n".join(
+            '{"external_response_id": "import-%d", "answers": {"%s": {"rating": 4}}}'
+            % (index, questions[0].id)
+            for index in range(5)
+        ),
+        content_type="application/x-ndjson",
+    )
+    assert imported.json["imported"] == 5
+    created = client.post(
+        "/api/v1/distribution/bulk-distribution",
+        json={
+            "survey_id": survey_id,
+            "method": "LINK",
+            "recipient_emails": [f"link{index}@example.com" for index in range(4)],
+            "subject": "Survey",
+            "message": "Tell us",
+        },
+    )
+    assert created.status_code == 200
+    for distribution in distributions[1:]:
+        clicked = client.put(f"/api/v1/distribution/{distribution.id}/clicked")
+        assert clicked.status_code == 200
+
+    recorded = rollup(survey_id)
+    SurveyStatsRepository().rebuild(survey_id)
+
+    assert recorded == rollup(survey_id)
+    counters, buckets = recorded
+    assert counters["total_responses"] == sum(buckets.values()) == 9
+    assert counters["total_answers"] == 1 + 2 + 3 + 3 + 5
+    assert counters["total_clicks"] == 2